@@ -1,32 +1,42 @@
-"""Teatime package exports."""
-
-from .core import (
-    APP_NAME,
-    APP_VERSION,
-    CONFIG_FILE,
-    STATS_LOG_FILE,
-    DEFAULT_FONT_SCALE,
-    FONT_SCALE_INCREMENT,
-    MIN_FONT_SCALE,
-    MAX_FONT_SCALE,
-    ConfigManager,
-    StatsManager,
-)
-from .app import TeaTimerApp, main
-from .stats import StatisticsWindow
-
-__all__ = [
-    "APP_NAME",
-    "APP_VERSION",
-    "CONFIG_FILE",
-    "STATS_LOG_FILE",
-    "DEFAULT_FONT_SCALE",
-    "FONT_SCALE_INCREMENT",
-    "MIN_FONT_SCALE",
-    "MAX_FONT_SCALE",
-    "ConfigManager",
-    "StatsManager",
-    "TeaTimerApp",
-    "StatisticsWindow",
-    "main",
-]
+"""Teatime package exports.
+
+Names are resolved on first access (PEP 562), so `import teatime` and
+`teatime.ConfigManager` only load the GTK-free core module. TeaTimerApp,
+main and StatisticsWindow import GTK when they are first used.
+"""
+
+import importlib
+
+# Exported name -> submodule it lives in
+_EXPORTS = {
+    "APP_NAME": "core",
+    "APP_VERSION": "core",
+    "APPLICATION_ID": "core",
+    "CONFIG_FILE": "core",
+    "STATS_LOG_FILE": "core",
+    "CONTROL_SOCKET": "core",
+    "DEFAULT_FONT_SCALE": "core",
+    "FONT_SCALE_INCREMENT": "core",
+    "MIN_FONT_SCALE": "core",
+    "MAX_FONT_SCALE": "core",
+    "ConfigManager": "core",
+    "StatsManager": "core",
+    "TeaTimerApp": "app",
+    "main": "app",
+    "StatisticsWindow": "stats",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value   # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,121 @@
+"""Rate-limited, prioritised screen-reader announcements.
+
+Announcements are written to ATK as accessible descriptions. Sending one per
+timer tick floods AT-SPI, while overwriting them ad hoc can hide the one that
+matters. The scheduler keeps a single pending announcement: a newer one of
+equal or higher priority replaces it, a lower-priority one is dropped. It is
+delivered after a short coalescing window, no sooner than the rate limit
+allows (completion bypasses the limit), and periodic announcements that have
+gone stale by delivery time are discarded.
+"""
+
+import time
+
+from gi.repository import GLib
+
+PRIORITY_PERIODIC = 0     # "Time remaining ..."
+PRIORITY_STATE = 1        # Timer started / stopped
+PRIORITY_COMPLETION = 2   # Timer finished
+
+DEFAULT_MIN_INTERVAL = 1.0       # Seconds between any two announcements
+DEFAULT_PERIODIC_INTERVAL = 10.0  # Seconds between remaining-time announcements
+DEFAULT_COALESCE_WINDOW = 0.15   # Seconds to wait for a superseding announcement
+
+
+class AnnouncementScheduler:
+    def __init__(self, sink, min_interval=DEFAULT_MIN_INTERVAL,
+                 periodic_interval=DEFAULT_PERIODIC_INTERVAL,
+                 coalesce_window=DEFAULT_COALESCE_WINDOW,
+                 clock=time.monotonic, timeout_add=None, source_remove=None):
+        self.sink = sink
+        self.min_interval = min_interval
+        self.periodic_interval = periodic_interval
+        self.coalesce_window = coalesce_window
+        self._clock = clock
+        self._timeout_add = timeout_add or GLib.timeout_add
+        self._source_remove = source_remove or GLib.source_remove
+        self._pending = None       # (priority, text, submitted_at)
+        self._timer_id = None
+        self._due = None
+        self._last_emit_at = None
+        self._last_periodic_at = None
+        self._last_text = None
+        self.emitted = 0
+        self.dropped = 0
+
+    def announce(self, text, priority=PRIORITY_STATE):
+        """Queues an announcement. Returns False if it was dropped immediately."""
+        now = self._clock()
+        if priority == PRIORITY_PERIODIC and self._last_periodic_at is not None \
+                and now - self._last_periodic_at < self.periodic_interval:
+            self.dropped += 1
+            return False
+        if self._pending is not None:
+            if priority < self._pending[0]:
+                self.dropped += 1
+                return False
+            # The queued announcement is superseded before it was heard
+            self.dropped += 1
+        self._pending = (priority, text, now)
+        self._reschedule(now)
+        return True
+
+    def cancel(self):
+        """Drops anything queued, e.g. on shutdown."""
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = None
+        if self._timer_id:
+            self._source_remove(self._timer_id)
+        self._timer_id = None
+        self._due = None
+
+    def _due_time(self, now):
+        priority, _text, submitted_at = self._pending
+        due = submitted_at + self.coalesce_window
+        if priority < PRIORITY_COMPLETION and self._last_emit_at is not None:
+            due = max(due, self._last_emit_at + self.min_interval)
+        return max(due, now)
+
+    def _reschedule(self, now):
+        due = self._due_time(now)
+        if self._timer_id and self._due is not None and self._due <= due:
+            return
+        if self._timer_id:
+            self._source_remove(self._timer_id)
+        self._due = due
+        self._timer_id = self._timeout_add(max(0, int((due - now) * 1000)), self._deliver)
+
+    def _deliver(self):
+        self._timer_id = None
+        self._due = None
+        if self._pending is None:
+            return False
+        now = self._clock()
+        if now < self._due_time(now) - 0.001:
+            # A rate-limited announcement replaced a due one; wait for its slot
+            self._reschedule(now)
+            return False
+        priority, text, submitted_at = self._pending
+        self._pending = None
+
+        # Remaining-time text is wrong once a newer tick could have been spoken
+        stale = priority == PRIORITY_PERIODIC and now - submitted_at > self.periodic_interval
+        # Only an echo submitted right after the same text was spoken is
+        # dropped; the same words later (e.g. the same timer started again) are news
+        repeat = text == self._last_text and submitted_at - self._last_emit_at < self.coalesce_window
+        if stale or repeat:
+            self.dropped += 1
+            return False
+
+        self._last_emit_at = now
+        self._last_text = text
+        if priority == PRIORITY_PERIODIC:
+            # Spacing is measured between ticks, not deliveries, so it does not drift
+            self._last_periodic_at = submitted_at
+        self.emitted += 1
+        try:
+            self.sink(text)
+        except Exception as e:
+            print(f"Warning: Could not deliver announcement: {e}")
+        return False
@@ -1,13 +1,10 @@
 #!/usr/bin/python3
 
-import json
 import subprocess
-import os
-from pathlib import Path
 from datetime import datetime
-import colorsys
 import threading
 import sys
+import time
 
 
 import gi
@@ -20,6 +17,7 @@ import argparse
 from .core import (
     APP_NAME,
     APP_VERSION,
+    APPLICATION_ID,
     CONFIG_FILE,
     STATS_LOG_FILE,
     DEFAULT_FONT_SCALE,
@@ -27,45 +25,164 @@ from .core import (
     MIN_FONT_SCALE,
     MAX_FONT_SCALE,
     ConfigManager,
+    StatsManager,
 )
-from .stats import StatisticsWindow
+from .ui_utils import (
+    StyleManager,
+    FrameAnimation,
+    BASE_CSS,
+    FOCUS_TRANSITION_CSS,
+    font_scale_css,
+    font_scale_step,
+    focus_glow_css,
+    rainbow_css,
+    skin_css,
+    LavaBackground,
+    quantize_hue,
+)
+from .control import ControlServer
+from .countdown import CountdownDisplay, can_draw as countdown_can_draw
+from .overlay import NotificationOverlay, OverlayPool, OVERLAY_CSS
+from .sprites import (
+    AnimationCache,
+    SpriteSurfaceCache,
+    DrawStats,
+    DEFAULT_CACHE_BUDGET_MB,
+    AnimationStream,
+    cache_atlas,
+    load_atlas_frames,
+    open_animation,
+)
+from .assets import load_index as load_asset_index
+from .audio import AudioPlayer, load_wav
+from .procedural import PROCEDURAL_ANIMATIONS, ProceduralFrame, get_animation as get_procedural_animation
+from .state import TimerStateBus, IDLE, RUNNING, STOPPED, COMPLETE
+from .pipeline import CompletionPipeline, run_in_worker
+from .performance import (
+    PROFILES,
+    PROFILE_SETTINGS,
+    DEFAULT_PROFILE,
+    POWER_POLL_SECONDS,
+    on_battery,
+    reduced_motion,
+    select_profile,
+)
+from .announce import (
+    AnnouncementScheduler,
+    PRIORITY_PERIODIC,
+    PRIORITY_STATE,
+    PRIORITY_COMPLETION,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_PERIODIC_INTERVAL,
+    DEFAULT_COALESCE_WINDOW,
+)
+
+# Animation speed; both advance by elapsed frame-clock time, not per callback.
+# How often they redraw is set by the performance profile.
+RAINBOW_INTERVAL = 0.5            # Seconds between rainbow/lava hue updates at full
+RAINBOW_DEGREES_PER_SECOND = 2.0  # Same speed as the old 1 degree per 500ms timeout
+SPRITE_FRAME_INTERVAL = 0.1       # Sprites are drawn for 10 FPS
+STREAM_FRAME_INTERVAL = 0.02      # Animated GIFs play at their own delays, up to 50 FPS
+SPRITE_RELEASE_DELAY = 10         # Seconds after the overlay closes before frames are freed
+SPRITE_AREA_SIZE = (300, 300)     # Size of the overlay's sprite drawing area
+FALLBACK_ANIMATION = "drawn_puppy"  # Shown when the chosen animation fails to load
+DEFAULT_WARMUP_SECONDS = 10       # Prepare the overlay this long before the deadline
 
 class TeaTimerApp(Gtk.Application):
-    def __init__(self, duration=5, auto_start=False):
-        super().__init__(application_id="org.example.TeaTimer",
-                         flags=Gio.ApplicationFlags.NON_UNIQUE)
+    def __init__(self, duration=None, auto_start=False, single_instance=False):
+        # HANDLES_COMMAND_LINE routes every invocation through do_command_line.
+        # In single-instance mode later launches forward their options to the
+        # primary instance over D-Bus and exit instead of building a new UI.
+        flags = Gio.ApplicationFlags.HANDLES_COMMAND_LINE
+        if not single_instance:
+            flags |= Gio.ApplicationFlags.NON_UNIQUE
+        super().__init__(application_id=APPLICATION_ID, flags=flags)
+        self.single_instance = single_instance
         self.window = None
         self.timer_id = None
         self.time_left = 0
         self.current_timer_duration = 0
         self.font_scale_factor = DEFAULT_FONT_SCALE
-        # Check if duration was set via environment variable
-        import os
-        # If seconds mode is active (developer/test), use duration as-is
-        if getattr(self, 'use_seconds', False):
-            self.last_duration = duration  # already in seconds
-        else:
-            # Normal behavior: use environment variable if set, else duration (in minutes)
-            env_duration = os.environ.get('TEATIME_DURATION')
-            if env_duration is not None:
-                self.last_duration = int(env_duration)
-            else:
-                self.last_duration = duration
+        # Minutes, or seconds when use_seconds is set (developer/test mode)
+        self.last_duration = 5
         self.sound_enabled = True
-        self.rainbow_timer_id = None
-        self.css_provider = Gtk.CssProvider()
+        self.rainbow_animation = None  # Frame-clock driven rainbow/lava hue cycling
+        self.styles = StyleManager()  # One reusable CSS provider per style layer
+        self.lava_background = LavaBackground()  # Cached gradient surfaces for the lava skin
+        self._lava_drawn_hue = None
         self._stats_window = None
         self.rainbow_hue = 0
         self.focus_hue = 0 # Hue for the focus glow, 0-359
         self.sprite_window = None  # Reference to sprite animation window
-        self.sprite_frames = []    # Storage for sprite frames
+        self.sprite_frames = []    # Frames of the overlay being shown (owned by animation_cache)
+        self.asset_index = None    # Sprites, sounds and images; see _asset_index()
+        self._asset_index_lock = threading.Lock()
+        self.audio_player = None   # Preloaded notification sound; see _prepare_audio()
         self.current_sprite_frame = 0
-        self.sprite_timer_id = None
+        self.sprite_animation = None  # Frame-clock driven sprite playback
+        self.sprite_surfaces = SpriteSurfaceCache()  # Frames pre-scaled for the overlay
+        self.sprite_draw_stats = DrawStats()
+        self.sprite_drawing_area = None
+        self._sprite_release_id = None
+        # Overlay built ahead of the deadline by the warm-up stage
+        self.warmup_seconds = DEFAULT_WARMUP_SECONDS
+        self._warmup_cancel = None    # threading.Event of the warm-up in flight
+        self._warmup_session = None   # Timer session the warm-up belongs to
+        self._warmup_done = False
+        self._warmup_waiting = None   # Completion pipeline waiting for the warm-up
+        self._prepared_notification = None  # NotificationOverlay configured by the warm-up
+        # Session Complete overlays, one per monitor, built once and reused
+        self.overlays = OverlayPool(
+            lambda: NotificationOverlay(self._on_sprite_draw, self._on_notification_clicked, SPRITE_AREA_SIZE)
+        )
         self.auto_start = auto_start  # Flag to indicate if timer should start automatically
         self.mini_mode = False  # Mini-mode flag
         self.nano_mode = False  # Nano-mode flag (active only during timer)
         self.pre_timer_mode = None  # Store the mode before timer starts
+        self.control_server = None  # Local control socket (primary instance only)
+        self.timer_state = TimerStateBus()  # Single source of truth for timer views
+        self._deadline = None  # Monotonic time the running timer is due
+        # Ordered work after a timer finishes; blocking I/O runs on worker threads
+        self._completion = CompletionPipeline([
+            ("visible", self._complete_show_state),
+            ("restore_mode", self._complete_restore_mode),
+            ("sound", self._complete_play_sound),
+            ("overlay", self._complete_show_overlay),
+            ("stats", self._complete_log_session),
+        ])
+        # Screen-reader pacing in seconds (persisted; see AnnouncementScheduler)
+        self.announcement_min_interval = DEFAULT_MIN_INTERVAL
+        self.announcement_interval = DEFAULT_PERIODIC_INTERVAL
+        self.announcement_coalesce_ms = int(DEFAULT_COALESCE_WINDOW * 1000)
+        # Memory allowed for decoded animation frames, in megabytes (persisted)
+        self.animation_cache_mb = DEFAULT_CACHE_BUDGET_MB
+        # Animation budget: the chosen profile, and whether to drop to minimal
+        # on battery or when the desktop asks for reduced animations
+        self.performance_profile = DEFAULT_PROFILE
+        self.performance_auto = True
+        self.active_profile = DEFAULT_PROFILE
+        self._power_poll_id = None
+        self._performance_watched = False
+        # The power poll only runs while the window is mapped and not iconified
+        self._window_mapped = True
+        self._window_iconified = False
+        self.config_manager = None  # Debounced writer; see _config_writer()
         self._load_config()  # Load settings from file
+        self.active_profile = self.performance_profile
+        self.animation_cache = AnimationCache(self.animation_cache_mb * 1024 * 1024)
+        self.announcer = AnnouncementScheduler(
+            self._describe_time_label,
+            min_interval=self.announcement_min_interval,
+            periodic_interval=self.announcement_interval,
+            coalesce_window=self.announcement_coalesce_ms / 1000.0,
+        )
+        # An explicit duration (constructor or test harness) wins over the saved one
+        if duration is not None:
+            self.last_duration = duration
+
+        # Register command line options. They must exist before run() so that
+        # remote invocations can parse them locally and forward the result.
+        self._add_command_line_options()
 
         # Set up keyboard shortcuts
         self._setup_actions()
@@ -84,6 +201,12 @@ class TeaTimerApp(Gtk.Application):
             self.window.connect("destroy", self._on_window_destroy)
             # Use "set-focus-child" signal, which is more reliable for this purpose
             self.window.connect("set-focus-child", self._on_focus_changed)
+            # Pause animations while iconified
+            self.window.connect("window-state-event", self._on_window_state_event)
+            self.window.connect("map", self._on_window_mapped, True)
+            self.window.connect("unmap", self._on_window_mapped, False)
+            # Paints the lava skin before GTK draws the window's children
+            self.window.connect("draw", self._on_window_draw)
 
             # --- HeaderBar for a modern look ---
             header_bar = Gtk.HeaderBar()
@@ -140,6 +263,11 @@ class TeaTimerApp(Gtk.Application):
             self.time_label.set_markup("<span>00:00</span>")
             main_box.pack_start(self.time_label, False, False, 0)
 
+            # Nano mode's countdown, composited from a digit atlas (hidden otherwise)
+            self.countdown_display = CountdownDisplay()
+            self.countdown_display.set_no_show_all(True)
+            main_box.pack_start(self.countdown_display, True, True, 0)
+
             # --- Use a Grid for a clean, aligned layout ---
             grid = Gtk.Grid()
             grid.set_column_spacing(10)
@@ -235,18 +363,8 @@ class TeaTimerApp(Gtk.Application):
             self.decrease_font_button.connect("clicked", self.on_decrease_font_clicked)
             self.sound_toggle.connect("toggled", self.on_sound_toggled)
 
-            # Add the single CSS provider to the screen. We will update this provider
-            # later instead of adding new ones.
-            screen = Gdk.Screen.get_default()
-            if screen:
-                Gtk.StyleContext.add_provider_for_screen(
-                    screen, self.css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-                )
-            else:
-                print("Warning: No default screen found to apply CSS.")
-
-            # Initial state for buttons
-            self.stop_button.set_sensitive(False)
+            # Display, buttons and accessibility now follow the timer state
+            self._subscribe_views()
 
             # Apply initial font size
             self._apply_font_size()
@@ -258,19 +376,30 @@ class TeaTimerApp(Gtk.Application):
             self._set_accessibility_properties()
 
         self.window.show_all()
+        self.window.present()
         
         # Apply mini-mode settings
         self._apply_mini_mode()
         
+        # Pick the animation budget, then apply the skin and rainbow effect to match
+        self._watch_performance_triggers()
+        self._update_performance_profile()
+
         # Apply the selected skin
         self._apply_skin()
         
         # Start the rainbow timer for background glow effect
         self._start_rainbow_timer()
+
+        # Index the assets once, off the UI thread; usually a read of the cached index
+        run_in_worker(self._asset_index)
+        # Decode the notification sound and open its output before the first completion
+        run_in_worker(self._prepare_audio)
         
         # Automatically start the timer if auto_start flag is set
         if self.auto_start:
             # Use idle_add to ensure the UI is fully initialized before starting
+            self.auto_start = False
             GLib.idle_add(self._auto_start_timer)
 
     def _auto_start_timer(self):
@@ -315,8 +444,7 @@ class TeaTimerApp(Gtk.Application):
                 self.duration_spin.set_width_chars(2)
                 
                 # Make buttons smaller by changing their style
-                css_provider = Gtk.CssProvider()
-                css_provider.load_from_data(b"""
+                self.styles.set_css("mini", """
                     button, checkbutton {
                         padding: 2px 4px;
                         font-size: 10px;
@@ -329,12 +457,6 @@ class TeaTimerApp(Gtk.Application):
                         font-size: 10px;
                     }
                 """)
-                # Apply to the main window
-                screen = Gdk.Screen.get_default()
-                if screen:
-                    Gtk.StyleContext.add_provider_for_screen(
-                        screen, css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 2
-                    )
                 
                 # Adjust main box margins
                 self.main_box.set_margin_top(10)
@@ -360,21 +482,8 @@ class TeaTimerApp(Gtk.Application):
                 # Reset the duration spin button
                 self.duration_spin.set_width_chars(3)
                 
-                # Remove the mini-mode CSS provider by creating a new one with empty CSS
-                css_provider = Gtk.CssProvider()
-                css_provider.load_from_data(b"")
-                screen = Gdk.Screen.get_default()
-                if screen:
-                    Gtk.StyleContext.add_provider_for_screen(
-                        screen, css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 2
-                    )
-                
-                # Remove the time label CSS provider
-                time_css_provider = Gtk.CssProvider()
-                time_css_provider.load_from_data(b"")
-                self.time_label.get_style_context().add_provider(
-                    time_css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 3
-                )
+                # Remove the mini-mode CSS
+                self.styles.clear("mini")
                 
                 # Reset main box margins
                 self.main_box.set_margin_top(20)
@@ -409,52 +518,24 @@ class TeaTimerApp(Gtk.Application):
             print(f"DEBUG: Hiding control_grid, was visible: {self.control_grid.get_visible()}")
             self.control_grid.set_visible(False)
             
-        # Make sure time label is visible and centered
-        self.time_label.set_halign(Gtk.Align.CENTER)
-        self.time_label.set_valign(Gtk.Align.CENTER)
-        
-        # Add CSS to make the timer even more prominent (200% larger than current size)
-        # Calculate a larger font size based on current font scale factor
-        timer_font_percentage = self.font_scale_factor * 4.0 * 100 * 0.8  # 20% smaller in nano-mode
+        # Swap the label for the atlas-drawn countdown; ticks then only blit digits
+        self.time_label.set_visible(False)
+        self.countdown_display.set_scale(self.font_scale_factor)
+        self.countdown_display.set_text(self.timer_state.get("display"))
+        self.countdown_display.set_visible(True)
         
         # Get the current skin to preserve it in nano mode
         skin = getattr(self, 'preferred_skin', 'default')
         
         # Create CSS that maintains skin effects but makes them transparent
         if skin == 'lava':
-            # For lava skin, preserve the gradient but make it transparent
-            h1 = self.rainbow_hue
-            h2 = (self.rainbow_hue + 120) % 360
-            h3 = (self.rainbow_hue + 240) % 360
-            
-            # Convert to RGBA with transparency
-            r1, g1, b1 = colorsys.hsv_to_rgb(h1 / 360.0, 0.8, 0.7)
-            r2, g2, b2 = colorsys.hsv_to_rgb(h2 / 360.0, 0.8, 0.7)
-            r3, g3, b3 = colorsys.hsv_to_rgb(h3 / 360.0, 0.8, 0.7)
-            
-            color1 = f"rgba({int(r1*255)}, {int(g1*255)}, {int(b1*255)}, 0.3)"
-            color2 = f"rgba({int(r2*255)}, {int(g2*255)}, {int(b2*255)}, 0.3)"
-            color3 = f"rgba({int(r3*255)}, {int(g3*255)}, {int(b3*255)}, 0.3)"
-            
-            background_css = f"""
-                background: linear-gradient(45deg, {color1}, {color2}, {color3});
-                background-size: 300% 300%;
-                animation: lavaFlow 60s ease infinite;
-            """
+            # The lava gradient is painted by _on_window_draw at reduced opacity
+            background_css = "background-color: transparent; background-image: none;"
         else:
             # For default skin or others, just make it transparent
             background_css = "background-color: rgba(240, 240, 240, 0.3);"
         
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_data(f"""
-            .time-display {{
-                font-size: {timer_font_percentage}%;
-                margin: 0;
-                padding: 0;
-                color: #000000;
-                text-shadow: 0 0 5px rgba(255, 255, 255, 0.5);
-            }}
-            
+        self.styles.set_css("nano", f"""
             /* Make window background transparent but preserve skin effects */
             window {{
                 {background_css}
@@ -466,18 +547,7 @@ class TeaTimerApp(Gtk.Application):
             box {{
                 background-color: transparent;
             }}
-            
-            @keyframes lavaFlow {{
-                0% {{ background-position: 0% 50%; }}
-                50% {{ background-position: 100% 50%; }}
-                100% {{ background-position: 0% 50%; }}
-            }}
-        """.encode())
-        screen = Gdk.Screen.get_default()
-        if screen:
-            Gtk.StyleContext.add_provider_for_screen(
-                screen, css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 3
-            )
+        """)
             
         # Make the window transparent (requires setting the visual)
         visual = self.window.get_screen().get_rgba_visual()
@@ -488,16 +558,11 @@ class TeaTimerApp(Gtk.Application):
         GLib.idle_add(self._resize_nano_window_to_label)
 
     def _resize_nano_window_to_label(self):
-        if not self.window or not hasattr(self, 'time_label'):
+        if not self.window or not hasattr(self, 'countdown_display'):
             return False
 
-        text = self.time_label.get_text() or self.time_label.get_label() or "00:00"
-        layout = self.time_label.create_pango_layout(text)
-        context = self.time_label.get_style_context()
-        font_desc = context.get_font(Gtk.StateFlags.NORMAL)
-        if font_desc:
-            layout.set_font_description(font_desc)
-        width, height = layout.get_pixel_size()
+        # Known from the glyph atlas; no text is laid out to measure it
+        width, height = self.countdown_display.natural_size()
 
         # Add a little padding so digits don't touch the window edge
         target_w = max(120, width + 40)
@@ -515,20 +580,7 @@ class TeaTimerApp(Gtk.Application):
         self.window.set_decorated(True)
             
         # Remove nano mode CSS
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_data(b"""
-            window {
-                background-color: @theme_bg_color;
-            }
-            box {
-                background-color: @theme_bg_color;
-            }
-        """)
-        screen = Gdk.Screen.get_default()
-        if screen:
-            Gtk.StyleContext.add_provider_for_screen(
-                screen, css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 3
-            )
+        self.styles.clear("nano")
             
         # Restore normal window visuals
         visual = self.window.get_screen().get_system_visual()
@@ -536,6 +588,12 @@ class TeaTimerApp(Gtk.Application):
         self.window.set_app_paintable(False)
             
         # Show all UI elements that were hidden during nano mode
+        if hasattr(self, 'countdown_display'):
+            self.countdown_display.set_visible(False)
+            self.time_label.set_visible(True)
+            # The label skipped ticks while hidden
+            self._render_time_display(self.timer_state.state, {"display"})
+        
         if hasattr(self, 'content_box'):
             self.content_box.set_visible(True)
         
@@ -566,7 +624,7 @@ class TeaTimerApp(Gtk.Application):
         """Cycles the focus glow color when the focused widget changes."""
         # This signal reliably fires when a new child widget gets focus.
         self.focus_hue = (self.focus_hue + 40) % 360 # Cycle through the hue spectrum
-        self._apply_font_size() # Re-apply CSS with the new color
+        self._apply_focus_glow() # Re-apply CSS with the new color
 
     def on_stats_activated(self, *args):
         """Handles the activation of the statistics action."""
@@ -603,6 +661,8 @@ class TeaTimerApp(Gtk.Application):
         """Show the statistics window."""
         # Create statistics window if it doesn't exist
         if not hasattr(self, 'stats_window') or self.stats_window is None:
+            # Imported on first use; most sessions never open the statistics
+            from .stats import StatisticsWindow
             self.stats_window = StatisticsWindow(self, self.window)
         else:
             # If it exists, just present it
@@ -640,38 +700,31 @@ class TeaTimerApp(Gtk.Application):
         animation_label.set_halign(Gtk.Align.START)
         grid.attach(animation_label, 0, 0, 1, 1)
         
-        # Get available animations
-        assets_dir = Path(__file__).resolve().parents[2] / "assets"
-        sprites_dir = assets_dir / "sprites"
-        animations = []
+        # Get available animations; a few stats notice newly installed packs
+        animations = self._asset_index(revalidate=True).animation_names()
         
-        if sprites_dir.exists():
-            for item in sprites_dir.iterdir():
-                if item.is_dir():
-                    animations.append(item.name)
+        # Animations drawn at runtime, with no files behind them, come last
+        animations += list(PROCEDURAL_ANIMATIONS)
         
         # Create combobox for animation selection
         self.animation_combo = Gtk.ComboBoxText()
         for animation in animations:
-            # Remove underscores and convert to title case
-            display_name = animation.replace("_", " ").title()
-            # Remove the redundant "Animation" word from the display name
-            display_name = display_name.replace("Animation", "").strip()
-            # Special case: change "Test" to "Bouncing Balls"
-            if display_name == "Test":
-                display_name = "Bouncing Balls"
-            self.animation_combo.append(animation, display_name)
+            self.animation_combo.append(animation, self._animation_display_name(animation))
         
         # Set the current selection
         current_animation = getattr(self, 'preferred_animation', 'test_animation')
         self.animation_combo.set_active_id(current_animation)
         
         grid.attach(self.animation_combo, 1, 0, 1, 1)
+
+        # Animated previews; clicking one selects it in the combo
+        thumbnail_strip, stop_thumbnails = self._build_thumbnail_strip(animations)
+        grid.attach(thumbnail_strip, 0, 1, 2, 1)
         
         # Add skin selection with more descriptive label
         skin_label = Gtk.Label(label="Skins for Main UI (User Interface):")
         skin_label.set_halign(Gtk.Align.START)
-        grid.attach(skin_label, 0, 1, 1, 1)
+        grid.attach(skin_label, 0, 2, 1, 1)
         
         # Define available skins
         skins = [
@@ -688,19 +741,44 @@ class TeaTimerApp(Gtk.Application):
         current_skin = getattr(self, 'preferred_skin', 'default')
         self.skin_combo.set_active_id(current_skin)
         
-        grid.attach(self.skin_combo, 1, 1, 1, 1)
+        grid.attach(self.skin_combo, 1, 2, 1, 1)
         
+        # Add performance profile selection
+        performance_label = Gtk.Label(label="Animation Performance:")
+        performance_label.set_halign(Gtk.Align.START)
+        grid.attach(performance_label, 0, 3, 1, 1)
+        
+        profile_names = {
+            "full": "Full - All Effects",
+            "balanced": "Balanced - Slower Effects",
+            "minimal": "Minimal - Reduced Motion",
+        }
+        self.performance_combo = Gtk.ComboBoxText()
+        for profile in PROFILES:
+            self.performance_combo.append(profile, profile_names[profile])
+        self.performance_combo.set_active_id(self.performance_profile)
+        grid.attach(self.performance_combo, 1, 3, 1, 1)
+        
+        self.performance_auto_toggle = Gtk.CheckButton(
+            label="Use Minimal on battery or when animations are turned off"
+        )
+        self.performance_auto_toggle.set_active(self.performance_auto)
+        grid.attach(self.performance_auto_toggle, 0, 4, 2, 1)
         
         # Show the dialog
         dialog.show_all()
         
         # Run the dialog and handle response
         response = dialog.run()
+        stop_thumbnails()
         
         if response == Gtk.ResponseType.OK:
             # Save the selected animation
             selected_animation = self.animation_combo.get_active_id()
             if selected_animation:
+                if selected_animation != getattr(self, 'preferred_animation', None):
+                    # The previous set will not be shown again; free it now
+                    self.animation_cache.release(getattr(self, 'preferred_animation', None))
                 self.preferred_animation = selected_animation
                 print(f"Animation preference updated to: {selected_animation}")
                 
@@ -713,11 +791,84 @@ class TeaTimerApp(Gtk.Application):
             # Save nano mode preference
             self.nano_mode = self.nano_mode_toggle.get_active()
             print(f"Nano mode preference updated to: {self.nano_mode}")
+            
+            # Save the performance profile and apply it right away
+            selected_profile = self.performance_combo.get_active_id()
+            if selected_profile in PROFILES:
+                self.performance_profile = selected_profile
+            self.performance_auto = self.performance_auto_toggle.get_active()
+            self._update_performance_profile()
+            print(f"Performance profile updated to: {self.performance_profile} (active: {self.active_profile})")
                 
             self._save_config()
             
         dialog.destroy()
 
+    def _animation_display_name(self, animation):
+        """Name shown for an animation in the Settings dialog."""
+        procedural = get_procedural_animation(animation)
+        if procedural is not None:
+            return procedural.title
+        # Remove underscores and convert to title case
+        display_name = animation.replace("_", " ").title()
+        # Remove the redundant "Animation" word from the display name
+        display_name = display_name.replace("Animation", "").strip()
+        # Special case: change "Test" to "Bouncing Balls"
+        if display_name == "Test":
+            display_name = "Bouncing Balls"
+        return display_name
+
+    def _build_thumbnail_strip(self, animations):
+        """
+        A scrollable row of animated previews, one per animation. Strips are
+        made or read from the thumbnail cache on a worker and fill in as they
+        arrive. Returns the widget and a function that stops the previews.
+        """
+        # Only the settings dialog needs thumbnails
+        from .thumbnails import ThumbnailGenerator, ThumbnailPreview, PREVIEW_INTERVAL
+        row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        previews = {}
+        for animation in animations:
+            preview = ThumbnailPreview()
+            previews[animation] = preview
+            display_name = self._animation_display_name(animation)
+            cell = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
+            cell.pack_start(preview, False, False, 0)
+            cell.pack_start(Gtk.Label(label=display_name), False, False, 0)
+            button = Gtk.Button()
+            button.set_relief(Gtk.ReliefStyle.NONE)
+            button.add(cell)
+            button.set_tooltip_text(f"Use the {display_name} animation")
+            button.get_accessible().set_name(f"Preview of {display_name}")
+            button.connect("clicked", lambda _button, name=animation: self.animation_combo.set_active_id(name))
+            row.pack_start(button, False, False, 0)
+
+        scroller = Gtk.ScrolledWindow()
+        scroller.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.NEVER)
+        scroller.add(row)
+
+        # One frame-clock animation plays every preview; minimal keeps them still
+        animation = None
+        if self._profile().sprite_interval is not None:
+            def step(elapsed):
+                for preview in previews.values():
+                    preview.advance()
+                return True
+            animation = FrameAnimation(row, step, PREVIEW_INTERVAL)
+            animation.start()
+
+        cancel = threading.Event()
+        generator = ThumbnailGenerator(self._asset_index(), PROCEDURAL_ANIMATIONS)
+        run_in_worker(generator.generate, list(animations),
+                      lambda name, strip, cells: previews[name].set_strip(strip, cells), cancel)
+
+        def stop():
+            cancel.set()
+            if animation is not None:
+                animation.stop()
+
+        return scroller, stop
+
     def show_about_dialog(self):
         """Displays the about dialog."""
         # Create about dialog
@@ -739,39 +890,73 @@ class TeaTimerApp(Gtk.Application):
         dialog.run()
         dialog.destroy()
 
-    def _play_notification_sound(self):
+    def _prepare_audio(self):
+        """Worker thread: decodes the first WAV sound once and starts its player."""
+        if self.audio_player is not None:
+            return self.audio_player
+        for path in self._asset_index().sounds():
+            if path.suffix.lower() != ".wav":
+                continue
+            try:
+                sound = load_wav(path)
+            except Exception as e:
+                print(f"Could not decode {path.name}: {e}")
+                continue
+            player = AudioPlayer(sound)
+            player.start()
+            self.audio_player = player
+            return player
+        return None
+
+    def _play_notification_sound(self, pipeline=None):
         """Play a sound notification when timer finishes."""
         if not self.sound_enabled:
             return
-            
+        player = self.audio_player
+        if player is not None:
+            deadline = pipeline.deadline if pipeline is not None else None
+
+            def on_first_sample(latency_ms):
+                # Audio thread; the metrics belong to the main loop
+                if pipeline is not None:
+                    GLib.idle_add(self._record_sound_latency, pipeline, latency_ms)
+
+            player.play(started=deadline, on_first_sample=on_first_sample)
+            return
+        self._spawn_notification_sound()
+
+    @staticmethod
+    def _record_sound_latency(pipeline, latency_ms):
+        pipeline.metrics["sound_first_sample_ms"] = latency_ms
+        return GLib.SOURCE_REMOVE
+
+    def _spawn_notification_sound(self):
+        """Fallback while no preloaded player exists: one player process per sound."""
         def play_sound_task():
             """Defines and tries different strategies to play a sound."""
-            sound_files = [
-                "assets/sound-effects/2025-11-04-session-concludes-01.wav",
-            ]
+            # Absolute paths from the asset index, independent of the working directory
+            sound_files = [str(path) for path in self._asset_index().sounds()]
 
             def strategy_paplay():
                 for sound_file in sound_files:
-                    if os.path.exists(sound_file):
-                        try:
-                            result = subprocess.run(["paplay", sound_file], 
-                                                  capture_output=True, timeout=5)
-                            if result.returncode == 0:
-                                return True
-                        except (subprocess.TimeoutExpired, FileNotFoundError):
-                            continue
+                    try:
+                        result = subprocess.run(["paplay", sound_file], 
+                                              capture_output=True, timeout=5)
+                        if result.returncode == 0:
+                            return True
+                    except (subprocess.TimeoutExpired, FileNotFoundError):
+                        continue
                 return False
 
             def strategy_aplay():
                 for sound_file in sound_files:
-                    if os.path.exists(sound_file):
-                        try:
-                            result = subprocess.run(["aplay", sound_file], 
-                                                  capture_output=True, timeout=5)
-                            if result.returncode == 0:
-                                return True
-                        except (subprocess.TimeoutExpired, FileNotFoundError):
-                            continue
+                    try:
+                        result = subprocess.run(["aplay", sound_file], 
+                                              capture_output=True, timeout=5)
+                        if result.returncode == 0:
+                            return True
+                    except (subprocess.TimeoutExpired, FileNotFoundError):
+                        continue
                 return False
 
             def strategy_system_beep():
@@ -806,6 +991,11 @@ class TeaTimerApp(Gtk.Application):
                 accessible.set_name("Timer Display")
                 accessible.set_description("Displays the remaining time for the tea timer")
 
+            accessible = self.countdown_display.get_accessible()
+            if accessible:
+                accessible.set_name("Timer Display")
+                accessible.set_description("Displays the remaining time for the tea timer")
+
             accessible = self.start_button.get_accessible()
             if accessible:
                 accessible.set_name("Start Tea Timer")
@@ -881,79 +1071,102 @@ class TeaTimerApp(Gtk.Application):
         quit_action = Gio.SimpleAction.new("quit", None)
         quit_action.connect("activate", lambda a, p: self.quit())
         self.add_action(quit_action)
-        self.set_accels_for_action("app.quit", ["<Control>q"]); self.config_manager = ConfigManager()
+        self.set_accels_for_action("app.quit", ["<Control>q"])
 
     def _load_config(self):
         """Loads configuration from the config file."""
-        if CONFIG_FILE.exists():
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    config = json.load(f)
-                    
-                    # Load font scale
-                    scale = config.get("font_scale_factor", DEFAULT_FONT_SCALE)
-                    if scale is None or not isinstance(scale, (int, float)):
-                        scale = DEFAULT_FONT_SCALE
-                    self.font_scale_factor = max(MIN_FONT_SCALE, min(MAX_FONT_SCALE, scale))
-                    
-                    # Only load last_duration from config if not set via command line
-                    env_duration = os.environ.get('TEATIME_DURATION')
-                    if env_duration is None:
-                        last_dur = config.get("last_duration", 5)
-                        if last_dur is None or not isinstance(last_dur, int):
-                            try:
-                                last_dur = int(last_dur)
-                            except (ValueError, TypeError):
-                                last_dur = 5
-                        self.last_duration = last_dur
-                        
-                    # Load preferred animation
-                    pref_anim = config.get("preferred_animation", "puppy_animation")
-                    if pref_anim is None or not isinstance(pref_anim, str):
-                        pref_anim = "puppy_animation"
-                    self.preferred_animation = pref_anim
-                    
-                    # Load preferred skin
-                    pref_skin = config.get("preferred_skin", "default")
-                    if pref_skin is None or not isinstance(pref_skin, str):
-                        pref_skin = "default"
-                    self.preferred_skin = pref_skin
-                    
-                    # Load mini-mode preference
-                    mini = config.get("mini_mode", False)
-                    if mini is None or not isinstance(mini, bool):
-                        mini = bool(mini)
-                    self.mini_mode = mini
-                    
-                    # Load nano-mode preference
-                    nano = config.get("nano_mode", False)
-                    if nano is None or not isinstance(nano, bool):
-                        nano = bool(nano)
-                    self.nano_mode = nano
-                    
-                    # Initialize nano mode tracking (not persisted)
-                    self.pre_timer_mode = None
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
-                print(f"Error decoding config file: {CONFIG_FILE}. Using defaults. Error: {e}")
-                self.preferred_animation = "puppy_animation"
-                self.preferred_skin = "default"
-                self.mini_mode = False
-                self.nano_mode = False
-                self.pre_timer_mode = None
-            except Exception as e:
-                print(f"An unexpected error occurred while loading config: {e}. Using defaults.")
-                self.preferred_animation = "puppy_animation"
-                self.preferred_skin = "default"
-                self.mini_mode = False
-                self.nano_mode = False
-                self.pre_timer_mode = None
+        # ConfigManager reports unreadable files and returns {}; it also keeps
+        # the bytes it read, so an unchanged config is not written back
+        config = self._config_writer().load()
+        if not isinstance(config, dict):
+            print(f"Error decoding config file: {CONFIG_FILE}. Using defaults.")
+            config = {}
+        if config:
+            # Load font scale
+            scale = config.get("font_scale_factor", DEFAULT_FONT_SCALE)
+            if scale is None or not isinstance(scale, (int, float)):
+                scale = DEFAULT_FONT_SCALE
+            self.font_scale_factor = max(MIN_FONT_SCALE, min(MAX_FONT_SCALE, scale))
+
+            # Load last duration (an explicit --duration overrides it later)
+            last_dur = config.get("last_duration", 5)
+            if last_dur is None or not isinstance(last_dur, int):
+                try:
+                    last_dur = int(last_dur)
+                except (ValueError, TypeError):
+                    last_dur = 5
+            self.last_duration = last_dur
+
+            # Load preferred animation
+            pref_anim = config.get("preferred_animation", "puppy_animation")
+            if pref_anim is None or not isinstance(pref_anim, str):
+                pref_anim = "puppy_animation"
+            self.preferred_animation = pref_anim
+
+            # Load preferred skin
+            pref_skin = config.get("preferred_skin", "default")
+            if pref_skin is None or not isinstance(pref_skin, str):
+                pref_skin = "default"
+            self.preferred_skin = pref_skin
+
+            # Load mini-mode preference
+            mini = config.get("mini_mode", False)
+            if mini is None or not isinstance(mini, bool):
+                mini = bool(mini)
+            self.mini_mode = mini
+
+            # Load nano-mode preference
+            nano = config.get("nano_mode", False)
+            if nano is None or not isinstance(nano, bool):
+                nano = bool(nano)
+            self.nano_mode = nano
+
+            # Load screen-reader announcement pacing
+            min_interval = config.get("announcement_min_interval", DEFAULT_MIN_INTERVAL)
+            if not isinstance(min_interval, (int, float)) or min_interval < 0:
+                min_interval = DEFAULT_MIN_INTERVAL
+            self.announcement_min_interval = float(min_interval)
+
+            interval = config.get("announcement_interval", DEFAULT_PERIODIC_INTERVAL)
+            if not isinstance(interval, (int, float)) or interval < 0:
+                interval = DEFAULT_PERIODIC_INTERVAL
+            self.announcement_interval = float(interval)
+
+            coalesce_ms = config.get("announcement_coalesce_ms", self.announcement_coalesce_ms)
+            if not isinstance(coalesce_ms, int) or coalesce_ms < 0:
+                coalesce_ms = int(DEFAULT_COALESCE_WINDOW * 1000)
+            self.announcement_coalesce_ms = coalesce_ms
+
+            # Load the overlay warm-up lead time (0 disables it)
+            warmup = config.get("warmup_seconds", DEFAULT_WARMUP_SECONDS)
+            if not isinstance(warmup, (int, float)) or warmup < 0:
+                warmup = DEFAULT_WARMUP_SECONDS
+            self.warmup_seconds = warmup
+
+            # Load the decoded animation memory budget
+            cache_mb = config.get("animation_cache_mb", DEFAULT_CACHE_BUDGET_MB)
+            if not isinstance(cache_mb, (int, float)) or cache_mb <= 0:
+                cache_mb = DEFAULT_CACHE_BUDGET_MB
+            self.animation_cache_mb = cache_mb
+
+            # Load performance profile
+            profile = config.get("performance_profile", DEFAULT_PROFILE)
+            if profile not in PROFILES:
+                profile = DEFAULT_PROFILE
+            self.performance_profile = profile
+
+            auto = config.get("performance_auto", True)
+            if not isinstance(auto, bool):
+                auto = True
+            self.performance_auto = auto
         else:
             # Default animation if no config file exists
             self.preferred_animation = "puppy_animation"
             self.preferred_skin = "default"
             self.mini_mode = False
             self.nano_mode = False
-            self.pre_timer_mode = None
+        # Initialize nano mode tracking (not persisted)
+        self.pre_timer_mode = None
 
     def _save_config(self):
         """Saves the current configuration to the config file."""
@@ -966,147 +1179,77 @@ class TeaTimerApp(Gtk.Application):
                 "preferred_animation": getattr(self, 'preferred_animation', 'test_animation'),
                 "preferred_skin": getattr(self, 'preferred_skin', 'default'),
                 "mini_mode": getattr(self, 'mini_mode', False),
-                "nano_mode": getattr(self, 'nano_mode', False)
+                "nano_mode": getattr(self, 'nano_mode', False),
+                "announcement_min_interval": self.announcement_min_interval,
+                "announcement_interval": self.announcement_interval,
+                "announcement_coalesce_ms": self.announcement_coalesce_ms,
+                "animation_cache_mb": self.animation_cache_mb,
+                "warmup_seconds": self.warmup_seconds,
+                "performance_profile": self.performance_profile,
+                "performance_auto": self.performance_auto,
             }
-            CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(config_data, f, indent=2)
+            # Written off the main loop once the changes stop; flushed on quit
+            self._config_writer().schedule_save(config_data)
         except Exception as e:
             print(f"Error saving config file: {e}")
 
+    def _config_writer(self):
+        if self.config_manager is None:
+            self.config_manager = ConfigManager(CONFIG_FILE)
+        return self.config_manager
+
     def _apply_font_size(self):
         """Applies the current font scale factor using CSS."""
-        try:
-            # Define multipliers for a clear visual hierarchy
-            timer_font_multiplier = 2.5   # 250% of the base scale
-            control_font_multiplier = 1.2 # 120% for general controls like labels and buttons
-
-            timer_font_percentage = self.font_scale_factor * timer_font_multiplier * 100
-            control_font_percentage = self.font_scale_factor * control_font_multiplier * 100
-
-            # Calculate focus glow color from the current hue
-            fr, fg, fb = colorsys.hsv_to_rgb(self.focus_hue / 360.0, 0.9, 1.0)
-            glow_rgba = f"rgba({int(fr*255)}, {int(fg*255)}, {int(fb*255)}, 0.8)"
-            border_rgb = f"rgb({int(fr*255)}, {int(fg*255)}, {int(fb*255)})"
-
-            css = f"""
-            /* Target the main timer display to make it large and scalable */
-            .time-display {{
-                font-size: {timer_font_percentage}%;
-                font-weight: bold;
-            }}
-
-            /* Target the main timer display to make it large and scalable */
-            .time-display {{
-                font-size: {timer_font_percentage}%;
-                font-weight: bold;
-            }}
+        # Each piece is pre-rendered and cached; unchanged pieces are not reparsed
+        if self._profile().focus_transition:
+            self.styles.set_css("base", BASE_CSS + FOCUS_TRANSITION_CSS)
+        else:
+            self.styles.set_css("base", BASE_CSS)
+        self.styles.set_css("font", font_scale_css(font_scale_step(self.font_scale_factor)))
+        self._apply_focus_glow()
+        self._apply_rainbow_color()
 
-            /* Apply a larger font to general controls for better readability */
-            .input-label, button label, checkbutton label {{
-                font-size: {control_font_percentage}%;
-            }}
+    def _apply_focus_glow(self):
+        """Applies the focus glow colour for the current focus hue."""
+        self.styles.set_css("focus", focus_glow_css(quantize_hue(self.focus_hue)))
 
-            /* Add a smooth transition to the focus glow */
-            button,
-            checkbutton,
-            spinbutton {{
-                transition: box-shadow 0.2s ease-in-out, border-color 0.2s ease-in-out;
-            }}
-
-            /* Add a glow effect to focused widgets for better keyboard navigation visibility */
-            button:focus,
-            checkbutton:focus,
-            spinbutton:focus {{
-                outline: none; /* Remove the default dotted outline */
-                box-shadow: 0 0 8px 3px {glow_rgba}; /* A nice rainbow glow */
-                border-color: {border_rgb}; /* A matching border color for consistency */
-            }}
-            """
-            
-            # Add rainbow effect (always calculated, but only applied if class is present)
-            r, g, b = colorsys.hsv_to_rgb(self.rainbow_hue / 360.0, 1.0, 1.0)
-            color = f"rgb({int(r*255)}, {int(g*255)}, {int(b*255)})"
-            css += f"""
-                .rainbow-text {{
-                    color: {color};
-                }}
-                """
-            self.css_provider.load_from_data(css.encode())
-        except Exception as e:
-            print(f"Error applying font size: {e}")
+    def _apply_rainbow_color(self):
+        """Applies the .rainbow-text colour for the current rainbow hue."""
+        self.styles.set_css("rainbow", rainbow_css(quantize_hue(self.rainbow_hue)))
 
     def _apply_skin(self):
         """Applies the selected skin to the main window."""
         skin = getattr(self, 'preferred_skin', 'default')
-        
-        if skin == 'default':
-            # Remove any custom background styling
-            css = """
-            window {
-                background-color: #f0f0f0;
-                background-image: none;
-            }
-            """
-        elif skin == 'lava':
-            # Apply lava lamp effect using gradients
-            # We'll create a dynamic gradient that changes with the rainbow hue
-            h1 = self.rainbow_hue
-            h2 = (self.rainbow_hue + 120) % 360
-            h3 = (self.rainbow_hue + 240) % 360
-            
-            r1, g1, b1 = colorsys.hsv_to_rgb(h1 / 360.0, 0.8, 0.7)
-            r2, g2, b2 = colorsys.hsv_to_rgb(h2 / 360.0, 0.8, 0.7)
-            r3, g3, b3 = colorsys.hsv_to_rgb(h3 / 360.0, 0.8, 0.7)
-            
-            color1 = f"rgb({int(r1*255)}, {int(g1*255)}, {int(b1*255)})"
-            color2 = f"rgb({int(r2*255)}, {int(g2*255)}, {int(b2*255)})"
-            color3 = f"rgb({int(r3*255)}, {int(g3*255)}, {int(b3*255)})"
-            
-            css = f"""
-            window {{
-                background: linear-gradient(45deg, {color1}, {color2}, {color3});
-                background-size: 300% 300%;
-                animation: lavaFlow 60s ease infinite;
-            }}
-            
-            @keyframes lavaFlow {{
-                0% {{ background-position: 0% 50%; }}
-                50% {{ background-position: 100% 50%; }}
-                100% {{ background-position: 0% 50%; }}
-            }}
-            """
-        else:
-            # Default fallback
-            css = """
-            window {
-                background-color: #f0f0f0;
-                background-image: none;
-            }
-            """
-        
-        # Apply the skin CSS
-        try:
-            skin_provider = Gtk.CssProvider()
-            skin_provider.load_from_data(css.encode())
-            
-            # Add the skin provider with higher priority than the main one
-            screen = Gdk.Screen.get_default()
-            if screen:
-                Gtk.StyleContext.add_provider_for_screen(
-                    screen, skin_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 1
-                )
-        except Exception as e:
-            print(f"Error applying skin: {e}")
+        # Apply the skin CSS (the skin layer sits above the font layer). It does
+        # not depend on the hue, so it is only parsed when the skin changes.
+        self.styles.set_css("skin", skin_css(skin))
+        if self.window:
+            self.window.queue_draw()
+
+    def _queue_lava_redraw(self):
+        """Repaints the lava skin when its hue bucket changed or while it flows."""
+        if not self.window or getattr(self, 'preferred_skin', 'default') != 'lava':
+            return
+        if self._profile().lava_animated or quantize_hue(self.rainbow_hue) != self._lava_drawn_hue:
+            self.window.queue_draw()
 
-            r, g, b = colorsys.hsv_to_rgb(self.rainbow_hue / 360.0, 1.0, 1.0)
-            color = f"rgb({int(r*255)}, {int(g*255)}, {int(b*255)})"
-            css += f"""
-                .rainbow-text {{
-                    color: {color};
-                }}
-                """
-            self.css_provider.load_from_data(css.encode())
+    def _on_window_draw(self, widget, cr):
+        """Paints the lava skin behind the main box from cached gradient surfaces."""
+        if getattr(self, 'preferred_skin', 'default') != 'lava' or not hasattr(self, 'main_box'):
+            return False
+        # Cover the main box including its margins, i.e. the window's content area
+        box = self.main_box
+        allocation = box.get_allocation()
+        x = allocation.x - box.get_margin_start()
+        y = allocation.y - box.get_margin_top()
+        width = allocation.width + box.get_margin_start() + box.get_margin_end()
+        height = allocation.height + box.get_margin_top() + box.get_margin_bottom()
+        flow = LavaBackground.flow_at(time.monotonic()) if self._profile().lava_animated else 0.0
+        # Nano mode keeps the skin as a translucent layer behind the digits
+        alpha = 0.3 if self.styles.is_active("nano") else 1.0
+        if self.lava_background.paint(cr, self.rainbow_hue, x, y, width, height, flow, alpha):
+            self._lava_drawn_hue = quantize_hue(self.rainbow_hue)
+        return False  # Let GTK draw the children on top
 
     def _update_font_size_announcement(self):
         """Updates the accessible description for the font size buttons."""
@@ -1174,24 +1317,107 @@ class TeaTimerApp(Gtk.Application):
         print(f"Sound notifications {status}")
 
     def _start_rainbow_timer(self):
-        """Start the rainbow color cycling timer."""
-        if self.rainbow_timer_id:
-            GLib.source_remove(self.rainbow_timer_id)
-        self.rainbow_timer_id = GLib.timeout_add(500, self._update_rainbow)
+        """Start the rainbow color cycling on the main window's frame clock."""
+        if not self.window:
+            return
+        interval = self._profile().rainbow_interval
+        if interval is None:
+            # Static colours in the minimal profile
+            self._stop_rainbow_timer()
+            return
+        if self.rainbow_animation is None:
+            self.rainbow_animation = FrameAnimation(self.window, self._update_rainbow, interval)
+        self.rainbow_animation.interval = interval
+        self.rainbow_animation.start()
 
     def _stop_rainbow_timer(self):
-        """Stop the rainbow color cycling timer."""
-        if self.rainbow_timer_id:
-            GLib.source_remove(self.rainbow_timer_id)
-            self.rainbow_timer_id = None
-
-    def _update_rainbow(self):
-        """Update the rainbow color effect."""
-        self.rainbow_hue = (self.rainbow_hue + 1) % 360
-        self._apply_font_size()
-        self._apply_skin()  # Also update the skin if it uses rainbow colors
+        """Stop the rainbow color cycling."""
+        if self.rainbow_animation:
+            self.rainbow_animation.stop()
+
+    def _update_rainbow(self, elapsed=RAINBOW_INTERVAL):
+        """Update the rainbow color effect by the time that has elapsed."""
+        self.rainbow_hue = (self.rainbow_hue + elapsed * RAINBOW_DEGREES_PER_SECOND) % 360
+        self._apply_rainbow_color()
+        self._queue_lava_redraw()  # The lava skin follows the rainbow hue
+        return True
+
+    def _profile(self):
+        """Settings of the performance profile currently in effect."""
+        return PROFILE_SETTINGS[self.active_profile]
+
+    def _watch_performance_triggers(self):
+        """Re-evaluate the profile when animations are toggled or the power source changes."""
+        if self._performance_watched:
+            return
+        self._performance_watched = True
+        settings = Gtk.Settings.get_default()
+        if settings is not None:
+            settings.connect("notify::gtk-enable-animations", lambda *args: self._update_performance_profile())
+        self._start_power_poll()
+
+    def _start_power_poll(self):
+        if self._power_poll_id is None:
+            self._power_poll_id = GLib.timeout_add_seconds(POWER_POLL_SECONDS, self._on_power_poll)
+
+    def _stop_power_poll(self):
+        if self._power_poll_id is not None:
+            GLib.source_remove(self._power_poll_id)
+            self._power_poll_id = None
+
+    def _on_window_visibility_changed(self):
+        """Polls the power source only while the window can be seen."""
+        if not self._performance_watched:
+            return
+        if self._window_mapped and not self._window_iconified:
+            if self._power_poll_id is None:
+                # Catch up on a change missed while hidden
+                self._update_performance_profile()
+                self._start_power_poll()
+        else:
+            self._stop_power_poll()
+
+    def _on_window_mapped(self, window, mapped):
+        self._window_mapped = mapped
+        self._on_window_visibility_changed()
+
+    def _on_power_poll(self):
+        self._update_performance_profile()
         return GLib.SOURCE_CONTINUE
 
+    def _update_performance_profile(self):
+        """Selects the active profile and re-applies the effects it gates."""
+        profile = select_profile(
+            self.performance_profile,
+            auto=self.performance_auto,
+            reduced_motion=reduced_motion(Gtk.Settings.get_default()),
+            on_battery=on_battery() if self.performance_auto else False,
+        )
+        if profile == self.active_profile:
+            return
+        print(f"Performance profile: {profile}")
+        self.active_profile = profile
+        if not self.window:
+            return
+        self._apply_font_size()
+        self._apply_skin()
+        self._start_rainbow_timer()
+        if self.sprite_animation:
+            if self._profile().sprite_interval is None:
+                self.sprite_animation.stop()
+            else:
+                self.sprite_animation.interval = self._profile().sprite_interval
+
+    def _on_window_state_event(self, window, event):
+        """Pause frame-clock animations and the power poll while the main window is iconified."""
+        if event.changed_mask & Gdk.WindowState.ICONIFIED:
+            iconified = bool(event.new_window_state & Gdk.WindowState.ICONIFIED)
+            if self.rainbow_animation:
+                self.rainbow_animation.set_paused(iconified)
+            self._window_iconified = iconified
+            self._on_window_visibility_changed()
+        return False
+
     def on_start_clicked(self, *args):
         # Store the current mode before starting timer if nano mode is enabled
         # Only do this if we're not already in nano mode (i.e., when starting a fresh timer)
@@ -1214,25 +1440,26 @@ class TeaTimerApp(Gtk.Application):
         if getattr(self, 'use_seconds', False):
             self.time_left = current_duration  # already in seconds
         else:
-            self.time_left = current_duration * 60  # minutes â†’ seconds
+            self.time_left = current_duration * 60  # minutes → seconds
         # DEBUG: show the exact countdown in seconds
         print(f"DEBUG: time_left = {self.time_left} seconds")    
         self.current_timer_duration = current_duration
+        self._deadline = time.monotonic() + self.time_left
         self.start_timer()
-        self.start_button.set_sensitive(False)
-        self.stop_button.set_sensitive(True)
         print("Timer started")
         
-        # Update time display
-        self.time_label.set_markup(f"<span>{self.time_left // 60:02d}:{self.time_left % 60:02d}</span>")
-        
-        # Update accessibility description
-        try:
-            accessible = self.time_label.get_accessible()
-            if accessible:
-                accessible.set_description(f"Tea timer started for {current_duration} minutes.")
-        except Exception as e:
-            print(f"Warning: Could not update accessibility description: {e}")
+        # Views (display, buttons, accessibility, control socket) follow the state
+        self.timer_state.update(
+            phase=RUNNING,
+            session=self.timer_state.get("session", 0) + 1,
+            duration=current_duration,
+            unit=self._duration_unit(),
+            time_left=self.time_left,
+            display=self._format_time(self.time_left),
+        )
+        # A restart invalidates any warm-up; short timers warm up right away
+        self._cancel_warmup()
+        self._maybe_warm_up()
 
     def on_stop_clicked(self, *args):
         # Stop any previous rainbow effect
@@ -1242,23 +1469,117 @@ class TeaTimerApp(Gtk.Application):
 
         self.stop_timer()
         self.time_left = 0
-        self.time_label.set_markup("<span>00:00</span>")
+        self._cancel_warmup()
         
         # Restore the mode that was active before timer started
         self._restore_pre_timer_mode()
         
-        self.start_button.set_sensitive(True)
-        self.stop_button.set_sensitive(False)
         print("Timer stopped")
-        
-        # Update accessibility description
+        self.timer_state.update(phase=STOPPED, time_left=0, display="00:00")
+
+    def start_session(self, duration=None):
+        """Starts the timer, optionally with a new duration. Used by the control socket."""
+        if not self.window:
+            return False
+        if duration is not None:
+            self.duration_spin.set_value(duration)
+        self.on_start_clicked()
+        return True
+
+    def stop_session(self):
+        """Stops the timer. Used by the control socket."""
+        if not self.window:
+            return False
+        self.on_stop_clicked()
+        return True
+
+    def get_timer_status(self):
+        """Returns a JSON-serialisable snapshot of the timer."""
+        return {
+            "id": "main",
+            "phase": self.timer_state.get("phase"),
+            "running": self.timer_id is not None,
+            "duration": self.current_timer_duration,
+            "unit": self._duration_unit(),
+            "time_left": max(0, int(self.time_left)),
+            # Milliseconds from the deadline to each completion milestone
+            "last_completion": dict(self._completion.metrics),
+        }
+
+    def _duration_unit(self):
+        """Unit of the duration spin button: seconds in developer/test mode."""
+        return "seconds" if getattr(self, 'use_seconds', False) else "minutes"
+
+    @staticmethod
+    def _format_time(seconds):
+        seconds = max(0, int(seconds))
+        return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+    def _subscribe_views(self):
+        """Connects the main window's widgets to the timer state."""
+        self.timer_state.subscribe(self._render_time_display, ("display",))
+        self.timer_state.subscribe(self._render_countdown, ("display",))
+        self.timer_state.subscribe(self._render_controls, ("phase",))
+        self.timer_state.subscribe(self._announce_timer_state, ("phase", "session", "time_left"))
+        # Render the initial state before the window is first drawn
+        self.timer_state.flush()
+
+    def _render_time_display(self, state, changed):
+        if self.countdown_display.get_visible():
+            return  # Nano mode draws the countdown instead of relayouting the label
+        self.time_label.set_markup(f"<span>{state['display']}</span>")
+
+    def _render_countdown(self, state, changed):
+        if countdown_can_draw(state["display"]):
+            self.countdown_display.set_text(state["display"])
+        elif self.countdown_display.get_visible():
+            # The atlas only holds MM:SS glyphs; other text (e.g. "Session
+            # Complete") goes to the label, in this same render
+            self.countdown_display.set_visible(False)
+            self.time_label.set_visible(True)
+            self._render_time_display(state, changed)
+
+    def _render_controls(self, state, changed):
+        running = state["phase"] == RUNNING
+        self.start_button.set_sensitive(not running)
+        self.stop_button.set_sensitive(running)
+
+    def _announce_timer_state(self, state, changed):
+        """Queues screen-reader announcements for timer state changes."""
+        phase = state["phase"]
+        if "phase" in changed or "session" in changed:
+            if phase == RUNNING:
+                self.announcer.announce(f"Tea timer started for {state['duration']} {state.get('unit', 'minutes')}.", PRIORITY_STATE)
+            elif phase == STOPPED:
+                self.announcer.announce("Tea timer stopped and reset.", PRIORITY_STATE)
+            elif phase == COMPLETE:
+                self.announcer.announce("Tea is ready! The timer has finished.", PRIORITY_COMPLETION)
+        elif phase == RUNNING and "time_left" in changed:
+            # Every tick is offered; the scheduler keeps to announcement_interval
+            minutes, seconds = divmod(state["time_left"], 60)
+            self.announcer.announce(
+                f"Time remaining: {minutes} minutes and {seconds} seconds.", PRIORITY_PERIODIC
+            )
+
+    def _describe_time_label(self, description):
+        """Delivers an announcement to ATK via the time label's description."""
         try:
-            accessible = self.time_label.get_accessible()
-            if accessible:
-                accessible.set_description("Tea timer stopped and reset.")
+            for widget in (self.time_label, self.countdown_display):
+                accessible = widget.get_accessible()
+                if accessible:
+                    accessible.set_description(description)
         except Exception as e:
             print(f"Warning: Could not update accessibility description: {e}")
 
+    def _publish_control_events(self, state, changed):
+        """Forwards timer state changes to control socket subscribers."""
+        if not self.control_server:
+            return
+        if state["phase"] == RUNNING:
+            self.control_server.broadcast("tick", self.get_timer_status())
+        elif state["phase"] == COMPLETE and "phase" in changed:
+            self.control_server.broadcast("complete", self.get_timer_status())
+
     def start_timer(self):
         if self.timer_id:
             GLib.source_remove(self.timer_id)
@@ -1267,126 +1588,161 @@ class TeaTimerApp(Gtk.Application):
     def stop_timer(self):
         if self.timer_id:
             GLib.source_remove(self.timer_id)
-            self.timer_id = None
+        self.timer_id = None
 
     def update_timer(self):
         self.time_left -= 5
-        minutes = int(self.time_left // 60)
-        seconds = int(self.time_left % 60)
-        self.time_label.set_markup(f"<span>{minutes:02d}:{seconds:02d}</span>")
-        
-        # Update accessibility description at key moments
-        if self.time_left % 10 == 0 or self.time_left <= 5:
-            try:
-                accessible = self.time_label.get_accessible()
-                if accessible:
-                    accessible.set_description(f"Time remaining: {minutes} minutes and {seconds} seconds.")
-            except Exception as e:
-                print(f"Warning: Could not update accessibility description: {e}")
 
         if self.time_left <= 0:
-            self.stop_timer()
-            self.time_label.set_markup("<span>Session Complete</span>")
-            
-            # Restore the mode that was active before timer started
-            self._restore_pre_timer_mode()
-            
-            # Start the celebratory rainbow effect!
-            self.time_label.get_style_context().add_class("rainbow-text")
-            self._start_rainbow_timer()
-
-            # Play notification sound
-            self._play_notification_sound()
-
-            # Show fullscreen notification with embedded sprite animation
-            self._show_fullscreen_notification()
-            
-            # Log the completed timer
-            print("DEBUG: About to call _log_timer_completion")
-            self._log_timer_completion()
-            print("DEBUG: Finished calling _log_timer_completion")
-            
-            try:
-                accessible = self.time_label.get_accessible()
-                if accessible:
-                    accessible.set_description("Tea is ready! The timer has finished.")
-            except Exception as e:
-                print(f"Warning: Could not update accessibility description: {e}")
-            
-            self.start_button.set_sensitive(True)
-            self.stop_button.set_sensitive(False)
-            
-            # Reset the time display after a delay to match the notification duration
-            GLib.timeout_add_seconds(5, self._reset_time_display)
-            
+            # The timeout is removed by returning SOURCE_REMOVE below
+            self.timer_id = None
+            self.time_left = 0
+            self._completion.run(deadline=self._deadline)
             print("Tea is ready!")
             return GLib.SOURCE_REMOVE
+
+        self.timer_state.update(time_left=self.time_left, display=self._format_time(self.time_left))
+        self._maybe_warm_up()
         return GLib.SOURCE_CONTINUE
 
+    def _maybe_warm_up(self):
+        """Prepares the Session Complete overlay once the deadline is warmup_seconds away."""
+        if not self.warmup_seconds or self.time_left > self.warmup_seconds or not self.timer_id:
+            return
+        session = self.timer_state.get("session")
+        if self._warmup_session == session:
+            return
+        # Frames freed after the previous overlay are about to be needed again
+        self._cancel_sprite_release()
+        self._warmup_session = session
+        self._warmup_done = False
+        cancel = self._warmup_cancel = threading.Event()
+        animation = getattr(self, 'preferred_animation', 'test_animation')
+        print(f"Warming up the '{animation}' overlay {self.time_left}s before the deadline")
+
+        def on_ready(result):
+            if cancel.is_set():
+                return
+            self._warmup_done = True
+            if result:
+                frames, rendered = result
+                self.sprite_frames = self.animation_cache.put(animation, frames)
+                self.sprite_surfaces.store(rendered, *SPRITE_AREA_SIZE)
+                self._prepared_notification = self._prepare_notification()
+            waiting, self._warmup_waiting = self._warmup_waiting, None
+            if waiting is not None:
+                self._complete_show_overlay(waiting)
+
+        run_in_worker(self._prepare_overlay_assets, animation,
+                      self.animation_cache.get(animation), cancel, on_done=on_ready)
+
+    def _prepare_overlay_assets(self, animation, frames, cancel):
+        """Worker thread: decodes (unless cached) and pre-scales one animation."""
+        try:
+            if frames is None:
+                frames = self._load_sprite_frames(animation, cancel)
+            if cancel.is_set() or not frames:
+                return None
+            rendered = self.sprite_surfaces.prerender(animation, frames, *SPRITE_AREA_SIZE, cancel=cancel)
+            if cancel.is_set():
+                return None
+            return frames, rendered
+        except Exception as e:
+            print(f"Overlay warm-up failed: {e}")
+            return None
+
+    def _cancel_warmup(self):
+        """Abandons warm-up work and any overlay it built, e.g. when the timer is stopped."""
+        if self._warmup_cancel is not None:
+            self._warmup_cancel.set()
+        self._warmup_cancel = None
+        self._warmup_session = None
+        self._warmup_done = False
+        self._warmup_waiting = None
+        if self._prepared_notification is not None:
+            # The pooled overlay stays hidden for the next completion
+            self._prepared_notification = None
+            # Nothing will show the decoded frames now
+            self._schedule_sprite_release()
+
     def _reset_time_display(self):
         """Reset the time display after timer completion."""
-        self.time_label.set_markup("<span>00:00</span>")
-        self.time_label.get_style_context().remove_class("rainbow-text")
-        self._apply_font_size()  # Reset color
+        # A new timer may have been started while the celebration was showing
+        if self.timer_state.get("phase") == COMPLETE:
+            self.timer_state.update(phase=IDLE, display="00:00")
+            self.time_label.get_style_context().remove_class("rainbow-text")
+            self._apply_font_size()  # Reset color
         return GLib.SOURCE_REMOVE
 
-    def _log_timer_completion(self):
-        """Logs a completed timer session to the stats file."""
-        try:
-            # Ensure we have a valid duration value
-            if not hasattr(self, 'current_timer_duration') or self.current_timer_duration is None:
-                print("DEBUG: current_timer_duration not set, using default value")
-                duration = int(self.duration_spin.get_value()) if hasattr(self, 'duration_spin') else 5
-            else:
-                duration = int(self.current_timer_duration)
-                
-            log_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "duration": duration
-            }
-            
-            print(f"DEBUG: Creating log entry with duration {duration}")
-            
-            # Ensure the data directory exists
-            stats_dir = STATS_LOG_FILE.parent
-            if not stats_dir.exists():
-                stats_dir.mkdir(parents=True, exist_ok=True)
-                print(f"DEBUG: Created directory {stats_dir}")
-            
-            # Read existing logs or create empty list
-            logs = []
-            if STATS_LOG_FILE.exists():
-                try:
-                    with open(STATS_LOG_FILE, 'r') as f:
-                        content = f.read().strip()
-                        if content:
-                            logs = json.loads(content)
-                            print(f"DEBUG: Loaded {len(logs)} existing entries")
-                        else:
-                            print("DEBUG: Stats file is empty")
-                except (json.JSONDecodeError, IOError) as e:
-                    print(f"DEBUG: Error reading stats file: {e}")
-                    # If there's an error reading the file, start with empty logs
-                    logs = []
+    def _complete_show_state(self, pipeline):
+        """Completion stage 1: show "Session Complete" before anything else runs."""
+        self.timer_state.update(phase=COMPLETE, time_left=0, display="Session Complete")
+        self.timer_state.flush()
+        # Start the celebratory rainbow effect!
+        self.time_label.get_style_context().add_class("rainbow-text")
+
+    def _complete_restore_mode(self, pipeline):
+        """Completion stage 2: leave nano mode and start the rainbow."""
+        # Restore the mode that was active before timer started
+        self._restore_pre_timer_mode()
+        self._start_rainbow_timer()
+        # Reset the time display after a delay to match the notification duration
+        GLib.timeout_add_seconds(5, self._reset_time_display)
+
+    def _complete_play_sound(self, pipeline):
+        """Completion stage 3: notification sound (queued to the audio thread)."""
+        self._play_notification_sound(pipeline)
+
+    def _complete_show_overlay(self, pipeline):
+        """Completion stage 4: fullscreen overlay, decoding sprites off the main thread."""
+        self._cancel_sprite_release()
+        if self._warmup_cancel is not None and not self._warmup_done:
+            # The warm-up is still decoding; it shows the overlay when it is ready
+            self._warmup_waiting = pipeline
+            return
+        self._warmup_cancel = None
+        if self._prepared_notification is not None:
+            self._show_fullscreen_notification(pipeline)
+            return
+        animation = getattr(self, 'preferred_animation', 'test_animation')
+        frames = self.animation_cache.get(animation)
+        if frames:
+            self.sprite_frames = frames
+            self._show_fullscreen_notification(pipeline)
+            return
+
+        def on_frames_loaded(frames):
+            if frames is None:
+                # Loading raised (e.g. a corrupt file); drawn frames need no files
+                print(f"Could not load the '{animation}' animation; showing {FALLBACK_ANIMATION}")
+                self.sprite_frames = self.animation_cache.put(
+                    FALLBACK_ANIMATION, get_procedural_animation(FALLBACK_ANIMATION).frames())
             else:
-                print("DEBUG: Stats file doesn't exist yet")
-            
-            # Add new entry
-            logs.append(log_entry)
-            print(f"DEBUG: Added entry, now have {len(logs)} entries")
-            
-            # Write updated logs
-            with open(STATS_LOG_FILE, 'w') as f:
-                json.dump(logs, f, indent=2)
-            print(f"DEBUG: Successfully wrote stats to {STATS_LOG_FILE}")
-                
-        except Exception as e:
-            # Print to stderr so it's more visible
-            import sys
-            print(f"Error logging statistics: {e}", file=sys.stderr)
-            import traceback
-            traceback.print_exc(file=sys.stderr)
-            
+                self.sprite_frames = self.animation_cache.put(animation, frames)
+            self._show_fullscreen_notification(pipeline)
+
+        run_in_worker(self._load_sprite_frames, animation, on_done=on_frames_loaded)
+
+    def _complete_log_session(self, pipeline):
+        """Completion stage 5: append to the stats log on a worker thread."""
+        self._log_timer_completion()
+
+    def _log_timer_completion(self):
+        """Logs a completed timer session to the stats file in the background."""
+        # Ensure we have a valid duration value
+        if not hasattr(self, 'current_timer_duration') or self.current_timer_duration is None:
+            print("DEBUG: current_timer_duration not set, using default value")
+            duration = int(self.duration_spin.get_value()) if hasattr(self, 'duration_spin') else 5
+        else:
+            duration = int(self.current_timer_duration)
+
+        log_entry = {
+            "timestamp": datetime.now().isoformat(),
+            "duration": duration
+        }
+        print(f"DEBUG: Creating log entry with duration {duration}")
+        return run_in_worker(StatsManager(STATS_LOG_FILE).append, log_entry)
+
     def on_preset_clicked(self, button, minutes):
         """Sets the duration spin button to a preset value and starts the timer."""
         self.duration_spin.set_value(minutes)
@@ -1394,126 +1750,163 @@ class TeaTimerApp(Gtk.Application):
         # Automatically start the timer
         self.on_start_clicked()
 
-    def _show_fullscreen_notification(self):
-        """Displays a temporary, fullscreen notification on the same monitor as the main window."""
-        notification_window = Gtk.Window(type=Gtk.WindowType.POPUP)
-        notification_window.set_decorated(False)
-        notification_window.set_keep_above(True)
-        
-        # Get the monitor where the main window is located
+    def _monitor_geometry(self):
+        """(x, y, width, height) of the monitor showing the main window, or None."""
         if self.window and self.window.get_window():
             display = self.window.get_window().get_display()
             monitor = display.get_monitor_at_window(self.window.get_window())
-            
-            # Get the geometry of the monitor
             geometry = monitor.get_geometry()
-            
-            # Set the window to cover the entire monitor
-            notification_window.move(geometry.x, geometry.y)
-            notification_window.set_size_request(geometry.width, geometry.height)
-        else:
-            # Fallback to fullscreen if we can't determine the monitor
-            notification_window.fullscreen()
-
-        # A box to center the content vertically
-        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
-        main_box.set_valign(Gtk.Align.CENTER)
-        notification_window.add(main_box)
-
-        # The message label
-        label = Gtk.Label()
-        label.set_markup("<span font_desc='Sans Bold 60px' foreground='white'>Session Complete</span>")
-        main_box.pack_start(label, False, False, 0)
-        
-        # Load sprite frames if not already loaded
-        if not self.sprite_frames:
-            self.sprite_frames = self._load_sprite_frames()
-        
-        # Add sprite animation if frames are available
-        if self.sprite_frames:
-            self.current_sprite_frame = 0  # Reset to first frame
-            self.sprite_drawing_area = Gtk.DrawingArea()
-            self.sprite_drawing_area.set_size_request(300, 300)  # Set a fixed size
-            self.sprite_drawing_area.connect("draw", self._on_sprite_draw)
-            main_box.pack_start(self.sprite_drawing_area, False, False, 0)
-            
-            # Start animation timer (adjust speed as needed)
-            if self.sprite_timer_id:
-                GLib.source_remove(self.sprite_timer_id)
-            
-            self.sprite_timer_id = GLib.timeout_add(100, self._update_sprite_frame_notification)  # 10 FPS
-
-        # Set a dark, semi-transparent background for the window
-        css_provider = Gtk.CssProvider()
-        css = b"""
-        window {
-            background-color: rgba(0, 0, 0, 0.75);
-        }
-        """
-        css_provider.load_from_data(css)
-        context = notification_window.get_style_context()
-        context.add_provider(css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+            return (geometry.x, geometry.y, geometry.width, geometry.height)
+        return None
+
+    def _prepare_notification(self):
+        """Configures the pooled Session Complete overlay for this monitor, without showing it."""
+        geometry = self._monitor_geometry()
+        overlay = self.overlays.get(geometry)
+        overlay.configure(
+            "<span font_desc='Sans Bold 60px' foreground='white'>Session Complete</span>",
+            show_sprite=bool(self.sprite_frames),
+            geometry=geometry,
+        )
+        self.sprite_drawing_area = overlay.sprite_area if self.sprite_frames else None
+        # Loaded once; the selector only matches overlay windows, so it stays attached
+        self.styles.set_css("overlay", OVERLAY_CSS)
+        return overlay
 
-        notification_window.show_all()
+    def _show_fullscreen_notification(self, pipeline=None):
+        """Displays a temporary, fullscreen notification on the same monitor as the main window."""
+        # Load sprite frames if not already loaded (the completion pipeline decodes them off-thread)
+        if not self.sprite_frames and pipeline is None:
+            animation = getattr(self, 'preferred_animation', 'test_animation')
+            self.sprite_frames = self.animation_cache.get(animation) or \
+                self.animation_cache.put(animation, self._load_sprite_frames(animation))
+
+        # Use the overlay the warm-up configured, so completion only has to map it.
+        # Reconfigure if the main window moved to another monitor since.
+        overlay, self._prepared_notification = self._prepared_notification, None
+        if overlay is None or overlay.geometry != self._monitor_geometry():
+            overlay = self._prepare_notification()
+
+        if self.sprite_drawing_area is not None:
+            self.current_sprite_frame = 0  # Reset to first frame
+            stream = self._sprite_stream()
+            if stream is not None and stream.position:
+                stream.restart()
+            self.sprite_draw_stats.reset()
+            # Play on the drawing area's frame clock; ticks stop while it is unmapped.
+            # The minimal profile shows the first frame only.
+            if self.sprite_animation and self.sprite_animation.widget is not self.sprite_drawing_area:
+                self.sprite_animation.stop()
+                self.sprite_animation = None
+            sprite_interval = self._profile().sprite_interval
+            if stream is not None and sprite_interval is not None and sprite_interval <= SPRITE_FRAME_INTERVAL:
+                # At full speed a stream keeps its own timing; slower profiles still cap it
+                sprite_interval = STREAM_FRAME_INTERVAL
+            if sprite_interval is not None:
+                if self.sprite_animation is None:
+                    self.sprite_animation = FrameAnimation(
+                        self.sprite_drawing_area, self._update_sprite_frame_notification, sprite_interval
+                    )
+                self.sprite_animation.interval = sprite_interval
+                self.sprite_animation.start()
 
-        # Connect click event to close the window
-        notification_window.connect("button-press-event", self._on_notification_clicked)
+        on_mapped = None
+        if pipeline is not None:
+            # Deadline-to-overlay latency, measured when the window is actually mapped
+            def on_mapped(widget, event):
+                return self._on_notification_mapped(widget, event, pipeline)
 
-        # Automatically close the window after 5 seconds
-        GLib.timeout_add_seconds(5, self._close_fullscreen_notification, notification_window)
+        # Closes itself after 5 seconds
+        overlay.show(5, self._close_fullscreen_notification, on_mapped)
         
-    def _update_sprite_frame_notification(self):
-        """Update sprite frame for the notification window."""
+    def _on_notification_mapped(self, widget, event, pipeline):
+        latency = pipeline.mark("overlay_mapped_ms")
+        print(f"Session Complete overlay mapped {latency} ms after the deadline")
+        return False
+
+    def _sprite_stream(self):
+        """The AnimationStream being played, if the animation is a GIF."""
+        if len(self.sprite_frames) == 1 and isinstance(self.sprite_frames[0], AnimationStream):
+            return self.sprite_frames[0]
+        return None
+
+    def _update_sprite_frame_notification(self, elapsed=SPRITE_FRAME_INTERVAL):
+        """Advance the notification's sprite by the frames due in elapsed seconds."""
+        stream = self._sprite_stream()
+        if stream is not None and self.sprite_drawing_area:
+            if stream.advance(elapsed):
+                self.sprite_drawing_area.queue_draw()
+            return True
         if self.sprite_frames and self.sprite_drawing_area:
-            self.current_sprite_frame = (self.current_sprite_frame + 1) % len(self.sprite_frames)
+            frames_due = max(1, int(elapsed / SPRITE_FRAME_INTERVAL))
+            self.current_sprite_frame = (self.current_sprite_frame + frames_due) % len(self.sprite_frames)
             self.sprite_drawing_area.queue_draw()
-            return GLib.SOURCE_CONTINUE
-        return GLib.SOURCE_REMOVE
+            return True
+        return False
+
+    def _asset_index(self, revalidate=False):
+        """
+        The asset index, loaded (usually from its disk cache) on first use.
+        With revalidate, the indexed directories are checked for changes.
+        """
+        with self._asset_index_lock:
+            if self.asset_index is None or (revalidate and self.asset_index.is_stale()):
+                self.asset_index = load_asset_index()
+            return self.asset_index
 
-    def _load_sprite_frames(self):
+    def _load_sprite_frames(self, animation=None, cancel=None):
         """
         Load sprite frames from the assets directory.
         Looks for files with pattern 'sprite_frame_*.png' or converts GIF to frames.
+        Stops early, returning no frames, once cancel (a threading.Event) is set.
         """
         sprite_frames = []
-        assets_dir = Path(__file__).resolve().parents[2] / "assets"
         
         # Check if there's a preferred animation in the config
-        preferred_animation = getattr(self, 'preferred_animation', 'test_animation')
-        
-        # Try to load from the preferred animation directory first
-        sprites_dir = assets_dir / "sprites" / preferred_animation
+        preferred_animation = animation or getattr(self, 'preferred_animation', 'test_animation')
+
+        # Drawn animations need nothing loaded
+        procedural = get_procedural_animation(preferred_animation)
+        if procedural is not None:
+            return procedural.frames()
+
+        assets = self._asset_index()
         
         # If preferred animation doesn't exist, try test_animation as fallback
-        if not sprites_dir.exists():
-            sprites_dir = assets_dir / "sprites" / "test_animation"
+        if not assets.has_animation(preferred_animation):
+            preferred_animation = "test_animation"
+        sprites_dir = assets.directory(preferred_animation)
         
         print(f"Looking for sprites in: {sprites_dir}")
         
-        # Look for individual frame files with "sprite_frame" pattern
-        frame_files = list(sprites_dir.glob("*sprite_frame_*.png"))
-        print(f"Found {len(frame_files)} frame files: {frame_files}")
+        # Frame files with the "sprite_frame" pattern, already in playback order
+        frame_files = assets.frames(preferred_animation)
+        print(f"Found {len(frame_files)} frame files")
         
         if frame_files:
-            # Sort frames by number, handling cases where there might not be digits
-            def extract_number(filename):
-                # Extract all digits from the filename
-                digits = ''.join(filter(str.isdigit, filename.name))
-                # Return 0 if no digits found, otherwise convert to int
-                return int(digits) if digits else 0
-                
-            frame_files.sort(key=extract_number)
-            print(f"Sorted frame files: {frame_files}")
+            # A packed atlas built from these files maps in without decoding anything
+            atlas_frames = load_atlas_frames(sprites_dir.name, sprites_dir, frame_files)
+            if atlas_frames:
+                print(f"Mapped {len(atlas_frames)} sprite frames from the {sprites_dir.name} atlas")
+                return atlas_frames
             for frame_file in frame_files:
+                if cancel is not None and cancel.is_set():
+                    return []
                 try:
                     print(f"Loading sprite frame: {frame_file}")
                     pixbuf = GdkPixbuf.Pixbuf.new_from_file(str(frame_file))
                     sprite_frames.append(pixbuf)
                 except Exception as e:
                     print(f"Could not load sprite frame {frame_file}: {e}")
+            cache_atlas(sprites_dir.name, frame_files, sprite_frames)
         else:
-            # Try to find a GIF file and split it into frames
-            gif_files = list(assets_dir.glob("*.gif"))
+            # An animation cut from a master sheet ships only its atlas
+            atlas_frames = load_atlas_frames(sprites_dir.name, sprites_dir)
+            if atlas_frames:
+                print(f"Mapped {len(atlas_frames)} sprite frames from the {sprites_dir.name} atlas")
+                return atlas_frames
+            # Try to find an animated GIF (or WebP, if its loader is installed)
+            gif_files = assets.animated_files(preferred_animation) + assets.animated_files()
             print(f"Found {len(gif_files)} GIF files: {gif_files}")
             
             if gif_files:
@@ -1521,30 +1914,19 @@ class TeaTimerApp(Gtk.Application):
                 try:
                     gif_path = str(gif_files[0])
                     print(f"Loading sprite from GIF: {gif_path}")
-                    # Load the GIF as an animation
-                    animation = GdkPixbuf.PixbufAnimation.new_from_file(gif_path)
-                    # For simplicity, we'll just use the first frame for now
-                    # A full implementation would extract all frames
-                    iter = animation.get_iter(None)
-                    pixbuf = iter.get_pixbuf()
-                    if pixbuf:
-                        sprite_frames.append(pixbuf)
-                        print(f"Loaded sprite from GIF: {gif_files[0].name}")
+                    # Frames are decoded as the animation plays, a few ahead at a time
+                    sprite_frames.extend(open_animation(gif_path))
+                    print(f"Loaded sprite from GIF: {gif_files[0].name}")
                 except Exception as e:
                     print(f"Could not load GIF file {gif_files[0]}: {e}")
                     print("To use sprite animations, please convert GIF to PNG frames named sprite_frame_00.png, sprite_frame_01.png, etc.")
         
-        # Also check for the sample image in assets
-        image_files = list(assets_dir.glob("*.png")) + list(assets_dir.glob("*.jpg"))
-        # Filter out the sprite frames we already processed
-        image_files = [f for f in image_files if not "sprite_frame" in f.name]
-        print(f"Found {len(image_files)} other image files: {image_files}")
+        # Also check for the sample image in assets (sprite frames are not listed)
+        image_files = assets.images()
         
         if image_files and not sprite_frames:
             # If we have an image but no sprite frames, use the image as a static sprite
             try:
-                # Sort to get a consistent result
-                image_files.sort()
                 print(f"Using {image_files[0]} as static sprite")
                 pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(
                     str(image_files[0]), 200, 200, True)
@@ -1571,34 +1953,38 @@ class TeaTimerApp(Gtk.Application):
         pass
 
     def _on_sprite_draw(self, widget, cr):
-        """Draw the current sprite frame."""
-        print(f"Drawing sprite frame {self.current_sprite_frame}")
-        if self.sprite_frames and 0 <= self.current_sprite_frame < len(self.sprite_frames):
-            alloc = widget.get_allocation()
-            # Draw the actual sprite frame
-            pixbuf = self.sprite_frames[self.current_sprite_frame]
-            # Scale the pixbuf to fit the drawing area while maintaining aspect ratio
-            pixbuf_width = pixbuf.get_width()
-            pixbuf_height = pixbuf.get_height()
-            
-            scale_x = alloc.width / pixbuf_width
-            scale_y = alloc.height / pixbuf_height
-            scale = min(scale_x, scale_y, 1.0)  # Don't upscale
-            
-            scaled_width = int(pixbuf_width * scale)
-            scaled_height = int(pixbuf_height * scale)
-            
-            # Center the image
-            x = (alloc.width - scaled_width) // 2
-            y = (alloc.height - scaled_height) // 2
-            
-            scaled_pixbuf = pixbuf.scale_simple(scaled_width, scaled_height, GdkPixbuf.InterpType.BILINEAR)
-            Gdk.cairo_set_source_pixbuf(cr, scaled_pixbuf, x, y)
-            cr.paint()
-            print(f"Sprite frame {self.current_sprite_frame} drawn")
+        """Draw the current sprite frame from its pre-scaled surface."""
+        if not self.sprite_frames or not 0 <= self.current_sprite_frame < len(self.sprite_frames):
+            return False
+        started = time.perf_counter()
+        frame = self.sprite_frames[self.current_sprite_frame]
+        if isinstance(frame, ProceduralFrame):
+            # Drawn straight into the area at its size and scale; nothing to cache
+            frame.draw(cr, widget.get_allocated_width(), widget.get_allocated_height())
+            self.sprite_draw_stats.record((time.perf_counter() - started) * 1000)
+            return False
+        stream = self._sprite_stream()
+        if stream is not None:
+            # Streamed frames are shown once per pass; render each when it comes up
+            size = (widget.get_allocated_width(), widget.get_allocated_height())
+            if stream.rendered is None or stream.rendered[0] != size:
+                stream.rendered = (size, self.sprite_surfaces.render(stream.frame, *size))
+            cached = stream.rendered[1]
         else:
-            print(f"Skipping draw - no valid sprite frame (current: {self.current_sprite_frame}, total: {len(self.sprite_frames) if self.sprite_frames else 0})")
-        
+            # Scaled to fit the drawing area (never upscaled) once per frame and size
+            cached = self.sprite_surfaces.get(
+                getattr(self, 'preferred_animation', 'test_animation'),
+                self.current_sprite_frame,
+                frame,
+                widget.get_allocated_width(),
+                widget.get_allocated_height(),
+            )
+        if cached is None:
+            return False
+        surface, x, y = cached
+        cr.set_source_surface(surface, x, y)
+        cr.paint()
+        self.sprite_draw_stats.record((time.perf_counter() - started) * 1000)
         return False
 
     def _start_sprite_animation(self):
@@ -1610,7 +1996,6 @@ class TeaTimerApp(Gtk.Application):
         """Update to the next sprite frame."""
         if self.sprite_frames:
             self.current_sprite_frame = (self.current_sprite_frame + 1) % len(self.sprite_frames)
-            print(f"Updated to sprite frame {self.current_sprite_frame}")
             if hasattr(self, 'sprite_drawing_area'):
                 self.sprite_drawing_area.queue_draw()
             return GLib.SOURCE_CONTINUE
@@ -1621,83 +2006,141 @@ class TeaTimerApp(Gtk.Application):
         # Sprite animation is now embedded in the fullscreen notification
         return GLib.SOURCE_REMOVE
 
-    def _on_notification_clicked(self, widget, event):
+    def _schedule_sprite_release(self):
+        """Frees decoded frames shortly after the overlay closes; the next completion re-decodes them."""
+        self._cancel_sprite_release()
+        self._sprite_release_id = GLib.timeout_add_seconds(SPRITE_RELEASE_DELAY, self._release_sprite_frames)
+
+    def _cancel_sprite_release(self):
+        if self._sprite_release_id:
+            GLib.source_remove(self._sprite_release_id)
+            self._sprite_release_id = None
+
+    def _release_sprite_frames(self):
+        """Drops every decoded frame and pre-scaled surface between sessions."""
+        self._sprite_release_id = None
+        released_kib = self.animation_cache.bytes_used // 1024
+        self.sprite_frames = []
+        self.current_sprite_frame = 0
+        self.sprite_drawing_area = None
+        self.animation_cache.release()
+        self.sprite_surfaces.clear()
+        print(f"Released sprite frames ({released_kib} KiB)")
+        return GLib.SOURCE_REMOVE
+
+    def _report_sprite_draw_time(self):
+        """Adds the overlay's per-frame draw time to the last completion's metrics."""
+        stats = self.sprite_draw_stats
+        if not stats.count:
+            return
+        self._completion.metrics.update(stats.summary())
+        print(f"Sprite overlay drew {stats.count} frames, "
+              f"{stats.average_ms:.2f} ms average, {stats.max_ms:.2f} ms max")
+        stats.reset()
+
+    def _on_notification_clicked(self, overlay):
         """Close the notification window on click."""
         print("Notification clicked, closing.")
-        self._close_fullscreen_notification(widget)
-        # Clean up sprite timer if it exists
-        if self.sprite_timer_id:
-            GLib.source_remove(self.sprite_timer_id)
-            self.sprite_timer_id = None
-
-    def _close_fullscreen_notification(self, notification_window):
-        """Callback to close the notification window."""
-        # Clean up sprite timer if it exists
-        if self.sprite_timer_id:
-            GLib.source_remove(self.sprite_timer_id)
-            self.sprite_timer_id = None
-            
-        if notification_window:
-            notification_window.destroy()
+        self._close_fullscreen_notification(overlay)
+
+    def _close_fullscreen_notification(self, overlay):
+        """Hides the notification overlay; the window is kept for the next completion."""
+        # Stop the sprite animation if it is running
+        if self.sprite_animation:
+            self.sprite_animation.stop()
+        self._report_sprite_draw_time()
+        self._schedule_sprite_release()
+        overlay.hide()
         return GLib.SOURCE_REMOVE
 
+    def _add_command_line_options(self):
+        """Registers the options parsed by GApplication."""
+        self.add_main_option(
+            "duration",
+            ord("d"),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.INT,
+            "Timer duration in minutes (1-999); starts the timer",
+            "DURATION"
+        )
+        # Accepted here so it passes through GApplication's parser; the flag
+        # itself is read in main() before the application is constructed.
+        self.add_main_option(
+            "single-instance",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            "Forward this invocation to an already running timer",
+            None
+        )
+
     def do_command_line(self, command_line):
-        """Handle command line arguments before activating the application."""
+        """
+        Handles the command line of this process or, in single-instance mode,
+        one forwarded from a later invocation.
+        """
         options = command_line.get_options_dict()
-        
+
+        if command_line.get_is_remote():
+            print("Received command line from another instance")
+
         # Get the duration from command line if provided
         duration_variant = options.lookup_value("duration", None)
         if duration_variant is not None:
-            self.last_duration = duration_variant.get_int32()
-        
-        # Activate the application
+            duration = max(1, min(999, duration_variant.get_int32()))
+            self.last_duration = duration
+            if self.window:
+                self.duration_spin.set_value(duration)
+            # An explicit duration starts the timer, as it always has
+            self.auto_start = True
+
+        # Activate (or re-present) the application
         self.activate()
         return 0
 
     def do_startup(self):
-        """Set up command line options during application startup."""
+        """Performs one-time setup for the primary instance."""
         Gtk.Application.do_startup(self)
-        
-        # Add command line option for duration
-        action = Gio.SimpleAction.new("duration", GLib.VariantType.new("i"))
-        action.connect("activate", lambda a, p: None)  # No action needed, handled in do_command_line
-        self.add_action(action)
-        
-        # Add the option to the application
-        self.add_main_option(
-            "duration",
-            ord("d"),
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.INT,
-            "Timer duration in minutes (1-999)",
-            "DURATION"
-        )
+
+        # Scripted control (teatime-ctl). Only one instance can own the socket.
+        self.control_server = ControlServer(self)
+        if self.control_server.start():
+            self.timer_state.subscribe(self._publish_control_events, ("phase", "time_left"))
+        else:
+            self.control_server = None
+
+    def do_shutdown(self):
+        """Releases resources owned by the primary instance."""
+        self.announcer.cancel()
+        self._cancel_warmup()
+        self._cancel_sprite_release()
+        self.overlays.destroy_all()
+        if self.config_manager is not None:
+            self.config_manager.flush()
+        if self.audio_player is not None:
+            self.audio_player.close()
+            self.audio_player = None
+        self._stop_power_poll()
+        if self.control_server:
+            self.control_server.stop()
+            self.control_server = None
+        Gtk.Application.do_shutdown(self)
 
 def main(argv=None):
     if argv is None:
         argv = sys.argv
 
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(description='Accessible Tea Timer')
-    parser.add_argument("--duration", type=int, default=5, help="Timer duration in minutes (1-999)")
-
-    # Parse known args to avoid conflicts with GTK arguments
-    args, unknown = parser.parse_known_args(argv[1:])
-
-    # Store duration for use in the app
-    os.environ['TEATIME_DURATION'] = str(args.duration)
-
-    # Determine if we should auto-start the timer (when duration is explicitly provided)
-    auto_start = "--duration" in argv
-
-    # Reconstruct argv without our custom arguments for GTK
-    new_argv = [argv[0]] + unknown
-    sys.argv = new_argv
+    # Only --single-instance must be known before the application exists, since
+    # it decides the application flags. Everything else, including --duration,
+    # is parsed by GApplication and delivered to do_command_line, which lets a
+    # second invocation forward its options to the running instance.
+    parser = argparse.ArgumentParser(description='Accessible Tea Timer', add_help=False)
+    parser.add_argument("--single-instance", action="store_true")
+    args, _unknown = parser.parse_known_args(argv[1:])
 
-    # Create a new Gio.Application
-    app = TeaTimerApp(duration=args.duration, auto_start=auto_start)
+    app = TeaTimerApp(single_instance=args.single_instance)
 
-    exit_status = app.run(sys.argv)
+    exit_status = app.run(argv)
     return exit_status
 
 if __name__ == "__main__":
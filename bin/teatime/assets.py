@@ -0,0 +1,190 @@
+"""Index of the bundled sprites, sounds and images.
+
+The settings dialog, the completion overlay and the notification sound each
+used to rediscover the asset tree with iterdir/glob/exists calls, and the
+frame loader re-sorted frame names by their digits on every completion.
+AssetIndex scans the tree once into a plain dict: animation names mapped to
+their ordered frame files, frame size and animated files, plus the sounds
+and loose images. The dict is cached as JSON under the user cache directory
+together with the mtime of every directory it was built from; adding,
+removing or renaming a file changes its directory's mtime, which makes the
+cache stale.
+
+Frame sizes are read from the PNG header, so building the index decodes
+nothing.
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+
+from .core import CACHE_DIR
+
+# The asset tree sits next to bin/ in a checkout, the snap and the flatpak;
+# installs that put the package elsewhere point TEATIME_ASSETS_DIR at it
+ASSETS_ENV = "TEATIME_ASSETS_DIR"
+BUNDLED_ASSETS_DIR = Path(__file__).resolve().parents[2] / "assets"
+INDEX_CACHE_FILE = CACHE_DIR / "asset_index.json"
+INDEX_VERSION = 1
+
+FRAME_PATTERN = "*sprite_frame_*.png"
+ANIMATED_PATTERNS = ("*.gif", "*.webp")
+SOUND_PATTERNS = ("*.wav", "*.oga", "*.ogg")
+IMAGE_PATTERNS = ("*.png", "*.jpg")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def find_assets_dir(environ=os.environ):
+    """The asset tree to use: $TEATIME_ASSETS_DIR if set, else the bundled one."""
+    override = environ.get(ASSETS_ENV)
+    return Path(override).expanduser() if override else BUNDLED_ASSETS_DIR
+
+
+ASSETS_DIR = find_assets_dir()
+
+
+def frame_number(path):
+    """Sort key for frame files: all digits in the name, 0 if there are none."""
+    digits = ''.join(filter(str.isdigit, Path(path).name))
+    return int(digits) if digits else 0
+
+
+def png_size(path):
+    """(width, height) from a PNG's IHDR chunk, or None if it is not a PNG."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(24)
+    except OSError:
+        return None
+    if len(header) < 24 or not header.startswith(PNG_SIGNATURE) or header[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def _glob(directory, patterns):
+    files = []
+    for pattern in patterns:
+        files.extend(sorted(directory.glob(pattern)))
+    return files
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def build_index(assets_dir=ASSETS_DIR):
+    """Scans the asset tree into the dict AssetIndex wraps."""
+    assets_dir = Path(assets_dir)
+    sprites_dir = assets_dir / "sprites"
+    sounds_dir = assets_dir / "sound-effects"
+    directories = [assets_dir, sprites_dir, sounds_dir]
+
+    animations = {}
+    if sprites_dir.is_dir():
+        for directory in sorted(d for d in sprites_dir.iterdir() if d.is_dir()):
+            directories.append(directory)
+            frames = sorted(directory.glob(FRAME_PATTERN), key=frame_number)
+            animations[directory.name] = {
+                "frames": [str(f) for f in frames],
+                "size": png_size(frames[0]) if frames else None,
+                "animated": [str(f) for f in _glob(directory, ANIMATED_PATTERNS)],
+                "has_atlas": any(directory.glob("*.atlas")),
+            }
+
+    images = [f for f in _glob(assets_dir, IMAGE_PATTERNS) if "sprite_frame" not in f.name]
+    return {
+        "version": INDEX_VERSION,
+        "root": str(assets_dir),
+        "mtimes": {str(d): _mtime(d) for d in directories},
+        "animations": animations,
+        "animated": [str(f) for f in _glob(assets_dir, ("*.gif",))],
+        "sounds": [str(f) for f in _glob(sounds_dir, SOUND_PATTERNS)] if sounds_dir.is_dir() else [],
+        "images": [str(f) for f in images],
+    }
+
+
+class AssetIndex:
+    """Read-only view of an index dict; see load_index()."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def is_stale(self):
+        """True if a directory the index was built from changed since."""
+        return any(_mtime(path) != mtime for path, mtime in self.data["mtimes"].items())
+
+    def animation_names(self):
+        return list(self.data["animations"])
+
+    def has_animation(self, name):
+        return name in self.data["animations"]
+
+    def directory(self, name):
+        return Path(self.data["root"]) / "sprites" / name
+
+    def frames(self, name):
+        """An animation's frame files, in playback order."""
+        entry = self.data["animations"].get(name)
+        return [Path(f) for f in entry["frames"]] if entry else []
+
+    def frame_size(self, name):
+        entry = self.data["animations"].get(name)
+        return tuple(entry["size"]) if entry and entry["size"] else None
+
+    def animated_files(self, name=None):
+        """GIF-like files of an animation, or those loose in the assets directory."""
+        if name is None:
+            return [Path(f) for f in self.data["animated"]]
+        entry = self.data["animations"].get(name)
+        return [Path(f) for f in entry["animated"]] if entry else []
+
+    def has_atlas(self, name):
+        entry = self.data["animations"].get(name)
+        return bool(entry and entry["has_atlas"])
+
+    def sounds(self):
+        return [Path(f) for f in self.data["sounds"]]
+
+    def images(self):
+        return [Path(f) for f in self.data["images"]]
+
+
+def _read_cache(cache_file, assets_dir):
+    try:
+        with open(cache_file, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION \
+            or data.get("root") != str(assets_dir):
+        return None
+    return data
+
+
+def _write_cache(cache_file, data):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"Could not cache the asset index: {e}")
+
+
+def load_index(assets_dir=ASSETS_DIR, cache_file=INDEX_CACHE_FILE):
+    """The cached index if no directory changed since it was written, else a fresh scan."""
+    assets_dir = Path(assets_dir)
+    cache_file = Path(cache_file)
+    data = _read_cache(cache_file, assets_dir)
+    if data is not None:
+        index = AssetIndex(data)
+        if not index.is_stale():
+            return index
+    index = AssetIndex(build_index(assets_dir))
+    _write_cache(cache_file, index.data)
+    return index
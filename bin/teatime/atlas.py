@@ -0,0 +1,241 @@
+"""Packed, memory-mapped sprite atlases.
+
+Decoding an animation used to mean inflating a dozen PNGs into private
+pixbufs. An atlas stores the frames once, already converted to Cairo's
+premultiplied ARGB32 layout, in a single raw file next to a small JSON
+manifest of frame rectangles. Opening it maps the file copy-on-write and
+wraps each frame in place, so loading is a page-in from the page cache and
+every process showing the same animation shares the same physical pages.
+
+Frames are stacked vertically, so each one is a contiguous byte range of the
+file and can be handed to cairo.ImageSurface.create_for_data without a copy.
+
+Atlases are built from an animation's frame PNGs, either ahead of time next
+to them (see scripts/build_sprite_atlas.py) or on first use into the user's
+cache directory. A manifest records the size and hash of the PNGs it was
+built from; if they change the atlas is ignored and rebuilt.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+from pathlib import Path
+
+try:
+    import cairo
+except ImportError:  # pycairo is only needed for drawing, not for importing
+    cairo = None
+
+from .core import CACHE_DIR
+
+ATLAS_VERSION = 1
+ATLAS_FORMAT = "ARGB32"   # cairo.FORMAT_ARGB32: native-endian, premultiplied alpha
+ATLAS_SUFFIX = ".atlas"
+ATLAS_CACHE_DIR = CACHE_DIR / "atlases"
+
+
+def source_signature(paths):
+    """
+    [name, size, sha1] for each source file, in order; None if one is missing.
+    Hashing a dozen small PNGs is far cheaper than inflating them, and unlike
+    mtimes the hashes survive a git checkout, so shipped atlases stay valid.
+    """
+    signature = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        signature.append([Path(path).name, len(data), hashlib.sha1(data).hexdigest()])
+    return signature
+
+
+def pack_frames(sizes):
+    """
+    Lays out frames of the given (width, height) in one column. Returns
+    (atlas width, atlas height, [[x, y, width, height], ...]).
+    """
+    width = max((w for w, _h in sizes), default=0)
+    rects = []
+    y = 0
+    for frame_width, frame_height in sizes:
+        rects.append([0, y, frame_width, frame_height])
+        y += frame_height
+    return width, y, rects
+
+
+def write_atlas(path, frames, sources=None):
+    """
+    Writes frames, each (width, height, stride, ARGB32 bytes), to path and its
+    manifest. Both files are replaced atomically, so a process that mapped the
+    old atlas keeps its pages and a concurrent reader never sees half a file.
+    """
+    path = Path(path)
+    width, height, rects = pack_frames([(w, h) for w, h, _stride, _data in frames])
+    stride = width * 4
+    if cairo is not None:
+        stride = cairo.ImageSurface.format_stride_for_width(cairo.FORMAT_ARGB32, width)
+    blank = bytes(stride)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data_tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    manifest_tmp = path.with_name(f".{path.name}.json.{os.getpid()}.tmp")
+    try:
+        with open(data_tmp, "wb") as f:
+            for frame_width, frame_height, frame_stride, data in frames:
+                row_bytes = frame_width * 4
+                for row in range(frame_height):
+                    start = row * frame_stride
+                    f.write(data[start:start + row_bytes])
+                    f.write(blank[row_bytes:])
+        manifest = {
+            "version": ATLAS_VERSION,
+            "format": ATLAS_FORMAT,
+            "byteorder": sys.byteorder,
+            "width": width,
+            "height": height,
+            "stride": stride,
+            "frames": rects,
+            "sources": sources or [],
+        }
+        with open(manifest_tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(data_tmp, path)
+        os.replace(manifest_tmp, manifest_path(path))
+    finally:
+        for tmp in (data_tmp, manifest_tmp):
+            if tmp.exists():
+                tmp.unlink()
+    return path
+
+
+def manifest_path(path):
+    """name.atlas -> name.atlas.json"""
+    path = Path(path)
+    return path.with_name(path.name + ".json")
+
+
+def read_manifest(path):
+    """The manifest for an atlas file, or None if it is missing or unusable here."""
+    try:
+        with open(manifest_path(path), "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != ATLAS_VERSION \
+            or manifest.get("format") != ATLAS_FORMAT or manifest.get("byteorder") != sys.byteorder:
+        return None
+    try:
+        stride = int(manifest["stride"])
+        height = int(manifest["height"])
+        width = int(manifest["width"])
+        for x, y, frame_width, frame_height in manifest["frames"]:
+            # Every frame must be a whole run of rows inside the file
+            if x != 0 or y < 0 or frame_height <= 0 or frame_width <= 0 \
+                    or frame_width > width or y + frame_height > height:
+                return None
+    except (KeyError, TypeError, ValueError):
+        return None
+    if stride < width * 4:
+        return None
+    return manifest
+
+
+class AtlasFrame:
+    """One frame of a mapped atlas; duck-types the pixbuf size getters."""
+
+    __slots__ = ("width", "height", "stride", "data", "_surface")
+
+    def __init__(self, width, height, stride, data):
+        self.width = width
+        self.height = height
+        self.stride = stride
+        self.data = data   # Writable memoryview into the private mapping
+        self._surface = None
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+    def get_byte_length(self):
+        # Clean file-backed pages: shared between processes and reclaimable by
+        # the kernel, so they do not count against the decoded-frame budget
+        return 0
+
+    def surface(self):
+        """The frame as a cairo.ImageSurface over the mapped bytes (no copy)."""
+        if self._surface is None:
+            self._surface = cairo.ImageSurface.create_for_data(
+                self.data, cairo.FORMAT_ARGB32, self.width, self.height, self.stride
+            )
+        return self._surface
+
+
+class SpriteAtlas:
+    """A mapped atlas file and its frames."""
+
+    def __init__(self, path, manifest, mapping):
+        self.path = Path(path)
+        self.manifest = manifest
+        self._mapping = mapping
+        view = memoryview(mapping)
+        stride = manifest["stride"]
+        self.frames = [
+            AtlasFrame(width, height, stride, view[y * stride:(y + height) * stride])
+            for _x, y, width, height in manifest["frames"]
+        ]
+
+    @classmethod
+    def open(cls, path, sources=None):
+        """
+        Maps an atlas, or returns None if it is missing, damaged or was built
+        from different sources than the given signature.
+        """
+        manifest = read_manifest(path)
+        if manifest is None:
+            return None
+        if sources is not None and manifest.get("sources") != sources:
+            return None
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < manifest["stride"] * manifest["height"]:
+                    return None
+                # ACCESS_COPY maps privately: pages stay shared until written,
+                # and the buffer is writable as create_for_data requires
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return None
+        return cls(path, manifest, mapping)
+
+    def __len__(self):
+        return len(self.frames)
+
+
+def atlas_paths(name, sprites_dir, cache_dir=None):
+    """Where an animation's atlas may live: shipped next to its frames, then the cache."""
+    cache_dir = ATLAS_CACHE_DIR if cache_dir is None else Path(cache_dir)
+    return [Path(sprites_dir) / f"{name}{ATLAS_SUFFIX}", cache_dir / f"{name}{ATLAS_SUFFIX}"]
+
+
+def find_atlas(name, sprites_dir, frame_files=None, cache_dir=None):
+    """
+    Opens the first up-to-date atlas for an animation's frame files, or None.
+    Without frame files (an animation cut from a master sheet ships only its
+    atlas) the atlas next to the animation is used as is.
+    """
+    if not frame_files:
+        atlas = SpriteAtlas.open(Path(sprites_dir) / f"{name}{ATLAS_SUFFIX}")
+        return atlas if atlas is not None and len(atlas) else None
+    sources = source_signature(frame_files)
+    if sources is None:
+        return None
+    for path in atlas_paths(name, sprites_dir, cache_dir):
+        atlas = SpriteAtlas.open(path, sources)
+        if atlas is not None and len(atlas) == len(frame_files):
+            return atlas
+    return None
@@ -0,0 +1,283 @@
+"""Notification sound playback from a preloaded PCM buffer.
+
+Playing the completion sound used to start a thread and then a paplay (or
+aplay) process for every completion, which had to start up, connect to the
+sound server and decode the WAV before the first sample was heard. Here the
+WAV is decoded once with the wave module, and AudioPlayer keeps one playback
+thread and one sink open for the life of the app. A completion hands the
+buffer to that thread, which writes it to the sink in short chunks.
+
+Sinks:
+- PipeSink: a long-lived `pacat` (PulseAudio/PipeWire) or `aplay` (ALSA)
+  process reading raw PCM on stdin; silent between sounds
+- BellSink: the terminal bell, when neither is available
+- FileSink and NullSink: for tests and diagnostics
+
+AudioPlayer.last_latency_ms is the time from the completion deadline to
+the first chunk being accepted by the sink. Time spent in the sink's own
+buffer (about PIPE_LATENCY_MS for pacat) comes on top.
+"""
+
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from collections import namedtuple
+
+CHUNK_SECONDS = 0.02      # PCM written per sink call
+PIPE_LATENCY_MS = 30      # Buffer requested from pacat
+
+# channels, bytes per sample, frames per second, raw interleaved little-endian PCM
+PcmSound = namedtuple("PcmSound", ["channels", "sample_width", "rate", "pcm"])
+
+PACAT_FORMATS = {1: "u8", 2: "s16le", 3: "s24le", 4: "s32le"}
+APLAY_FORMATS = {1: "U8", 2: "S16_LE", 3: "S24_3LE", 4: "S32_LE"}
+
+
+def load_wav(path):
+    """Decodes a PCM WAV file into a PcmSound."""
+    with wave.open(str(path), "rb") as wav:
+        return PcmSound(wav.getnchannels(), wav.getsampwidth(), wav.getframerate(),
+                        wav.readframes(wav.getnframes()))
+
+
+def duration(sound):
+    frame_size = sound.channels * sound.sample_width
+    return len(sound.pcm) / (frame_size * sound.rate) if frame_size and sound.rate else 0.0
+
+
+def chunks(sound, seconds=CHUNK_SECONDS):
+    """The sound's PCM split into whole-frame chunks of about seconds each."""
+    frame_size = sound.channels * sound.sample_width
+    size = max(frame_size, int(sound.rate * seconds) * frame_size)
+    return [sound.pcm[start:start + size] for start in range(0, len(sound.pcm), size)]
+
+
+class NullSink:
+    """Accepts PCM and keeps only a count; records when each write arrived."""
+
+    name = "null"
+
+    def __init__(self):
+        self.bytes_written = 0
+        self.writes = []    # time.monotonic() of each write
+
+    def open(self, sound):
+        return True
+
+    def write(self, data):
+        self.writes.append(time.monotonic())
+        self.bytes_written += len(data)
+
+    def close(self):
+        pass
+
+
+class FileSink(NullSink):
+    """Appends every played sound to a WAV file."""
+
+    name = "file"
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._wav = None
+
+    def open(self, sound):
+        self._wav = wave.open(str(self.path), "wb")
+        self._wav.setnchannels(sound.channels)
+        self._wav.setsampwidth(sound.sample_width)
+        self._wav.setframerate(sound.rate)
+        return True
+
+    def write(self, data):
+        super().write(data)
+        self._wav.writeframes(data)
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+
+class BellSink(NullSink):
+    """Rings the terminal bell once per sound instead of playing it."""
+
+    name = "bell"
+
+    def write(self, data):
+        if not self.writes:
+            print("\a", end="", flush=True)
+        super().write(data)
+
+    def end_of_sound(self):
+        self.writes = []
+
+
+class PipeSink:
+    """Streams raw PCM into one long-lived player process."""
+
+    def __init__(self, name, command):
+        self.name = name
+        self.command = command
+        self._process = None
+
+    @classmethod
+    def pacat(cls, sound):
+        return cls("pacat", [
+            "pacat", "--playback", "--raw", f"--format={PACAT_FORMATS[sound.sample_width]}",
+            f"--rate={sound.rate}", f"--channels={sound.channels}",
+            f"--latency-msec={PIPE_LATENCY_MS}", "--client-name=TeaTime",
+        ])
+
+    @classmethod
+    def aplay(cls, sound):
+        return cls("aplay", [
+            "aplay", "-q", "-t", "raw", "-f", APLAY_FORMATS[sound.sample_width],
+            "-r", str(sound.rate), "-c", str(sound.channels),
+        ])
+
+    def open(self, sound):
+        if self._process is not None and self._process.poll() is None:
+            return True
+        try:
+            self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE,
+                                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            print(f"Could not start {self.name}: {e}")
+            self._process = None
+            return False
+        return True
+
+    def write(self, data):
+        self._process.stdin.write(data)
+        self._process.stdin.flush()
+
+    def close(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=1)
+        except Exception:
+            process.kill()
+
+
+def default_sinks(sound):
+    """Sinks to try in order: PulseAudio/PipeWire, then ALSA, then the bell."""
+    sinks = []
+    if sound.sample_width in PACAT_FORMATS and shutil.which("pacat"):
+        sinks.append(PipeSink.pacat(sound))
+    if sound.sample_width in APLAY_FORMATS and shutil.which("aplay"):
+        sinks.append(PipeSink.aplay(sound))
+    sinks.append(BellSink())
+    return sinks
+
+
+class AudioPlayer:
+    """
+    Plays one preloaded sound through the first sink that works, from a
+    single long-lived thread. play() only queues a request, so it is safe and
+    cheap on the main thread.
+    """
+
+    def __init__(self, sound, sinks=None, clock=time.monotonic):
+        self.sound = sound
+        self.sinks = list(sinks) if sinks is not None else default_sinks(sound)
+        self._chunks = chunks(sound)
+        self._clock = clock
+        self._requests = queue.Queue()
+        self._sink = None
+        self._thread = None
+        self.plays = 0
+        self.last_latency_ms = None
+
+    @property
+    def sink_name(self):
+        return self._sink.name if self._sink is not None else None
+
+    def start(self):
+        """Opens a sink now, so the first completion does not wait for it."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="teatime-audio", daemon=True)
+            self._thread.start()
+        self._requests.put(("open", None, None))
+
+    def play(self, started=None, on_first_sample=None):
+        """
+        Queues the sound. started is the clock time latency is measured from
+        (e.g. the completion deadline); on_first_sample(latency_ms) is called
+        from the audio thread once the first chunk was written.
+        """
+        if self._thread is None:
+            self.start()
+        self._requests.put(("play", self._clock() if started is None else started, on_first_sample))
+
+    def close(self):
+        if self._thread is not None:
+            self._requests.put(("close", None, None))
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def wait_idle(self, timeout=2):
+        """Blocks until every queued request was handled (for tests)."""
+        done = threading.Event()
+        self._requests.put(("sync", done, None))
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            action, arg, callback = self._requests.get()
+            if action == "close":
+                if self._sink is not None:
+                    self._sink.close()
+                    self._sink = None
+                return
+            if action == "sync":
+                arg.set()
+            elif action == "open":
+                self._open_sink()
+            elif action == "play":
+                self._play(arg, callback)
+
+    def _open_sink(self):
+        if self._sink is not None:
+            return True
+        for sink in self.sinks:
+            if sink.open(self.sound):
+                self._sink = sink
+                print(f"Notification sound: using {sink.name}")
+                return True
+        return False
+
+    def _play(self, started, on_first_sample):
+        # A player that died (e.g. the sound server restarted) is restarted
+        # once; a sink that fails twice is dropped for the next one
+        failed = set()
+        while self._open_sink():
+            sink = self._sink
+            try:
+                self._write_all(started, on_first_sample)
+                self.plays += 1
+                return
+            except (OSError, ValueError) as e:
+                print(f"Notification sound: {sink.name} failed: {e}")
+                sink.close()
+                self._sink = None
+                if sink in failed:
+                    self.sinks.remove(sink)
+                failed.add(sink)
+
+    def _write_all(self, started, on_first_sample):
+        for index, chunk in enumerate(self._chunks):
+            self._sink.write(chunk)
+            if index == 0:
+                self.last_latency_ms = round((self._clock() - started) * 1000, 1)
+                if on_first_sample is not None:
+                    on_first_sample(self.last_latency_ms)
+        end_of_sound = getattr(self._sink, "end_of_sound", None)
+        if end_of_sound is not None:
+            end_of_sound()
@@ -0,0 +1,317 @@
+"""Local control socket that lets scripts drive a running timer.
+
+The protocol is newline-delimited JSON-RPC 2.0 over a Unix stream socket.
+Connections are persistent, so a status bar can keep one open and poll it
+without spawning anything. Supported methods:
+
+    start {"duration": minutes}   start (or restart) the timer
+    stop                          stop the timer
+    status                        current timer state
+    list                          all timers (this app runs one)
+    subscribe {"events": [...]}   push "tick" and/or "complete" notifications
+    unsubscribe                   stop receiving notifications
+"""
+
+import json
+import os
+import socket
+import stat
+from pathlib import Path
+
+from gi.repository import GLib
+
+from .core import CONTROL_SOCKET
+
+EVENTS = ("tick", "complete")
+MAX_REQUEST_BYTES = 64 * 1024   # Longest accepted request line
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class ControlError(Exception):
+    """Raised by a method handler to return a JSON-RPC error."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class _ControlClient:
+    """One accepted connection and its buffers."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.inbuf = b""
+        self.outbuf = b""
+        self.events = set()
+        self.closing = False    # Drop once outbuf is flushed
+        self.read_watch = None
+        self.write_watch = None
+
+
+class ControlServer:
+    """Serves the control protocol from the GLib main loop."""
+
+    def __init__(self, app, socket_path=None):
+        self.app = app
+        self.socket_path = Path(socket_path) if socket_path else CONTROL_SOCKET
+        self._listener = None
+        self._listen_watch = None
+        self._clients = {}
+
+    def start(self):
+        """Binds the socket. Returns False if another instance already owns it."""
+        if self._listener:
+            return True
+        try:
+            self._check_socket_dir()
+        except OSError as e:
+            print(f"Could not open control socket {self.socket_path}: {e}")
+            return False
+        if self.socket_path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.socket_path))
+                print(f"Control socket {self.socket_path} is in use by another instance")
+                return False
+            except OSError:
+                # Left behind by a process that did not shut down cleanly
+                self.socket_path.unlink()
+            finally:
+                probe.close()
+        try:
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            # Created 0600 rather than chmod-ed afterwards, so no one else
+            # can connect in between
+            umask = os.umask(0o177)
+            try:
+                listener.bind(str(self.socket_path))
+            finally:
+                os.umask(umask)
+            listener.listen(8)
+            listener.setblocking(False)
+        except OSError as e:
+            print(f"Could not open control socket {self.socket_path}: {e}")
+            return False
+        self._listener = listener
+        self._listen_watch = GLib.io_add_watch(
+            listener.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN, self._on_accept
+        )
+        print(f"Control socket listening on {self.socket_path}")
+        return True
+
+    def _check_socket_dir(self):
+        """
+        Creates the socket's directory if needed (0700) and refuses a
+        directory or an existing socket file that another user could have
+        planted or can write to. Raises PermissionError.
+        """
+        directory = self.socket_path.parent
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+            raise PermissionError(f"{directory} is not a directory owned by this user")
+        if info.st_mode & 0o022:
+            raise PermissionError(f"{directory} is writable by other users")
+        try:
+            info = os.lstat(self.socket_path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+            raise PermissionError(f"{self.socket_path} is not a socket owned by this user")
+
+    def stop(self):
+        """Closes all connections and removes the socket file."""
+        for client in list(self._clients.values()):
+            self._drop_client(client)
+        if self._listen_watch:
+            GLib.source_remove(self._listen_watch)
+            self._listen_watch = None
+        if self._listener:
+            self._listener.close()
+            self._listener = None
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+    def broadcast(self, event, params):
+        """Sends an event notification to every client subscribed to it."""
+        message = None
+        for client in list(self._clients.values()):
+            if event in client.events:
+                if message is None:
+                    message = {"jsonrpc": "2.0", "method": event, "params": params}
+                self._send(client, message)
+
+    def handle_request(self, request, client=None):
+        """Dispatches one decoded request. Returns the response, or None for notifications."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return self._error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return self._error(request_id, INVALID_PARAMS, "params must be an object")
+
+        handler = getattr(self, "_rpc_" + request["method"], None)
+        try:
+            if handler is None:
+                raise ControlError(METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+            result = handler(params, client)
+        except ControlError as e:
+            return self._error(request_id, e.code, e.message)
+        except Exception as e:
+            print(f"Control request {request['method']} failed: {e}")
+            return self._error(request_id, INTERNAL_ERROR, str(e))
+
+        if request_id is None:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    # --- Methods ---------------------------------------------------------
+
+    def _rpc_start(self, params, client):
+        duration = params.get("duration")
+        # bool is an int subclass; JSON true must not start a 1 minute timer
+        if duration is not None and (isinstance(duration, bool) or not isinstance(duration, int)
+                                     or not 1 <= duration <= 999):
+            raise ControlError(INVALID_PARAMS, "duration must be an integer from 1 to 999")
+        if not self.app.start_session(duration):
+            raise ControlError(INTERNAL_ERROR, "The timer window is not ready")
+        return self.app.get_timer_status()
+
+    def _rpc_stop(self, params, client):
+        if not self.app.stop_session():
+            raise ControlError(INTERNAL_ERROR, "The timer window is not ready")
+        return self.app.get_timer_status()
+
+    def _rpc_status(self, params, client):
+        return self.app.get_timer_status()
+
+    def _rpc_list(self, params, client):
+        return {"timers": [self.app.get_timer_status()]}
+
+    def _rpc_subscribe(self, params, client):
+        events = params.get("events", list(EVENTS))
+        if not isinstance(events, list) or any(e not in EVENTS for e in events):
+            raise ControlError(INVALID_PARAMS, f"events must be a list drawn from {list(EVENTS)}")
+        if client is not None:
+            client.events.update(events)
+            return {"subscribed": sorted(client.events)}
+        return {"subscribed": sorted(events)}
+
+    def _rpc_unsubscribe(self, params, client):
+        if client is not None:
+            client.events.clear()
+        return {"subscribed": []}
+
+    # --- Socket plumbing -------------------------------------------------
+
+    @staticmethod
+    def _error(request_id, code, message):
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    def _on_accept(self, fd, condition):
+        try:
+            conn, _addr = self._listener.accept()
+        except BlockingIOError:
+            return GLib.SOURCE_CONTINUE
+        except OSError as e:
+            print(f"Control socket accept failed: {e}")
+            return GLib.SOURCE_CONTINUE
+        conn.setblocking(False)
+        client = _ControlClient(conn)
+        client.read_watch = GLib.io_add_watch(
+            conn.fileno(), GLib.PRIORITY_DEFAULT,
+            GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR,
+            self._on_readable, client,
+        )
+        self._clients[conn.fileno()] = client
+        return GLib.SOURCE_CONTINUE
+
+    def _on_readable(self, fd, condition, client):
+        try:
+            data = client.conn.recv(65536)
+        except BlockingIOError:
+            return GLib.SOURCE_CONTINUE
+        except OSError:
+            data = b""
+        if not data:
+            client.read_watch = None
+            self._drop_client(client)
+            return GLib.SOURCE_REMOVE
+
+        client.inbuf += data
+        while b"\n" in client.inbuf:
+            line, client.inbuf = client.inbuf.split(b"\n", 1)
+            if len(line) > MAX_REQUEST_BYTES:
+                return self._reject_oversized(client)
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = self._error(None, PARSE_ERROR, "Parse error")
+            else:
+                response = self.handle_request(request, client)
+            if response is not None:
+                self._send(client, response)
+        if len(client.inbuf) > MAX_REQUEST_BYTES:
+            return self._reject_oversized(client)
+        return GLib.SOURCE_CONTINUE
+
+    def _reject_oversized(self, client):
+        """Answers a request over MAX_REQUEST_BYTES with a parse error and hangs up."""
+        client.read_watch = None
+        client.inbuf = b""
+        client.closing = True
+        self._send(client, self._error(None, PARSE_ERROR, f"Request exceeds {MAX_REQUEST_BYTES} bytes"))
+        if not client.outbuf:
+            self._drop_client(client)
+        return GLib.SOURCE_REMOVE
+
+    def _send(self, client, message):
+        client.outbuf += json.dumps(message, separators=(",", ":")).encode() + b"\n"
+        self._flush(client)
+
+    def _flush(self, client, *args):
+        try:
+            while client.outbuf:
+                sent = client.conn.send(client.outbuf)
+                client.outbuf = client.outbuf[sent:]
+        except BlockingIOError:
+            # A slow subscriber; finish when the socket drains
+            if client.write_watch is None:
+                client.write_watch = GLib.io_add_watch(
+                    client.conn.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_OUT, self._on_writable, client
+                )
+            return
+        except OSError:
+            self._drop_client(client)
+            return
+
+    def _on_writable(self, fd, condition, client):
+        self._flush(client)
+        if client.outbuf:
+            return GLib.SOURCE_CONTINUE
+        client.write_watch = None
+        if client.closing:
+            self._drop_client(client)
+        return GLib.SOURCE_REMOVE
+
+    def _drop_client(self, client):
+        for attr in ("read_watch", "write_watch"):
+            watch = getattr(client, attr)
+            if watch:
+                GLib.source_remove(watch)
+                setattr(client, attr, None)
+        self._clients = {fd: c for fd, c in self._clients.items() if c is not client}
+        try:
+            client.conn.close()
+        except OSError:
+            pass
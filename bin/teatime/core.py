@@ -1,29 +1,64 @@
 from pathlib import Path
 import json
+import os
+import tempfile
+import threading
 
 # Application metadata
 APP_NAME = "Accessible Tea Timer"
 APP_VERSION = "1.3.6"
+# Stable D-Bus application id, shared with the desktop file and metainfo.
+# Single-instance mode relies on it to find the primary instance.
+APPLICATION_ID = "org.genidma.TeatimeAccessibility"
 
 # Configuration file for font size persistence
 CONFIG_FILE = Path.home() / ".config" / "teatime_config.json"
 STATS_LOG_FILE = Path.home() / ".local/share/teatime_stats.json"
+# Regenerable data (sprite atlases, the asset index); safe to delete
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "teatime"
+# Unix socket used by teatime-ctl to script a running timer. Without a
+# runtime dir it lives in a private (0700) per-user directory under /tmp.
+CONTROL_SOCKET = (
+    Path(os.environ["XDG_RUNTIME_DIR"]) / f"teatime-{os.getuid()}.sock"
+    if os.environ.get("XDG_RUNTIME_DIR")
+    else Path(tempfile.gettempdir()) / f"teatime-{os.getuid()}" / "control.sock"
+)
 DEFAULT_FONT_SCALE = 1.5
 FONT_SCALE_INCREMENT = 0.1
 MIN_FONT_SCALE = 0.8
 MAX_FONT_SCALE = 6.0
 
+CONFIG_SAVE_DELAY = 0.5  # Seconds of quiet before a scheduled config write
+
+
 class ConfigManager:
-    def __init__(self, config_path=None):
+    """
+    Reads and writes the config file. Writes replace the file atomically
+    (temporary file, then os.replace), and content identical to what was
+    last read or written is not written again. schedule_save() coalesces
+    bursts of changes, such as holding A+, into one write on a timer thread;
+    flush() writes whatever is still pending.
+    """
+
+    def __init__(self, config_path=None, delay=CONFIG_SAVE_DELAY):
         self.config_path = Path(config_path) if config_path else CONFIG_FILE
+        self.delay = delay
+        self.writes = 0           # Files actually written
+        self._lock = threading.Lock()
+        self._pending = None      # Serialised config waiting for the timer
+        self._timer = None
+        self._last_bytes = None   # Content of the file as last read or written
 
     def load(self):
         """Loads configuration from the config file."""
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                with open(self.config_path, 'rb') as f:
+                    data = f.read()
+                config = json.loads(data)
+                self._last_bytes = data
+                return config
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError) as e:
                 print(f"Error decoding config file: {self.config_path}. Error: {e}")
                 return {}
             except Exception as e:
@@ -32,18 +67,81 @@ class ConfigManager:
         return {}
 
     def save(self, config_data):
-        """Saves the configuration to the config file."""
+        """Writes the configuration now, replacing any scheduled write."""
+        with self._lock:
+            self._cancel_timer()
+            self._pending = None
+            return self._write(self._serialise(config_data))
+
+    def schedule_save(self, config_data):
+        """
+        Writes the configuration once no further change arrived for delay
+        seconds. The data is serialised now, so later changes to the dict
+        do not leak into the write.
+        """
+        data = self._serialise(config_data)
+        with self._lock:
+            self._pending = data
+            self._cancel_timer()
+            self._timer = threading.Timer(self.delay, self._write_pending)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Writes a scheduled configuration immediately (e.g. on quit)."""
+        with self._lock:
+            self._cancel_timer()
+            data, self._pending = self._pending, None
+            return self._write(data) if data is not None else True
+
+    @property
+    def pending(self):
+        return self._pending is not None
+
+    @staticmethod
+    def _serialise(config_data):
+        return json.dumps(config_data, indent=2).encode()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write_pending(self):
+        with self._lock:
+            self._timer = None
+            data, self._pending = self._pending, None
+            if data is not None:
+                self._write(data)
+
+    def _write(self, data):
+        """Atomically replaces the file with data unless it already holds it. Caller holds _lock."""
+        if data == self._last_bytes:
+            return True
+        tmp = self.config_path.with_name(f".{self.config_path.name}.{os.getpid()}.tmp")
         try:
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, 'w') as f:
-                json.dump(config_data, f, indent=2)
-            return True
+            with open(tmp, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.config_path)
         except Exception as e:
             print(f"Error saving config file: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
             return False
+        self._last_bytes = data
+        self.writes += 1
+        return True
 
 
 class StatsManager:
+    # Serialises read-modify-write cycles from background completion threads
+    _write_lock = threading.Lock()
+
     def __init__(self, stats_path=None):
         self.stats_path = Path(stats_path) if stats_path else STATS_LOG_FILE
 
@@ -58,6 +156,29 @@ class StatsManager:
             print(f"Error loading stats file: {e}")
             return []
 
+    def append(self, entry):
+        """Appends one session entry to the log file. Safe to call from a worker thread."""
+        with self._write_lock:
+            try:
+                self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+                logs = []
+                if self.stats_path.exists():
+                    try:
+                        content = self.stats_path.read_text().strip()
+                        if content:
+                            logs = json.loads(content)
+                    except (json.JSONDecodeError, IOError) as e:
+                        # If there's an error reading the file, start with empty logs
+                        print(f"Error reading stats file: {e}")
+                        logs = []
+                logs.append(entry)
+                with open(self.stats_path, 'w') as f:
+                    json.dump(logs, f, indent=2)
+                return True
+            except Exception as e:
+                print(f"Error logging statistics: {e}")
+                return False
+
     def clear(self):
         """Deletes the stats file."""
         try:
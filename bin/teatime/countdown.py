@@ -0,0 +1,190 @@
+"""Nano-mode countdown drawn from a pre-rendered digit atlas.
+
+A Gtk.Label showing the countdown re-parses markup and re-runs Pango layout
+on every tick, and sizing the nano window needs another layout to measure
+the text. CountdownDisplay instead renders the glyphs 0-9 and ':' once per
+font size into a Cairo surface and composites the time from it; a tick is a
+handful of blits. Digits share one cell width (tabular figures), so the
+widget's size only depends on the scale and the number of characters and is
+computed without measuring text.
+"""
+
+from functools import lru_cache
+
+import gi
+gi.require_version("Gtk", "3.0")
+gi.require_version("PangoCairo", "1.0")
+from gi.repository import Gtk, Pango, PangoCairo
+
+try:
+    import cairo
+except ImportError:  # pycairo is only needed for drawing, not for importing
+    cairo = None
+
+GLYPHS = "0123456789:"
+# Nano mode shows the time at 320% of the base font per font scale step,
+# the same size its CSS used for the label (font_scale * 4.0 * 0.8)
+NANO_FONT_FACTOR = 3.2
+TEXT_COLOR = (0.0, 0.0, 0.0, 1.0)
+HALO_COLOR = (1.0, 1.0, 1.0, 0.5)  # Keeps dark digits readable on dark skins
+
+
+def can_draw(text):
+    """True if every character of text is in the glyph atlas (e.g. "04:59")."""
+    return bool(text) and all(glyph in GLYPHS for glyph in text)
+
+
+def layout_cells(advances):
+    """
+    Places glyphs side by side in an atlas. Digits all get the widest digit's
+    advance so the countdown does not jitter. Returns ({glyph: (x, width)},
+    total width).
+    """
+    digit_width = max(advances.get(digit, 0) for digit in "0123456789")
+    cells = {}
+    x = 0
+    for glyph in GLYPHS:
+        width = digit_width if glyph.isdigit() else advances.get(glyph, 0)
+        cells[glyph] = (x, width)
+        x += width
+    return cells, x
+
+
+def text_width(cells, text):
+    """Width of text composited from the atlas cells; unknown glyphs are skipped."""
+    return sum(cells[glyph][1] for glyph in text if glyph in cells)
+
+
+class GlyphAtlas:
+    """The countdown glyphs of one font, rendered once into a single surface."""
+
+    HALO = 1  # Pixels of halo around each glyph
+
+    def __init__(self, font_description):
+        measure = cairo.Context(cairo.ImageSurface(cairo.FORMAT_ARGB32, 1, 1))
+        layout = PangoCairo.create_layout(measure)
+        layout.set_font_description(font_description)
+
+        advances = {}
+        height = 0
+        for glyph in GLYPHS:
+            layout.set_text(glyph, -1)
+            _ink, logical = layout.get_pixel_extents()
+            advances[glyph] = logical.width + 2 * self.HALO
+            height = max(height, logical.height + 2 * self.HALO)
+        self.cells, width = layout_cells(advances)
+        self.height = height
+
+        self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, max(1, width), max(1, height))
+        cr = cairo.Context(self.surface)
+        for glyph in GLYPHS:
+            x, cell_width = self.cells[glyph]
+            layout.set_text(glyph, -1)
+            _ink, logical = layout.get_pixel_extents()
+            left = x + (cell_width - logical.width) / 2
+            # A cheap halo instead of the label's blurred text-shadow
+            cr.set_source_rgba(*HALO_COLOR)
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                cr.move_to(left + dx * self.HALO, self.HALO + dy * self.HALO)
+                PangoCairo.show_layout(cr, layout)
+            cr.set_source_rgba(*TEXT_COLOR)
+            cr.move_to(left, self.HALO)
+            PangoCairo.show_layout(cr, layout)
+        self.surface.flush()
+
+    def text_width(self, text):
+        return text_width(self.cells, text)
+
+
+@lru_cache(maxsize=8)
+def glyph_atlas(family, pixel_size):
+    """Atlas for a bold font family at a pixel size, shared by all displays."""
+    font = Pango.FontDescription.from_string(family)
+    font.set_weight(Pango.Weight.BOLD)
+    font.set_absolute_size(pixel_size * Pango.SCALE)
+    return GlyphAtlas(font)
+
+
+class CountdownDisplay(Gtk.DrawingArea):
+    """Draws "MM:SS" from a GlyphAtlas; set_text() on a tick only queues a redraw."""
+
+    def __init__(self):
+        super().__init__()
+        self._text = "00:00"
+        self._scale = None
+        self._atlas = None
+        self._sized_for = None   # (atlas, number of glyphs) the size request was made for
+        self.connect("draw", self._on_draw)
+        self.connect("style-updated", self._on_style_updated)
+
+    def set_scale(self, scale):
+        """Switches to the atlas for a font scale; cheap when the scale is unchanged."""
+        if scale == self._scale and self._atlas is not None:
+            return
+        self._scale = scale
+        if cairo is None:
+            return
+        family, base_px = self._base_font()
+        self._atlas = glyph_atlas(family, max(1, round(base_px * scale * NANO_FONT_FACTOR)))
+        self._update_size()
+        self.queue_draw()
+
+    def set_text(self, text):
+        if text == self._text:
+            return
+        self._text = text
+        if self._sized_for is None or self._sized_for[1] != len(text):
+            self._update_size()   # e.g. 99:59 -> 100:00
+        self.queue_draw()
+
+    def get_text(self):
+        return self._text
+
+    def natural_size(self):
+        """Width and height of the current text, without measuring any layout."""
+        if self._atlas is None:
+            return 0, 0
+        return self._atlas.text_width(self._text), self._atlas.height
+
+    def _update_size(self):
+        if self._atlas is None:
+            return
+        self._sized_for = (self._atlas, len(self._text))
+        width, height = self.natural_size()
+        self.set_size_request(width, height)
+
+    def _base_font(self):
+        """Family and pixel size of the widget's default font."""
+        font = self.get_style_context().get_font(Gtk.StateFlags.NORMAL)
+        family = (font.get_family() if font else None) or "Sans"
+        size = font.get_size() / Pango.SCALE if font else 0
+        if size <= 0:
+            return family, 13
+        if font.get_size_is_absolute():
+            return family, size
+        screen = self.get_screen()
+        dpi = screen.get_resolution() if screen else -1
+        return family, size * (dpi if dpi > 0 else 96) / 72
+
+    def _on_style_updated(self, widget):
+        # The base font changed (e.g. desktop text scaling); pick a new atlas
+        if self._scale is not None:
+            scale, self._scale = self._scale, None
+            self.set_scale(scale)
+
+    def _on_draw(self, widget, cr):
+        atlas = self._atlas
+        if atlas is None:
+            return False
+        x = (self.get_allocated_width() - atlas.text_width(self._text)) / 2
+        y = (self.get_allocated_height() - atlas.height) / 2
+        for glyph in self._text:
+            cell = atlas.cells.get(glyph)
+            if cell is None:
+                continue
+            cell_x, cell_width = cell
+            cr.set_source_surface(atlas.surface, x - cell_x, y)
+            cr.rectangle(x, y, cell_width, atlas.height)
+            cr.fill()
+            x += cell_width
+        return False
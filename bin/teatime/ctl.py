@@ -0,0 +1,128 @@
+"""teatime-ctl: command line client for the control socket.
+
+Examples:
+    teatime-ctl start 25
+    teatime-ctl status
+    teatime-ctl subscribe tick complete
+"""
+
+import argparse
+import json
+import socket
+import sys
+from pathlib import Path
+
+from .core import CONTROL_SOCKET
+
+
+class ControlClient:
+    """Minimal blocking JSON-RPC client. One connection serves many calls."""
+
+    def __init__(self, socket_path=None, timeout=2.0):
+        self.socket_path = Path(socket_path) if socket_path else CONTROL_SOCKET
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(str(self.socket_path))
+        self._reader = self._sock.makefile("rb")
+        self._next_id = 1
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def call(self, method, params=None):
+        """Sends a request and returns its result. Raises RuntimeError on an RPC error."""
+        request_id = self._next_id
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+        self._sock.sendall(json.dumps(request).encode() + b"\n")
+        while True:
+            message = self._read_message()
+            # Event notifications may be interleaved with the response
+            if message.get("id") == request_id:
+                break
+        if "error" in message:
+            raise RuntimeError(message["error"].get("message", "Unknown error"))
+        return message.get("result")
+
+    def events(self):
+        """Yields (event, params) pairs after subscribe(). Blocks between events."""
+        self._sock.settimeout(None)
+        while True:
+            message = self._read_message()
+            if "method" in message and "id" not in message:
+                yield message["method"], message.get("params")
+
+    def _read_message(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("The timer closed the connection")
+        return json.loads(line)
+
+
+def _format_status(status):
+    if not status.get("running"):
+        return "idle"
+    minutes, seconds = divmod(status.get("time_left", 0), 60)
+    return f"running {minutes:02d}:{seconds:02d} left of {status.get('duration')} {status.get('unit')}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="teatime-ctl", description="Control a running Accessible Tea Timer")
+    parser.add_argument("--socket", help=f"Control socket path (default: {CONTROL_SOCKET})")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    start_parser = subparsers.add_parser("start", help="Start the timer")
+    start_parser.add_argument("duration", type=int, nargs="?", help="Duration in minutes (1-999)")
+    subparsers.add_parser("stop", help="Stop the timer")
+    subparsers.add_parser("status", help="Show the timer state")
+    subparsers.add_parser("list", help="List timers")
+    subscribe_parser = subparsers.add_parser("subscribe", help="Print tick and completion events")
+    subscribe_parser.add_argument("events", nargs="*", choices=["tick", "complete"], default=["tick", "complete"])
+
+    args = parser.parse_args(argv)
+
+    try:
+        client = ControlClient(args.socket)
+    except OSError as e:
+        print(f"Could not connect to the tea timer: {e}", file=sys.stderr)
+        return 1
+
+    with client:
+        try:
+            if args.command == "subscribe":
+                client.call("subscribe", {"events": args.events})
+                for event, params in client.events():
+                    if args.json:
+                        print(json.dumps({"event": event, "params": params}), flush=True)
+                    else:
+                        print(f"{event}: {_format_status(params)}", flush=True)
+                return 0
+
+            params = {"duration": args.duration} if args.command == "start" and args.duration else None
+            result = client.call(args.command, params)
+        except KeyboardInterrupt:
+            return 0
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif args.command == "list":
+        for status in result["timers"]:
+            print(f"{status['id']}: {_format_status(status)}")
+    else:
+        print(_format_status(result))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
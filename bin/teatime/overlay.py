@@ -0,0 +1,142 @@
+"""Pooled Session Complete overlay windows.
+
+Building a POPUP window with its box, label and drawing area for every
+completion, and destroying it five seconds later, churns widgets and
+compositor surfaces when short timers run back to back. OverlayPool keeps one
+NotificationOverlay per monitor; it is built once, reconfigured (text,
+sprite, geometry) and then only shown and hidden.
+"""
+
+from collections import OrderedDict
+
+from gi.repository import Gtk, GLib
+
+# Dark, semi-transparent backdrop; only matches pooled overlay windows
+OVERLAY_CSS = b"""
+window.teatime-overlay {
+    background-color: rgba(0, 0, 0, 0.75);
+}
+"""
+
+
+class NotificationOverlay:
+    """One fullscreen overlay window and its widgets, reused across completions."""
+
+    def __init__(self, on_sprite_draw, on_click, sprite_size=(300, 300)):
+        self.window = Gtk.Window(type=Gtk.WindowType.POPUP)
+        self.window.set_decorated(False)
+        self.window.set_keep_above(True)
+        self.window.get_style_context().add_class("teatime-overlay")
+        self.window.connect("button-press-event", lambda widget, event: on_click(self))
+
+        # A box to center the content vertically
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
+        box.set_valign(Gtk.Align.CENTER)
+        self.window.add(box)
+
+        self.label = Gtk.Label()
+        box.pack_start(self.label, False, False, 0)
+
+        self.sprite_area = Gtk.DrawingArea()
+        self.sprite_area.set_size_request(*sprite_size)
+        # Keep the allocation at the size the frames were pre-scaled for
+        self.sprite_area.set_halign(Gtk.Align.CENTER)
+        # Shown per completion only when there are frames to play
+        self.sprite_area.set_no_show_all(True)
+        self.sprite_area.connect("draw", on_sprite_draw)
+        box.pack_start(self.sprite_area, False, False, 0)
+
+        self.visible = False
+        self._markup = None
+        self._geometry = None
+        self._fullscreen = False
+        self._close_id = None
+        self._map_handler = None
+
+    @property
+    def geometry(self):
+        """The (x, y, width, height) last configured, None for fullscreen."""
+        return self._geometry
+
+    def configure(self, markup, show_sprite, geometry=None):
+        """Updates the text, the sprite area and the (x, y, width, height) to cover."""
+        if markup != self._markup:
+            self.label.set_markup(markup)
+            self._markup = markup
+        self.sprite_area.set_visible(show_sprite)
+        if geometry is None:
+            # Fallback to fullscreen if the monitor is unknown
+            self.window.fullscreen()
+            self._fullscreen = True
+        elif geometry != self._geometry or self._fullscreen:
+            if self._fullscreen:
+                # A fullscreen window ignores move and resize
+                self.window.unfullscreen()
+                self._fullscreen = False
+            x, y, width, height = geometry
+            self.window.move(x, y)
+            self.window.set_size_request(width, height)
+        self._geometry = geometry
+
+    def show(self, close_after, on_close, on_mapped=None):
+        """Maps the overlay; on_close(overlay) runs after close_after seconds."""
+        self.cancel_close()
+        if self._map_handler is not None:
+            self.window.disconnect(self._map_handler)
+            self._map_handler = None
+        if on_mapped is not None:
+            self._map_handler = self.window.connect("map-event", on_mapped)
+        self.window.show_all()
+        self.visible = True
+        self._close_id = GLib.timeout_add_seconds(close_after, self._on_close_timeout, on_close)
+
+    def hide(self):
+        self.cancel_close()
+        self.window.hide()
+        self.visible = False
+
+    def cancel_close(self):
+        if self._close_id:
+            GLib.source_remove(self._close_id)
+            self._close_id = None
+
+    def destroy(self):
+        self.cancel_close()
+        self.window.destroy()
+
+    def _on_close_timeout(self, on_close):
+        self._close_id = None
+        on_close(self)
+        return GLib.SOURCE_REMOVE
+
+
+class OverlayPool:
+    """One NotificationOverlay per monitor geometry, created on first use."""
+
+    MAX_OVERLAYS = 4  # Monitors come and go; forget the least recently used
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._overlays = OrderedDict()
+        self.created = 0
+
+    def get(self, geometry):
+        overlay = self._overlays.get(geometry)
+        if overlay is None:
+            overlay = self._factory()
+            self.created += 1
+            self._overlays[geometry] = overlay
+            while len(self._overlays) > self.MAX_OVERLAYS:
+                _geometry, stale = self._overlays.popitem(last=False)
+                stale.destroy()
+        else:
+            self._overlays.move_to_end(geometry)
+        return overlay
+
+    def destroy_all(self):
+        for overlay in self._overlays.values():
+            overlay.destroy()
+        self._overlays.clear()
+
+    def __len__(self):
+        return len(self._overlays)
@@ -0,0 +1,83 @@
+"""Performance profiles: how much CPU the decorative animations may use.
+
+The lava skin, rainbow glow and sprite overlay are pleasant but not free on
+battery-powered laptops and thin clients. A profile decides how often the
+rainbow hue advances, whether the lava gradient flows, how fast the sprite
+overlay plays and whether focus changes fade. The user picks one; with
+automatic mode on, minimal is used whenever the desktop asks for reduced
+animations or the system is running on battery.
+
+Everything here is free of GTK so the selection logic can be tested alone.
+"""
+
+from collections import namedtuple
+from pathlib import Path
+
+FULL = "full"
+BALANCED = "balanced"
+MINIMAL = "minimal"
+PROFILES = (FULL, BALANCED, MINIMAL)
+DEFAULT_PROFILE = FULL
+
+POWER_SUPPLY_DIR = Path("/sys/class/power_supply")
+POWER_POLL_SECONDS = 60  # How often the power source is re-read while the window is visible
+
+ProfileSettings = namedtuple(
+    "ProfileSettings",
+    [
+        "rainbow_interval",   # Seconds between hue updates, None for a static hue
+        "lava_animated",      # Whether the Cairo-drawn lava gradient flows on each rainbow tick
+        "sprite_interval",    # Seconds between overlay sprite redraws, None for a still frame
+        "focus_transition",   # Whether the focus glow fades in
+    ],
+)
+
+PROFILE_SETTINGS = {
+    FULL: ProfileSettings(rainbow_interval=0.5, lava_animated=True, sprite_interval=0.1, focus_transition=True),
+    BALANCED: ProfileSettings(rainbow_interval=2.0, lava_animated=False, sprite_interval=0.2, focus_transition=True),
+    MINIMAL: ProfileSettings(rainbow_interval=None, lava_animated=False, sprite_interval=None, focus_transition=False),
+}
+
+
+def _read(path):
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def on_battery(power_supply_dir=POWER_SUPPLY_DIR):
+    """
+    True if no mains adapter is online and a system battery is discharging.
+    Peripheral batteries (mice, keyboards) are ignored. Unknown is False.
+    """
+    try:
+        supplies = list(Path(power_supply_dir).iterdir())
+    except OSError:
+        return False
+    discharging = False
+    for supply in supplies:
+        kind = _read(supply / "type")
+        if kind in ("Mains", "USB") and _read(supply / "online") == "1":
+            return False
+        if kind == "Battery" and _read(supply / "scope") != "Device" \
+                and _read(supply / "status") == "Discharging":
+            discharging = True
+    return discharging
+
+
+def reduced_motion(settings):
+    """True if the desktop has turned animations off (gtk-enable-animations)."""
+    if settings is None:
+        return False
+    try:
+        return not settings.get_property("gtk-enable-animations")
+    except Exception:
+        return False
+
+
+def select_profile(preferred, auto=True, reduced_motion=False, on_battery=False):
+    """Returns the profile to use for a preference and the current system state."""
+    if auto and (reduced_motion or on_battery):
+        return MINIMAL
+    return preferred if preferred in PROFILES else DEFAULT_PROFILE
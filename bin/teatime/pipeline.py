@@ -0,0 +1,78 @@
+"""Helpers for keeping slow work off GLib callbacks.
+
+run_in_worker() runs blocking I/O on a daemon thread and hands the result back
+to the main loop with GLib.idle_add. CompletionPipeline runs the steps that
+follow a finished timer in order, one main-loop iteration each, so the first
+(visible) step paints before later steps start, and records how long after
+the deadline each milestone was reached.
+"""
+
+import threading
+import time
+
+from gi.repository import GLib
+
+
+def run_in_worker(func, *args, on_done=None, on_error=None):
+    """
+    Runs func(*args) on a worker thread; on_done(result) runs on the main loop.
+    If func raises, on_error(exception) runs instead, or on_done(None) when
+    there is no on_error, so whatever waits for the result still continues.
+    """
+    def deliver(callback, result):
+        callback(result)
+        return GLib.SOURCE_REMOVE
+
+    def worker():
+        try:
+            result = func(*args)
+        except Exception as e:
+            print(f"Background task {getattr(func, '__name__', func)} failed: {e}")
+            if on_error is not None:
+                GLib.idle_add(deliver, on_error, e)
+            elif on_done is not None:
+                GLib.idle_add(deliver, on_done, None)
+            return
+        if on_done is not None:
+            GLib.idle_add(deliver, on_done, result)
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    return thread
+
+
+class CompletionPipeline:
+    """Ordered completion stages with deadline-relative timing."""
+
+    def __init__(self, stages, clock=time.monotonic):
+        self.stages = list(stages)   # (name, callable(pipeline)) pairs
+        self._clock = clock
+        self.deadline = None
+        self.metrics = {}
+
+    def run(self, deadline=None):
+        """Runs the first stage now and schedules the rest on later iterations."""
+        self.deadline = deadline if deadline is not None else self._clock()
+        self.metrics = {}
+        self._run_from(0)
+
+    def mark(self, milestone):
+        """Records milliseconds from the deadline to now under milestone."""
+        if self.deadline is None:
+            return None
+        elapsed_ms = round((self._clock() - self.deadline) * 1000, 1)
+        self.metrics[milestone] = elapsed_ms
+        return elapsed_ms
+
+    def _run_from(self, index):
+        if index >= len(self.stages):
+            return GLib.SOURCE_REMOVE
+        name, stage = self.stages[index]
+        try:
+            stage(self)
+        except Exception as e:
+            print(f"Completion stage {name} failed: {e}")
+        self.mark(f"{name}_ms")
+        if index + 1 < len(self.stages):
+            GLib.idle_add(self._run_from, index + 1)
+        return GLib.SOURCE_REMOVE
@@ -0,0 +1,201 @@
+"""Sprite animations drawn with Cairo at runtime instead of loaded from files.
+
+The puppy and bouncing-ball frames in assets/sprites were baked to PNGs by
+the scripts in archives/, and the app then decodes and rescales them again.
+A procedural animation skips all of that: each frame is drawn straight into
+the overlay's DrawingArea, as vectors, at the size and device scale of the
+area. Nothing is read, decoded or resampled, and the frames stay sharp on
+high-DPI screens.
+
+New animations are added with register_animation(); they then show up in
+the Settings dialog next to the PNG animations.
+"""
+
+import colorsys
+import math
+from collections import OrderedDict
+
+try:
+    import cairo
+except ImportError:  # pycairo is only needed for drawing, not for importing
+    cairo = None
+
+DESIGN_SIZE = 200   # Drawing functions work in a 200x200 box, like the old PNG frames
+FRAME_COUNT = 12
+
+
+def draw_puppy(cr, progress):
+    """The puppy face from archives/create_puppy_sprites.py at progress 0..1."""
+    # Draw head (circle)
+    cr.set_source_rgb(1.0, 0.9, 0.7)  # Light cream color for head
+    cr.arc(100, 100, 50, 0, 2 * math.pi)
+    cr.fill()
+
+    # Draw ears (floppy ears that move gently)
+    ear_angle = 0.1 * math.sin(2 * math.pi * progress)
+    cr.set_source_rgb(0.9, 0.7, 0.4)  # Cream/brown color for ears
+    cr.move_to(75, 65)
+    cr.curve_to(60, 50 + 10 * math.sin(ear_angle),
+                70, 30 + 5 * math.sin(ear_angle),
+                85, 45)
+    cr.close_path()
+    cr.fill()
+    cr.move_to(125, 65)
+    cr.curve_to(140, 50 + 10 * math.sin(ear_angle + math.pi / 2),
+                130, 30 + 5 * math.sin(ear_angle + math.pi / 2),
+                115, 45)
+    cr.close_path()
+    cr.fill()
+
+    # Eye whites
+    cr.set_source_rgb(1, 1, 1)
+    cr.arc(85, 90, 10, 0, 2 * math.pi)
+    cr.fill()
+    cr.arc(115, 90, 10, 0, 2 * math.pi)
+    cr.fill()
+
+    # Eye pupils (they move slightly to look more alive)
+    cr.set_source_rgb(0, 0, 0)
+    pupil_offset = 2 * math.sin(2 * math.pi * progress)
+    cr.arc(85 + pupil_offset, 90, 5, 0, 2 * math.pi)
+    cr.fill()
+    cr.arc(115 + pupil_offset, 90, 5, 0, 2 * math.pi)
+    cr.fill()
+
+    # Eye shine
+    cr.set_source_rgb(1, 1, 1)
+    cr.arc(83 + pupil_offset, 88, 1.5, 0, 2 * math.pi)
+    cr.fill()
+    cr.arc(113 + pupil_offset, 88, 1.5, 0, 2 * math.pi)
+    cr.fill()
+
+    # Nose
+    cr.set_source_rgb(0.2, 0.1, 0.0)
+    cr.arc(100, 105, 4, 0, 2 * math.pi)
+    cr.fill()
+
+    # Mouth (smile that changes with animation)
+    cr.set_source_rgb(0.5, 0.2, 0.1)
+    cr.set_line_width(2)
+    cr.move_to(90, 115)
+    smile_factor = 0.5 + 0.5 * math.sin(progress * math.pi)
+    cr.curve_to(100, 120 + 5 * smile_factor, 100, 120 + 5 * smile_factor, 110, 115)
+    cr.stroke()
+
+    # Tongue appears in second half of animation
+    if progress > 0.5:
+        cr.set_source_rgb(1.0, 0.7, 0.7)
+        cr.arc(100, 120 + 3 * smile_factor, 3, 0, math.pi)
+        cr.fill()
+
+    # Rosy cheeks
+    cr.set_source_rgba(1.0, 0.7, 0.7, 0.3)
+    cr.arc(75, 105, 8, 0, 2 * math.pi)
+    cr.fill()
+    cr.arc(125, 105, 8, 0, 2 * math.pi)
+    cr.fill()
+
+    # Wagging tail
+    cr.set_source_rgb(0.9, 0.7, 0.4)
+    cr.set_line_width(6)
+    cr.move_to(150, 100)
+    cr.line_to(160 + 5 * math.cos(2 * math.pi * progress), 95 + 5 * math.sin(2 * math.pi * progress))
+    cr.stroke()
+
+
+def draw_bouncing_ball(cr, progress):
+    """The circling ball from archives/create_test_sprites.py at progress 0..1."""
+    radius = 40
+    center_x = 100 + 60 * math.cos(2 * math.pi * progress)
+    center_y = 100 + 60 * math.sin(2 * math.pi * progress)
+
+    # Change color based on frame
+    cr.set_source_rgb(*colorsys.hsv_to_rgb(progress % 1.0, 1.0, 1.0))
+    cr.arc(center_x, center_y, radius, 0, 2 * math.pi)
+    cr.fill()
+
+    # Add a border
+    cr.set_source_rgb(0, 0, 0)
+    cr.set_line_width(3)
+    cr.arc(center_x, center_y, radius, 0, 2 * math.pi)
+    cr.stroke()
+
+
+def frame_transform(box_width, box_height, design_size=DESIGN_SIZE):
+    """Scale and offset that fit the square design box into a box, centred."""
+    scale = min(box_width, box_height) / design_size
+    return scale, (box_width - design_size * scale) / 2, (box_height - design_size * scale) / 2
+
+
+class ProceduralAnimation:
+    """A named animation whose frames come from draw(cr, progress)."""
+
+    def __init__(self, name, title, draw, frame_count=FRAME_COUNT):
+        self.name = name
+        self.title = title
+        self.draw = draw
+        self.frame_count = frame_count
+
+    def progress(self, index):
+        # Same spacing as the baked frames: the last frame is progress 1.0
+        return index / (self.frame_count - 1) if self.frame_count > 1 else 0.0
+
+    def draw_frame(self, cr, index, box_width, box_height):
+        """Draws frame index scaled to fill the box (vectors, so no resampling)."""
+        scale, x, y = frame_transform(box_width, box_height)
+        cr.save()
+        cr.translate(x, y)
+        cr.scale(scale, scale)
+        self.draw(cr, self.progress(index))
+        cr.restore()
+
+    def frames(self):
+        return [ProceduralFrame(self, index) for index in range(self.frame_count)]
+
+    def render(self, index, size=DESIGN_SIZE):
+        """Frame index on a new size x size ARGB32 surface, e.g. to bake PNGs."""
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, size, size)
+        cr = cairo.Context(surface)
+        self.draw_frame(cr, index, size, size)
+        surface.flush()
+        return surface
+
+
+class ProceduralFrame:
+    """One frame of a ProceduralAnimation, in a sprite frame list."""
+
+    __slots__ = ("animation", "index")
+
+    def __init__(self, animation, index):
+        self.animation = animation
+        self.index = index
+
+    def get_width(self):
+        return DESIGN_SIZE
+
+    def get_height(self):
+        return DESIGN_SIZE
+
+    def get_byte_length(self):
+        return 0   # Nothing decoded is held
+
+    def draw(self, cr, box_width, box_height):
+        self.animation.draw_frame(cr, self.index, box_width, box_height)
+
+
+PROCEDURAL_ANIMATIONS = OrderedDict()
+
+
+def register_animation(name, title, draw, frame_count=FRAME_COUNT):
+    """Adds a procedural animation; name is what preferred_animation stores."""
+    animation = ProceduralAnimation(name, title, draw, frame_count)
+    PROCEDURAL_ANIMATIONS[name] = animation
+    return animation
+
+
+def get_animation(name):
+    return PROCEDURAL_ANIMATIONS.get(name)
+
+
+register_animation("drawn_puppy", "Puppy (Drawn)", draw_puppy)
+register_animation("drawn_bouncing_balls", "Bouncing Balls (Drawn)", draw_bouncing_ball)
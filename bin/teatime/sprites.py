@@ -0,0 +1,386 @@
+"""Sprite frames for the Session Complete overlay.
+
+AnimationCache holds decoded frames per animation within a byte budget, so
+switching animations does not keep every set alive and the app can drop
+them all once the overlay is gone.
+
+Scaling a GdkPixbuf and converting it to a Cairo source on every redraw
+repeats the same work for every frame at every tick. SpriteSurfaceCache does
+it once per (animation, frame, target size) and keeps the premultiplied
+cairo.ImageSurface, so drawing a frame is one set_source_surface and one
+paint. DrawStats records how long those draws take.
+
+Frames that come from a mapped atlas (see atlas.py) are already premultiplied
+ARGB32 and are used in place when they need no scaling.
+
+AnimationStream plays an animated GIF at the delays stored in the file,
+decoding frames on demand into a small ring buffer instead of all up front.
+"""
+
+from collections import OrderedDict, deque
+from pathlib import Path
+
+import gi
+gi.require_version("Gdk", "3.0")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Gdk, GdkPixbuf, GLib
+
+try:
+    import cairo
+except ImportError:  # pycairo is only needed for drawing, not for importing
+    cairo = None
+
+from .atlas import AtlasFrame, find_atlas, source_signature, write_atlas, ATLAS_CACHE_DIR, ATLAS_SUFFIX
+from .procedural import ProceduralFrame
+
+
+DEFAULT_CACHE_BUDGET_MB = 64
+STREAM_RING_SIZE = 4          # Decoded frames an AnimationStream keeps ahead of playback
+STREAM_MIN_DELAY = 0.02       # Browsers and gdk-pixbuf treat shorter GIF delays as 20 ms
+
+
+def frame_bytes(frame):
+    """Approximate memory held by a decoded frame (pixbuf or surface)."""
+    try:
+        if hasattr(frame, "get_byte_length"):
+            return int(frame.get_byte_length())
+        return int(frame.get_stride()) * int(frame.get_height())
+    except Exception:
+        return 0
+
+
+class AnimationCache:
+    """
+    Decoded frame lists keyed by animation name, least recently used first.
+
+    Inserting a set evicts older sets until the total fits budget_bytes. The
+    newest set is always kept, even if it alone is over budget, so the
+    overlay can still play it.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_CACHE_BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()   # name -> (frames, bytes)
+        self.bytes_used = 0
+
+    def get(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        self._entries.move_to_end(name)
+        return entry[0]
+
+    def put(self, name, frames):
+        self.release(name)
+        size = sum(frame_bytes(frame) for frame in frames)
+        self._entries[name] = (frames, size)
+        self.bytes_used += size
+        while self.bytes_used > self.budget_bytes and len(self._entries) > 1:
+            evicted, (_frames, evicted_size) = self._entries.popitem(last=False)
+            self.bytes_used -= evicted_size
+            print(f"Animation cache: evicted {evicted} ({evicted_size // 1024} KiB)")
+        return frames
+
+    def release(self, name=None):
+        """Drops one animation's frames, or all of them."""
+        if name is None:
+            self._entries.clear()
+            self.bytes_used = 0
+            return
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self.bytes_used -= entry[1]
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def fit_size(width, height, box_width, box_height):
+    """
+    Size and offset that fit width x height into a box, centred and keeping
+    the aspect ratio. Frames are never upscaled. Returns (w, h, x, y).
+    """
+    if width <= 0 or height <= 0:
+        return 0, 0, 0, 0
+    scale = min(box_width / width, box_height / height, 1.0)
+    scaled_width = max(1, int(width * scale))
+    scaled_height = max(1, int(height * scale))
+    return (
+        scaled_width,
+        scaled_height,
+        (box_width - scaled_width) // 2,
+        (box_height - scaled_height) // 2,
+    )
+
+
+class SpriteSurfaceCache:
+    """Scaled, premultiplied frame surfaces keyed by (animation, frame, size)."""
+
+    def __init__(self):
+        self._surfaces = {}
+        self._size = None   # Target size the cached surfaces were made for
+        self.conversions = 0
+
+    def get(self, animation, index, pixbuf, box_width, box_height):
+        """Returns (surface, x, y) for drawing a frame centred in a box, or None."""
+        if cairo is None or pixbuf is None:
+            return None
+        width, height, x, y = fit_size(pixbuf.get_width(), pixbuf.get_height(), box_width, box_height)
+        if width == 0:
+            return None
+        if self._size != (box_width, box_height):
+            # Resized: surfaces for the old size will not be drawn again
+            self._surfaces.clear()
+            self._size = (box_width, box_height)
+        key = (animation, index, width, height)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._convert(pixbuf, width, height)
+            self._surfaces[key] = surface
+        return surface, x, y
+
+    def prerender(self, animation, frames, box_width, box_height, cancel=None):
+        """
+        Converts a whole animation for a box size without touching the cache,
+        so it can run on a worker thread. Hand the result to store().
+        """
+        rendered = []
+        if cairo is None:
+            return rendered
+        for index, pixbuf in enumerate(frames):
+            if cancel is not None and cancel.is_set():
+                return []
+            if isinstance(pixbuf, (AnimationStream, ProceduralFrame)):
+                continue   # Rendered frame by frame as it plays
+            width, height, _x, _y = fit_size(pixbuf.get_width(), pixbuf.get_height(), box_width, box_height)
+            if width:
+                rendered.append(((animation, index, width, height), self._convert(pixbuf, width, height)))
+        return rendered
+
+    def store(self, rendered, box_width, box_height):
+        """Adds surfaces made by prerender() for the given box size."""
+        if self._size != (box_width, box_height):
+            self._surfaces.clear()
+            self._size = (box_width, box_height)
+        self._surfaces.update(rendered)
+
+    def render(self, pixbuf, box_width, box_height):
+        """Like get(), without caching; for streamed frames that are drawn once."""
+        if cairo is None or pixbuf is None:
+            return None
+        width, height, x, y = fit_size(pixbuf.get_width(), pixbuf.get_height(), box_width, box_height)
+        if width == 0:
+            return None
+        return self._convert(pixbuf, width, height), x, y
+
+    def clear(self):
+        self._surfaces.clear()
+        self._size = None
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def _convert(self, pixbuf, width, height):
+        if isinstance(pixbuf, AtlasFrame):
+            return self._convert_atlas_frame(pixbuf, width, height)
+        if (width, height) != (pixbuf.get_width(), pixbuf.get_height()):
+            pixbuf = pixbuf.scale_simple(width, height, GdkPixbuf.InterpType.BILINEAR)
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        cr = cairo.Context(surface)
+        Gdk.cairo_set_source_pixbuf(cr, pixbuf, 0, 0)
+        cr.paint()
+        surface.flush()
+        self.conversions += 1
+        return surface
+
+    def _convert_atlas_frame(self, frame, width, height):
+        source = frame.surface()
+        if (width, height) == (frame.width, frame.height):
+            return source   # Drawn straight from the mapped pages
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        cr = cairo.Context(surface)
+        cr.scale(width / frame.width, height / frame.height)
+        cr.set_source_surface(source, 0, 0)
+        cr.get_source().set_filter(cairo.FILTER_BILINEAR)
+        cr.paint()
+        surface.flush()
+        self.conversions += 1
+        return surface
+
+
+class AnimationStream:
+    """
+    Plays a GdkPixbuf.PixbufAnimation (animated GIF, or any format whose
+    loader supports animation) at its own frame delays.
+
+    Frames are decoded with a PixbufAnimationIter stepped along a virtual
+    clock, copied (the iterator reuses its pixbuf) and queued in a ring of at
+    most ring_size frames, so memory stays bounded however long the
+    animation is. advance(elapsed) moves playback on and decodes what it
+    needs; the ring can be filled ahead on a worker with fill().
+    """
+
+    def __init__(self, animation, ring_size=STREAM_RING_SIZE):
+        self.animation = animation
+        self.ring_size = ring_size
+        self.decoded = 0
+        self.restart()
+
+    def restart(self):
+        """Back to the first frame (the ring is only refilled when needed)."""
+        self._time_ms = 0
+        self._iter = self.animation.get_iter(self._timeval(0))
+        self._ring = deque()
+        self._finished = False
+        self.frame, self.delay = self._decode()
+        self._shown_for = 0.0
+        self.position = 0     # Frames played since the start
+        self.rendered = None  # Owner's rendering of the current frame
+
+    def fill(self):
+        """Decodes frames ahead until the ring is full or the animation ends."""
+        while len(self._ring) < self.ring_size and not self._finished:
+            frame, delay = self._step()
+            if frame is None:
+                break
+            self._ring.append((frame, delay))
+
+    def advance(self, elapsed):
+        """Moves playback on by elapsed seconds; True if the frame changed."""
+        if self.delay is None:
+            return False    # A still image, or the last frame of a finite loop
+        self._shown_for += elapsed
+        changed = False
+        while self.delay is not None and self._shown_for >= self.delay:
+            if not self._ring:
+                self.fill()
+                if not self._ring:
+                    self.delay = None
+                    break
+            self._shown_for -= self.delay
+            self.frame, self.delay = self._ring.popleft()
+            self.position += 1
+            changed = True
+        if changed:
+            self.rendered = None
+        return changed
+
+    def get_width(self):
+        return self.animation.get_width()
+
+    def get_height(self):
+        return self.animation.get_height()
+
+    def get_byte_length(self):
+        """Memory for a full ring plus the frame on screen."""
+        return (self.ring_size + 1) * frame_bytes(self.frame) if self.frame is not None else 0
+
+    def __len__(self):
+        return len(self._ring)
+
+    def _step(self):
+        if self._finished:
+            return None, None
+        delay_ms = self._iter.get_delay_time()
+        self._time_ms += max(delay_ms, int(STREAM_MIN_DELAY * 1000))
+        self._iter.advance(self._timeval(self._time_ms))
+        return self._decode()
+
+    def _decode(self):
+        pixbuf = self._iter.get_pixbuf()
+        frame = pixbuf.copy() if pixbuf is not None else None
+        self.decoded += 1
+        delay_ms = self._iter.get_delay_time()
+        if delay_ms < 0:
+            self._finished = True   # Shown forever: a still image or the end of the loops
+            return frame, None
+        return frame, max(delay_ms / 1000, STREAM_MIN_DELAY)
+
+    @staticmethod
+    def _timeval(milliseconds):
+        timeval = GLib.TimeVal()
+        timeval.tv_sec, microseconds = divmod(milliseconds * 1000, 1_000_000)
+        timeval.tv_usec = microseconds
+        return timeval
+
+
+def open_animation(path, ring_size=STREAM_RING_SIZE):
+    """
+    A list of frames for an animation file: one pixbuf for a still image, or
+    one AnimationStream with its ring filled for an animated one.
+    """
+    animation = GdkPixbuf.PixbufAnimation.new_from_file(str(path))
+    if animation.is_static_image():
+        return [animation.get_static_image()]
+    stream = AnimationStream(animation, ring_size)
+    stream.fill()
+    return [stream]
+
+
+def pixbuf_argb32(pixbuf):
+    """A pixbuf as (width, height, stride, premultiplied ARGB32 bytes) for an atlas."""
+    width, height = pixbuf.get_width(), pixbuf.get_height()
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    cr = cairo.Context(surface)
+    Gdk.cairo_set_source_pixbuf(cr, pixbuf, 0, 0)
+    cr.paint()
+    surface.flush()
+    return width, height, surface.get_stride(), bytes(surface.get_data())
+
+
+def load_atlas_frames(name, sprites_dir, frame_files=None, cache_dir=None):
+    """Frames of an up-to-date atlas for these frame files (see find_atlas), or None."""
+    if cairo is None:
+        return None
+    atlas = find_atlas(name, sprites_dir, frame_files, cache_dir)
+    return atlas.frames if atlas is not None else None
+
+
+def cache_atlas(name, frame_files, pixbufs, cache_dir=None):
+    """
+    Packs freshly decoded frames into an atlas in the cache directory, so the
+    next load (from this or another process) maps it instead of decoding.
+    """
+    if cairo is None or not pixbufs or len(pixbufs) != len(frame_files):
+        return None
+    cache_dir = ATLAS_CACHE_DIR if cache_dir is None else Path(cache_dir)
+    try:
+        return write_atlas(
+            cache_dir / f"{name}{ATLAS_SUFFIX}",
+            [pixbuf_argb32(pixbuf) for pixbuf in pixbufs],
+            source_signature(frame_files),
+        )
+    except Exception as e:
+        print(f"Could not write sprite atlas for {name}: {e}")
+        return None
+
+
+class DrawStats:
+    """Per-frame draw times in milliseconds."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    @property
+    def average_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def summary(self):
+        return {
+            "sprite_frames_drawn": self.count,
+            "sprite_draw_avg_ms": round(self.average_ms, 3),
+            "sprite_draw_max_ms": round(self.max_ms, 3),
+        }
@@ -0,0 +1,102 @@
+"""Observable timer state shared by every view.
+
+The timer engine only writes to a TimerStateBus. Views (the main window,
+nano mode, the control socket, ...) subscribe to the fields they render.
+Updates made during one main-loop iteration are coalesced into a single
+dispatch, and each subscriber is only called when a field it watches
+differs from the value it last rendered.
+"""
+
+from gi.repository import GLib
+
+# Timer phases
+IDLE = "idle"
+RUNNING = "running"
+STOPPED = "stopped"     # Idle after the user stopped a running timer
+COMPLETE = "complete"
+
+
+def _idle_scheduler(callback):
+    # Run ahead of GTK's redraw (PRIORITY_HIGH_IDLE + 20) so views update in the same frame
+    return GLib.idle_add(callback, priority=GLib.PRIORITY_HIGH_IDLE)
+
+
+class _Subscription:
+    def __init__(self, callback, fields):
+        self.callback = callback
+        self.fields = frozenset(fields) if fields else None
+        self.seen = {}
+
+
+class TimerStateBus:
+    """Holds the timer state and notifies subscribers of coalesced changes."""
+
+    def __init__(self, scheduler=None, **initial):
+        self._state = {
+            "phase": IDLE,
+            "session": 0,       # Incremented on every start, so restarts are visible
+            "duration": 0,
+            "time_left": 0,
+            "display": "00:00",
+        }
+        self._state.update(initial)
+        self._scheduler = scheduler or _idle_scheduler
+        self._subscriptions = []
+        self._dispatch_pending = False
+
+    @property
+    def state(self):
+        """A copy of the current state."""
+        return dict(self._state)
+
+    def get(self, field, default=None):
+        return self._state.get(field, default)
+
+    def subscribe(self, callback, fields=None):
+        """
+        Registers callback(state, changed_fields). With fields given, the
+        callback only runs when one of them changes. Returns an unsubscribe
+        function. The new subscriber receives the current state on the next
+        dispatch.
+        """
+        subscription = _Subscription(callback, fields)
+        self._subscriptions.append(subscription)
+        self._schedule()
+
+        def unsubscribe():
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+        return unsubscribe
+
+    def update(self, **changes):
+        """Merges changes into the state and schedules a dispatch."""
+        self._state.update(changes)
+        self._schedule()
+
+    def flush(self):
+        """Dispatches pending changes immediately."""
+        self._dispatch()
+
+    def _schedule(self):
+        if not self._dispatch_pending:
+            self._dispatch_pending = True
+            self._scheduler(self._dispatch)
+
+    def _dispatch(self):
+        self._dispatch_pending = False
+        state = dict(self._state)
+        for subscription in list(self._subscriptions):
+            watched = subscription.fields if subscription.fields is not None else state.keys()
+            changed = {
+                field for field in watched
+                if field not in subscription.seen or subscription.seen[field] != state.get(field)
+            }
+            if not changed:
+                continue
+            for field in changed:
+                subscription.seen[field] = state.get(field)
+            try:
+                subscription.callback(state, changed)
+            except Exception as e:
+                print(f"Error in timer state subscriber {subscription.callback}: {e}")
+        return GLib.SOURCE_REMOVE
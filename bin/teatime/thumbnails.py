@@ -0,0 +1,212 @@
+"""Animated thumbnails for the Settings dialog's animation picker.
+
+A thumbnail is a filmstrip: a few frames sampled evenly from an animation,
+scaled to THUMBNAIL_SIZE and laid side by side in one image. ThumbnailPreview
+plays it by drawing one cell at a time.
+
+Strips are made on a worker thread by ThumbnailGenerator and saved as PNGs
+under the user cache directory. The file name includes a hash of the source
+files' contents (and of the strip settings), so a cached strip is reused
+until its animation changes, and opening the dialog only decodes one small
+PNG per animation. Drawn animations are rendered straight into their strip.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import gi
+gi.require_version("Gtk", "3.0")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Gtk, Gdk, GdkPixbuf, GLib
+
+try:
+    import cairo
+except ImportError:  # pycairo is only needed for drawing, not for importing
+    cairo = None
+
+from .atlas import source_signature
+from .core import CACHE_DIR
+from .sprites import AnimationStream, open_animation
+
+THUMBNAIL_SIZE = 64       # Edge of one cell, in pixels
+THUMBNAIL_FRAMES = 6      # Frames sampled into each strip
+PREVIEW_INTERVAL = 0.2    # Seconds per preview frame
+THUMBNAIL_DIR = CACHE_DIR / "thumbnails"
+THUMBNAIL_VERSION = 1
+KEY_LENGTH = 16           # Hex digits of the key kept in file names
+
+
+def sample_indices(count, wanted=THUMBNAIL_FRAMES):
+    """Up to wanted frame indices spread evenly over count frames, first frame first."""
+    if count <= wanted:
+        return list(range(count))
+    return [round(i * count / wanted) for i in range(wanted)]
+
+
+def thumbnail_key(sources, size=THUMBNAIL_SIZE, frames=THUMBNAIL_FRAMES):
+    """Cache key for a strip made from files with this source_signature()."""
+    settings = {"version": THUMBNAIL_VERSION, "size": size, "frames": frames, "sources": sources}
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+
+def thumbnail_path(name, key, cache_dir=THUMBNAIL_DIR):
+    return cache_dir / f"{name}-{key[:KEY_LENGTH]}.png"
+
+
+def is_thumbnail_of(name, path):
+    """True for name's own strips; not for another animation called e.g. name-walk."""
+    return re.fullmatch(rf"{re.escape(name)}-[0-9a-f]{{{KEY_LENGTH}}}\.png", path.name) is not None
+
+
+def strip_from_pixbufs(pixbufs, size=THUMBNAIL_SIZE):
+    """Lays pixbufs out as fitted, centred cells of one transparent strip."""
+    strip = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, True, 8, size * len(pixbufs), size)
+    strip.fill(0)
+    for cell, pixbuf in enumerate(pixbufs):
+        width, height = pixbuf.get_width(), pixbuf.get_height()
+        scale = min(size / width, size / height)
+        scaled_width, scaled_height = max(1, int(width * scale)), max(1, int(height * scale))
+        scaled = pixbuf.scale_simple(scaled_width, scaled_height, GdkPixbuf.InterpType.BILINEAR)
+        scaled.copy_area(0, 0, scaled_width, scaled_height, strip,
+                         cell * size + (size - scaled_width) // 2, (size - scaled_height) // 2)
+    return strip
+
+
+def strip_from_procedural(animation, size=THUMBNAIL_SIZE):
+    """Draws sampled frames of a procedural animation straight into a strip."""
+    indices = sample_indices(animation.frame_count)
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, size * len(indices), size)
+    cr = cairo.Context(surface)
+    for cell, index in enumerate(indices):
+        cr.save()
+        cr.translate(cell * size, 0)
+        animation.draw_frame(cr, index, size, size)
+        cr.restore()
+    surface.flush()
+    return Gdk.pixbuf_get_from_surface(surface, 0, 0, surface.get_width(), size)
+
+
+def stream_pixbufs(path, wanted=THUMBNAIL_FRAMES):
+    """The first frames of an animated file, one per frame delay."""
+    frames = open_animation(path)
+    if not frames or not isinstance(frames[0], AnimationStream):
+        return frames
+    stream = frames[0]
+    pixbufs = [stream.frame]
+    while len(pixbufs) < wanted and stream.delay is not None and stream.advance(stream.delay):
+        pixbufs.append(stream.frame)
+    return pixbufs
+
+
+class ThumbnailGenerator:
+    """Makes, or loads from the disk cache, one strip per animation on a worker thread."""
+
+    def __init__(self, asset_index, procedural_animations, cache_dir=THUMBNAIL_DIR):
+        self.assets = asset_index
+        self.procedural = procedural_animations
+        self.cache_dir = cache_dir
+        self.generated = 0   # Strips made rather than read from the cache
+
+    def strip(self, name):
+        """The strip for an animation as (pixbuf, cell count), or None."""
+        procedural = self.procedural.get(name)
+        if procedural is not None:
+            if cairo is None:
+                return None
+            strip = strip_from_procedural(procedural)
+            return strip, len(sample_indices(procedural.frame_count))
+
+        frame_files = self.assets.frames(name)
+        files = [frame_files[i] for i in sample_indices(len(frame_files))] \
+            or self.assets.animated_files(name)[:1]
+        sources = source_signature(files)
+        if not sources:
+            return None
+        path = thumbnail_path(name, thumbnail_key(sources), self.cache_dir)
+        if path.exists():
+            strip = GdkPixbuf.Pixbuf.new_from_file(str(path))
+            return strip, strip.get_width() // THUMBNAIL_SIZE
+
+        if frame_files:
+            # Decoded straight at about the cell size; no full-size frames are made
+            pixbufs = [GdkPixbuf.Pixbuf.new_from_file_at_scale(str(f), THUMBNAIL_SIZE, THUMBNAIL_SIZE, True)
+                       for f in files]
+        else:
+            pixbufs = stream_pixbufs(files[0])
+        if not pixbufs:
+            return None
+        strip = strip_from_pixbufs(pixbufs)
+        self._save(strip, path, name)
+        self.generated += 1
+        return strip, len(pixbufs)
+
+    def generate(self, names, on_ready, cancel=None):
+        """
+        Worker thread: calls on_ready(name, strip, cells) on the main loop for
+        each animation as its strip becomes available. Stops once cancel is set.
+        """
+        for name in names:
+            if cancel is not None and cancel.is_set():
+                return
+            try:
+                result = self.strip(name)
+            except Exception as e:
+                print(f"Could not make a thumbnail for {name}: {e}")
+                continue
+            if result is not None:
+                GLib.idle_add(self._deliver, on_ready, name, result, cancel)
+
+    def _deliver(self, on_ready, name, result, cancel):
+        if cancel is None or not cancel.is_set():
+            on_ready(name, *result)
+        return GLib.SOURCE_REMOVE
+
+    def _save(self, strip, path, name):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Older strips of the same animation will not be used again
+            for stale in self.cache_dir.glob(f"{name}-*.png"):
+                if is_thumbnail_of(name, stale):
+                    stale.unlink()
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            strip.savev(str(tmp), "png", [], [])
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"Could not cache the thumbnail for {name}: {e}")
+
+
+class ThumbnailPreview(Gtk.DrawingArea):
+    """Plays a thumbnail strip one cell at a time."""
+
+    def __init__(self, size=THUMBNAIL_SIZE):
+        super().__init__()
+        self.size = size
+        self.strip = None
+        self.cells = 0
+        self.cell = 0
+        self.set_size_request(size, size)
+        self.connect("draw", self._on_draw)
+
+    def set_strip(self, strip, cells):
+        self.strip = strip
+        self.cells = cells
+        self.cell = 0
+        self.queue_draw()
+
+    def advance(self):
+        if self.cells > 1:
+            self.cell = (self.cell + 1) % self.cells
+            self.queue_draw()
+
+    def _on_draw(self, widget, cr):
+        if self.strip is None:
+            return False
+        x = (self.get_allocated_width() - self.size) / 2
+        y = (self.get_allocated_height() - self.size) / 2
+        cr.rectangle(x, y, self.size, self.size)
+        cr.clip()
+        Gdk.cairo_set_source_pixbuf(cr, self.strip, x - self.cell * self.size, y)
+        cr.paint()
+        return False
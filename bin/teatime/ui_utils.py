@@ -1,3 +1,382 @@
+"""UI helper utilities shared by the application windows."""
 
-"""UI helper utilities (placeholder for future extraction)."""
+import colorsys
+import math
+from collections import OrderedDict
+from functools import lru_cache
 
+from gi.repository import Gtk, Gdk
+
+try:
+    import cairo
+except ImportError:  # pycairo is only needed for drawing, not for importing
+    cairo = None
+
+from .core import FONT_SCALE_INCREMENT
+
+# Hues are rounded to this many degrees before rendering, so a full rainbow
+# cycle maps onto a small, fully cacheable set of stylesheets.
+HUE_STEP = 3
+
+# Parameter-free rules for the main window; loaded once into the "base" layer
+BASE_CSS = b"""
+/* Target the main timer display to make it large and scalable */
+.time-display {
+    font-weight: bold;
+}
+
+/* Remove the default dotted outline; the focus layer draws a glow instead */
+button:focus,
+checkbutton:focus,
+spinbutton:focus {
+    outline: none;
+}
+"""
+
+# Smooth transition for the focus glow; left out by the minimal performance profile
+FOCUS_TRANSITION_CSS = b"""
+button,
+checkbutton,
+spinbutton {
+    transition: box-shadow 0.2s ease-in-out, border-color 0.2s ease-in-out;
+}
+"""
+
+
+def quantize_hue(hue):
+    return int(round(hue / HUE_STEP) * HUE_STEP) % 360
+
+
+def font_scale_step(scale):
+    """Maps a font scale factor onto its integer A+/A- step."""
+    return int(round(scale / FONT_SCALE_INCREMENT))
+
+
+def _rgb(hue, saturation, value):
+    r, g, b = colorsys.hsv_to_rgb(hue / 360.0, saturation, value)
+    return int(r * 255), int(g * 255), int(b * 255)
+
+
+@lru_cache(maxsize=64)
+def font_scale_css(step):
+    """Font sizes for one A+/A- step."""
+    scale = step * FONT_SCALE_INCREMENT
+    # Define multipliers for a clear visual hierarchy
+    timer_font_percentage = round(scale * 2.5 * 100, 1)    # 250% of the base scale
+    control_font_percentage = round(scale * 1.2 * 100, 1)  # 120% for labels and buttons
+    return f"""
+.time-display {{
+    font-size: {timer_font_percentage}%;
+}}
+
+/* Apply a larger font to general controls for better readability */
+.input-label, button label, checkbutton label {{
+    font-size: {control_font_percentage}%;
+}}
+""".encode()
+
+
+@lru_cache(maxsize=128)
+def focus_glow_css(hue):
+    """Glow for focused widgets, for better keyboard navigation visibility."""
+    r, g, b = _rgb(hue, 0.9, 1.0)
+    return f"""
+button:focus,
+checkbutton:focus,
+spinbutton:focus {{
+    box-shadow: 0 0 8px 3px rgba({r}, {g}, {b}, 0.8);
+    border-color: rgb({r}, {g}, {b});
+}}
+""".encode()
+
+
+@lru_cache(maxsize=128)
+def rainbow_css(hue):
+    """Celebration colour; only applies while the label has .rainbow-text."""
+    r, g, b = _rgb(hue, 1.0, 1.0)
+    return f".rainbow-text {{ color: rgb({r}, {g}, {b}); }}".encode()
+
+
+def lava_colors(hue):
+    """The lava skin's three gradient stops for a hue, as RGB tuples."""
+    return [_rgb((hue + offset) % 360, 0.8, 0.7) for offset in (0, 120, 240)]
+
+
+@lru_cache(maxsize=16)
+def skin_css(skin):
+    """Window background for a skin."""
+    if skin == 'lava':
+        # The gradient itself is painted with Cairo (see LavaBackground); the
+        # window's CSS background must stay out of its way
+        return b"""
+window {
+    background-color: transparent;
+    background-image: none;
+}
+"""
+    # Default, and fallback for unknown skins: no custom background styling
+    return b"""
+window {
+    background-color: #f0f0f0;
+    background-image: none;
+}
+"""
+
+
+class StyleManager:
+    """
+    Owns one screen-wide CSS provider per named layer.
+
+    Providers are created once, updated in place with load_from_data and
+    removed from the screen while their layer is inactive, so repeated skin,
+    mode and rainbow updates never stack new providers on the screen. CSS
+    identical to what a layer already holds is not parsed again.
+    """
+
+    # Later layers override earlier ones
+    LAYER_PRIORITIES = {
+        "base": Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
+        "font": Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
+        "focus": Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
+        "rainbow": Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
+        "skin": Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 1,
+        "mini": Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 2,
+        "nano": Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 3,
+        "overlay": Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 4,
+    }
+
+    def __init__(self, screen=None):
+        self._screen = screen
+        self._providers = {}
+        self._attached = set()
+        self._loaded = {}
+        self.parse_count = 0
+
+    def _get_screen(self):
+        if self._screen is None:
+            self._screen = Gdk.Screen.get_default()
+        return self._screen
+
+    def set_css(self, layer, css):
+        """Loads css into the layer's provider and makes sure it is on the screen."""
+        if layer not in self.LAYER_PRIORITIES:
+            raise ValueError(f"Unknown style layer: {layer}")
+        data = css.encode() if isinstance(css, str) else css
+        provider = self._providers.get(layer)
+        if provider is None:
+            provider = Gtk.CssProvider()
+            self._providers[layer] = provider
+        loaded = self._loaded.get(layer)
+        if loaded is not data and loaded != data:
+            try:
+                provider.load_from_data(data)
+            except Exception as e:
+                print(f"Error loading CSS for the {layer} layer: {e}")
+                self._loaded.pop(layer, None)
+                return False
+            self._loaded[layer] = data
+            self.parse_count += 1
+        self._attach(layer)
+        return True
+
+    def clear(self, layer):
+        """Removes the layer's provider from the screen (it is kept for reuse)."""
+        if layer in self._attached:
+            screen = self._get_screen()
+            if screen:
+                Gtk.StyleContext.remove_provider_for_screen(screen, self._providers[layer])
+            self._attached.discard(layer)
+
+    def is_active(self, layer):
+        return layer in self._attached
+
+    def live_count(self):
+        """Number of providers currently attached to the screen."""
+        return len(self._attached)
+
+    def _attach(self, layer):
+        if layer in self._attached:
+            return
+        screen = self._get_screen()
+        if not screen:
+            print("Warning: No default screen found to apply CSS.")
+            return
+        Gtk.StyleContext.add_provider_for_screen(
+            screen, self._providers[layer], self.LAYER_PRIORITIES[layer]
+        )
+        self._attached.add(layer)
+
+
+class FrameAnimation:
+    """
+    Drives step(elapsed_seconds) from a widget's GDK frame clock.
+
+    Tick callbacks only run while the widget is mapped and its toplevel is
+    being drawn, so the animation stops by itself when the window is hidden
+    or iconified, and costs no timer wakeups meanwhile. step() is called at
+    most once per interval with the time that actually elapsed; a long gap
+    (a pause) is not replayed, so the animation resumes without a jump.
+    Returning False from step() stops the animation.
+    """
+
+    # Frame-time gaps longer than this are treated as a pause
+    MAX_CATCH_UP = 1.0
+
+    def __init__(self, widget, step, interval):
+        self.widget = widget
+        self.step = step
+        self.interval = interval
+        self._tick_id = None
+        self._last_frame_time = None
+        self._pending = 0.0
+        self._paused = False
+        self._wanted = False
+
+    @property
+    def running(self):
+        return self._wanted
+
+    def start(self):
+        self._wanted = True
+        if not self._paused:
+            self._add_tick()
+
+    def stop(self):
+        self._wanted = False
+        self._remove_tick()
+
+    def set_paused(self, paused):
+        """Pauses explicitly, e.g. while the toplevel is iconified."""
+        self._paused = paused
+        if paused:
+            self._remove_tick()
+        elif self._wanted:
+            self._add_tick()
+
+    def _add_tick(self):
+        if self._tick_id is None:
+            self._last_frame_time = None
+            self._pending = 0.0
+            self._tick_id = self.widget.add_tick_callback(self._on_tick)
+
+    def _remove_tick(self):
+        if self._tick_id is not None:
+            self.widget.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+
+    def _on_tick(self, widget, frame_clock):
+        now = frame_clock.get_frame_time()   # microseconds
+        if self._last_frame_time is None:
+            self._last_frame_time = now
+            return True
+        delta = (now - self._last_frame_time) / 1_000_000
+        self._last_frame_time = now
+        if delta > self.MAX_CATCH_UP:
+            # The clock was frozen (unmapped or iconified); continue from here
+            delta = self.interval
+        self._pending += delta
+        if self._pending < self.interval:
+            return True
+        elapsed, self._pending = self._pending, 0.0
+        if self.step(elapsed) is False:
+            self._tick_id = None
+            self._wanted = False
+            return False
+        return True
+
+
+class LavaBackground:
+    """
+    Paints the lava skin from pre-rendered Cairo gradient strips.
+
+    The 45deg gradient only changes along one diagonal, so each hue bucket
+    is rendered once into a STRIP_LENGTH x 1 surface and stretched over the
+    area with a pattern matrix. Strips do not depend on the window size: a
+    full hue cycle is 120 strips of 1 KiB each. Animating the skin is then a
+    cache lookup and a stretched paint: no CSS is parsed and no widget
+    styles are invalidated. Like the old CSS version the gradient covers
+    three times the area and slowly flows sideways.
+    """
+
+    STRIP_LENGTH = 256   # Pixels along the gradient; 4 bytes each
+    FLOW_PERIOD = 60.0   # Seconds for one flow back and forth
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.renders = 0
+
+    def surface(self, hue):
+        """Returns the cached strip for a hue, rendering it if needed."""
+        if cairo is None:
+            return None
+        key = quantize_hue(hue)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        surface = self._render(key)
+        self.renders += 1
+        self._surfaces[key] = surface
+        while len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def cache_bytes(self):
+        return len(self._surfaces) * self.STRIP_LENGTH * 4
+
+    def clear(self):
+        self._surfaces.clear()
+
+    @classmethod
+    def strip_matrix(cls, width, height, flow=0.0):
+        """
+        Maps area coordinates to strip pixels. The CSS gradient spans a 3w x 3h
+        box shifted by (2 * flow * w, h); along its diagonal that puts a point
+        (x, y) at t = (x - y + 2 * flow * w + 2 * h) / (3 * (w + h)). The strip
+        row is x + y, which EXTEND_PAD clamps to the one row there is.
+        """
+        scale = cls.STRIP_LENGTH / (3 * (width + height))
+        return (scale, 1.0, -scale, 1.0, scale * (2 * flow * width + 2 * height), 0.0)
+
+    def paint(self, cr, hue, x, y, width, height, flow=0.0, alpha=1.0):
+        """
+        Paints the gradient into the rectangle. flow runs from 0 to 1 and
+        back, like the CSS background-position animation did (0% to 100%).
+        """
+        if width <= 0 or height <= 0:
+            return False
+        surface = self.surface(hue)
+        if surface is None:
+            return False
+        pattern = cairo.SurfacePattern(surface)
+        pattern.set_extend(cairo.EXTEND_PAD)
+        pattern.set_filter(cairo.FILTER_BILINEAR)
+        pattern.set_matrix(cairo.Matrix(*self.strip_matrix(width, height, flow)))
+        cr.save()
+        cr.rectangle(x, y, width, height)
+        cr.clip()
+        cr.translate(x, y)
+        cr.set_source(pattern)
+        if alpha < 1.0:
+            cr.paint_with_alpha(alpha)
+        else:
+            cr.paint()
+        cr.restore()
+        return True
+
+    @classmethod
+    def flow_at(cls, seconds):
+        """Flow position at a point in time; eases in and out like the CSS animation."""
+        return (1 - math.cos(2 * math.pi * seconds / cls.FLOW_PERIOD)) / 2
+
+    def _render(self, hue):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, self.STRIP_LENGTH, 1)
+        cr = cairo.Context(surface)
+        gradient = cairo.LinearGradient(0, 0, self.STRIP_LENGTH, 0)
+        for offset, (r, g, b) in zip((0.0, 0.5, 1.0), lava_colors(hue)):
+            gradient.add_color_stop_rgb(offset, r / 255, g / 255, b / 255)
+        cr.set_source(gradient)
+        cr.paint()
+        surface.flush()
+        return surface
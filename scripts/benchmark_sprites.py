@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Compare per-frame cost of the overlay's sprite sources.
+
+For each PNG animation and its drawn counterpart, measures what the overlay
+does: loading the frames (PNG decode, or nothing for drawn ones), then
+drawing every frame into a DrawingArea-sized surface, cold (first pass,
+including PNG scaling and conversion) and warm (later passes).
+
+    python3 scripts/benchmark_sprites.py --size 300 --passes 20
+
+Needs PyGObject (GdkPixbuf) and pycairo; no display is required.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "bin"))
+
+import cairo  # noqa: E402
+import gi  # noqa: E402
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf  # noqa: E402
+
+from teatime.procedural import get_animation  # noqa: E402
+from teatime.sprites import SpriteSurfaceCache  # noqa: E402
+
+PAIRS = (
+    ("puppy_animation", "drawn_puppy"),
+    ("test_animation", "drawn_bouncing_balls"),
+)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def _draw_passes(draw_frame, frame_count, size, passes):
+    """Per-frame draw times in ms for the first pass and for the passes after it."""
+    target = cairo.ImageSurface(cairo.FORMAT_ARGB32, size, size)
+    times = []
+    for _ in range(passes):
+        for index in range(frame_count):
+            cr = cairo.Context(target)
+            started = time.perf_counter()
+            draw_frame(cr, index)
+            target.flush()
+            times.append(time.perf_counter() - started)
+    cold, warm = times[:frame_count], times[frame_count:] or times
+    return {
+        "cold_frame_ms": _ms(statistics.mean(cold)),
+        "warm_frame_ms": _ms(statistics.median(warm)),
+        "warm_frame_max_ms": _ms(max(warm)),
+    }
+
+
+def bench_png(name, size, passes):
+    frame_files = sorted((ROOT / "assets" / "sprites" / name).glob("*sprite_frame_*.png"))
+    started = time.perf_counter()
+    frames = [GdkPixbuf.Pixbuf.new_from_file(str(f)) for f in frame_files]
+    load = time.perf_counter() - started
+    surfaces = SpriteSurfaceCache()
+
+    def draw_frame(cr, index):
+        surface, x, y = surfaces.get(name, index, frames[index], size, size)
+        cr.set_source_surface(surface, x, y)
+        cr.paint()
+
+    result = {"source": name, "frames": len(frames), "load_ms": _ms(load)}
+    result.update(_draw_passes(draw_frame, len(frames), size, passes))
+    return result
+
+
+def bench_drawn(name, size, passes):
+    animation = get_animation(name)
+    started = time.perf_counter()
+    frames = animation.frames()
+    load = time.perf_counter() - started
+
+    def draw_frame(cr, index):
+        frames[index].draw(cr, size, size)
+
+    result = {"source": name, "frames": len(frames), "load_ms": _ms(load)}
+    result.update(_draw_passes(draw_frame, len(frames), size, passes))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PNG against drawn sprite frames.")
+    parser.add_argument("--size", type=int, default=300, help="Drawing area edge in pixels")
+    parser.add_argument("--passes", type=int, default=20, help="Times each animation is played")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for png_name, drawn_name in PAIRS:
+        results.append(bench_png(png_name, args.size, args.passes))
+        results.append(bench_drawn(drawn_name, args.size, args.passes))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'source':<24}{'frames':>7}{'load ms':>10}{'cold ms':>10}{'warm ms':>10}{'max ms':>10}")
+    for r in results:
+        print(f"{r['source']:<24}{r['frames']:>7}{r['load_ms']:>10}{r['cold_frame_ms']:>10}"
+              f"{r['warm_frame_ms']:>10}{r['warm_frame_max_ms']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
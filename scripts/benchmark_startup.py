@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Measure startup, from exec to the window's first painted frame.
+
+Starts the app N times in fresh interpreters and splits each startup into
+phases:
+
+- import_ms: importing teatime.app, from `python -X importtime`
+- config_ms: TeaTimerApp._load_config
+- css_ms: loading CSS through StyleManager (font, skin, mode layers)
+- widgets_ms: do_activate without the CSS above (building and showing the window)
+- first_paint_ms: end of do_activate to the frame clock's first after-paint
+- total_ms: interpreter start to that first paint
+
+and prints the median of every phase as JSON. With a baseline, a phase whose
+median exceeds the baseline by more than --tolerance (relative) plus
+--slack-ms (absolute, to absorb noise in short phases) fails the run.
+
+    python3 scripts/benchmark_startup.py --runs 10
+    python3 scripts/benchmark_startup.py --runs 10 --save-baseline
+    python3 scripts/benchmark_startup.py --runs 10 --check     # exit 1 on regression
+
+Runs need a display: an existing one, Xvfb (xvfb-run) or GDK's Broadway
+backend (broadwayd), picked with --backend (default: the first available).
+Each run gets a private HOME and XDG directories, so the user's settings,
+caches and a running TeaTime are not involved.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_FILE = ROOT / "scripts" / "startup_baseline.json"
+PHASES = ("import_ms", "config_ms", "css_ms", "widgets_ms", "first_paint_ms", "total_ms")
+RESULT_PREFIX = "STARTUP "
+BROADWAY_DISPLAY = ":7"
+RUN_TIMEOUT = 60
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def parse_importtime(stderr, module="teatime.app"):
+    """Cumulative import time of module in ms, from `-X importtime` output."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return round(int(parts[1]) / 1000, 3)
+    return None
+
+
+def medians(runs):
+    """Median of every phase over the runs that recorded it."""
+    result = {}
+    for phase in PHASES:
+        values = [run[phase] for run in runs if run.get(phase) is not None]
+        if values:
+            result[phase] = round(statistics.median(values), 3)
+    return result
+
+
+def regressions(current, baseline, tolerance, slack_ms):
+    """(phase, current, allowed) for every phase slower than the baseline allows."""
+    failed = []
+    for phase, base in baseline.items():
+        value = current.get(phase)
+        if value is None:
+            continue
+        allowed = round(base * (1 + tolerance) + slack_ms, 3)
+        if value > allowed:
+            failed.append((phase, value, allowed))
+    return failed
+
+
+def child():
+    """One measured startup; prints the phases as a single JSON line."""
+    started = time.perf_counter()
+    sys.path.insert(0, str(ROOT / "bin"))
+    import teatime.app as app_module
+    from teatime.ui_utils import StyleManager
+    from gi.repository import Gdk, GLib
+    imported = time.perf_counter()
+
+    phases = {"import_wall_ms": _ms(imported - started), "config_ms": 0.0, "css_ms": 0.0}
+
+    def timed(cls, name, phase):
+        original = getattr(cls, name)
+
+        def wrapper(*args, **kwargs):
+            began = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                phases[phase] = phases[phase] + _ms(time.perf_counter() - began)
+        setattr(cls, name, wrapper)
+
+    timed(app_module.TeaTimerApp, "_load_config", "config_ms")
+    timed(StyleManager, "set_css", "css_ms")
+    timed(StyleManager, "clear", "css_ms")
+
+    app = app_module.TeaTimerApp()
+    do_activate = app_module.TeaTimerApp.do_activate
+    paint = {}
+
+    def on_after_paint(frame_clock):
+        frame_clock.disconnect(paint.pop("handler"))
+        painted = time.perf_counter()
+        phases["first_paint_ms"] = _ms(painted - paint["activated"])
+        phases["total_ms"] = _ms(painted - started)
+        GLib.idle_add(app.quit)
+
+    def measured_activate(self):
+        css_before = phases["css_ms"]
+        began = time.perf_counter()
+        do_activate(self)
+        paint["activated"] = time.perf_counter()
+        css = phases["css_ms"] - css_before
+        phases["widgets_ms"] = round(_ms(paint["activated"] - began) - css, 3)
+        if "handler" not in paint:
+            frame_clock = self.window.get_frame_clock()
+            paint["handler"] = frame_clock.connect("after-paint", on_after_paint)
+            frame_clock.request_phase(Gdk.FrameClockPhase.PAINT)
+
+    app_module.TeaTimerApp.do_activate = measured_activate
+    # Never hang the benchmark if no frame is ever painted
+    GLib.timeout_add_seconds(RUN_TIMEOUT // 2, app.quit)
+    app.run([sys.argv[0]])
+    print(RESULT_PREFIX + json.dumps(phases), flush=True)
+    return 0
+
+
+def _backend(choice):
+    if choice != "auto":
+        return choice
+    if os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"):
+        return "current"
+    if shutil.which("xvfb-run"):
+        return "xvfb"
+    if shutil.which("broadwayd"):
+        return "broadway"
+    raise SystemExit("No display: set DISPLAY, or install xvfb-run or broadwayd.")
+
+
+def _private_env(home):
+    env = dict(os.environ, HOME=str(home))
+    for name in ("XDG_CONFIG_HOME", "XDG_CACHE_HOME", "XDG_DATA_HOME", "XDG_RUNTIME_DIR"):
+        path = home / name.lower()
+        path.mkdir(mode=0o700, exist_ok=True)
+        env[name] = str(path)
+    return env
+
+
+def run_once(backend, env):
+    command = [sys.executable, "-X", "importtime", str(Path(__file__).resolve()), "--child"]
+    if backend == "xvfb":
+        command = ["xvfb-run", "-a", "-s", "-screen 0 1280x1024x24"] + command
+    result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=RUN_TIMEOUT)
+    lines = [line for line in result.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+    if result.returncode != 0 or not lines:
+        tail = "\n".join(result.stderr.splitlines()[-10:])
+        raise RuntimeError(f"Startup run failed (exit {result.returncode}):\n{tail}")
+    phases = json.loads(lines[-1][len(RESULT_PREFIX):])
+    phases["import_ms"] = parse_importtime(result.stderr)
+    return phases
+
+
+def benchmark(runs, warmup, backend):
+    """Medians and raw phases of runs startups, after warmup discarded ones."""
+    broadwayd = None
+    with tempfile.TemporaryDirectory(prefix="teatime-startup-") as tmp:
+        env = _private_env(Path(tmp))
+        if backend == "broadway":
+            broadwayd = subprocess.Popen(["broadwayd", BROADWAY_DISPLAY],
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            env.update(GDK_BACKEND="broadway", BROADWAY_DISPLAY=BROADWAY_DISPLAY)
+            env.pop("DISPLAY", None)
+            env.pop("WAYLAND_DISPLAY", None)
+            time.sleep(0.5)
+        try:
+            # The first start after a change also writes bytecode and caches
+            for _ in range(warmup):
+                run_once(backend, env)
+            results = [run_once(backend, env) for _ in range(runs)]
+        finally:
+            if broadwayd is not None:
+                broadwayd.terminate()
+                broadwayd.wait()
+    return {"backend": backend, "runs": runs, "medians": medians(results), "samples": results}
+
+
+def main():
+    if "--child" in sys.argv[1:]:
+        return child()
+    parser = argparse.ArgumentParser(description="Benchmark TeaTime startup by phase.")
+    parser.add_argument("--runs", type=int, default=10, help="Measured startups")
+    parser.add_argument("--warmup", type=int, default=1, help="Startups run first and discarded")
+    parser.add_argument("--backend", choices=("auto", "current", "xvfb", "broadway"), default="auto")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these medians as the baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a phase regressed past the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="Allowed absolute slowdown per phase")
+    parser.add_argument("--output", type=Path, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = benchmark(args.runs, args.warmup, _backend(args.backend))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+    if args.save_baseline:
+        baseline = {"backend": report["backend"], "runs": args.runs, "medians": report["medians"]}
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return 0
+    if not args.check:
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.", file=sys.stderr)
+        return 1
+    baseline = json.loads(args.baseline.read_text())
+    failed = regressions(report["medians"], baseline["medians"], args.tolerance, args.slack_ms)
+    for phase, value, allowed in failed:
+        print(f"REGRESSION {phase}: {value} ms > {allowed} ms allowed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Build the bundled sprite assets from their procedural sources.
+
+Replaces the one-off scripts in archives/. For every animation it renders
+the frames with the drawing code in bin/teatime/procedural.py, in a process
+pool, and writes:
+
+- the frames the app loads, at 200 px, into assets/sprites/<animation>/
+- pre-scaled variants into assets/sprites/<animation>/sizes/<size>/
+- an animated GIF preview
+- a memory-mapped sprite atlas (see bin/teatime/atlas.py)
+
+assets/sprites/manifest.json records every output and a hash of the inputs
+(drawing code, atlas format and build settings). An animation whose inputs
+hash unchanged and whose outputs are all present is skipped. set_animation.py
+validates names against this manifest.
+
+    python3 scripts/build_assets.py                  # build what changed
+    python3 scripts/build_assets.py --force puppy_animation
+    python3 scripts/build_assets.py --sizes 200 400 --jobs 4
+
+Needs pycairo; Pillow is optional and only used for the GIF previews.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "bin"))
+
+SPRITES_DIR = ROOT / "assets" / "sprites"
+MANIFEST_FILE = SPRITES_DIR / "manifest.json"
+BUILD_VERSION = 1
+BASE_SIZE = 200             # The size the app loads; matches the old PNGs
+DEFAULT_SIZES = (100, 200, 400, 800)
+GIF_FRAME_MS = 100          # 10 FPS, the overlay's frame rate
+
+# Bundled animations and the procedural source each is rendered from
+TARGETS = {
+    "puppy_animation": {
+        "source": "drawn_puppy",
+        "pattern": "puppy_sprite_frame_{:02d}.png",
+        "gif": "puppy_animation.gif",
+    },
+    "test_animation": {
+        "source": "drawn_bouncing_balls",
+        "pattern": "sprite_frame_{:02d}.png",
+        "gif": "test_animation.gif",
+    },
+}
+
+# Files whose contents change what a build produces
+INPUT_FILES = (
+    ROOT / "bin" / "teatime" / "procedural.py",
+    ROOT / "bin" / "teatime" / "atlas.py",
+    Path(__file__).resolve(),
+)
+
+
+def input_hash(name, target, sizes, frame_count, input_files=INPUT_FILES):
+    """Hash of everything an animation's outputs are built from."""
+    digest = hashlib.sha256()
+    settings = {
+        "version": BUILD_VERSION,
+        "name": name,
+        "target": target,
+        "sizes": sorted(sizes),
+        "frame_count": frame_count,
+        "gif_frame_ms": GIF_FRAME_MS,
+    }
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    for path in input_files:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def output_paths(name, target, sizes, frame_count):
+    """Outputs relative to SPRITES_DIR, as recorded in the manifest."""
+    frames = [f"{name}/{target['pattern'].format(index)}" for index in range(frame_count)]
+    variants = {
+        str(size): [f"{name}/sizes/{size}/{target['pattern'].format(index)}" for index in range(frame_count)]
+        for size in sorted(sizes) if size != BASE_SIZE
+    }
+    return {
+        "frames": frames,
+        "sizes": variants,
+        "gif": f"{name}/{target['gif']}",
+        "atlas": f"{name}/{name}.atlas",
+    }
+
+
+def is_up_to_date(entry, digest, sprites_dir=SPRITES_DIR):
+    """True if a manifest entry was built from these inputs and its outputs exist."""
+    if not entry or entry.get("input_hash") != digest:
+        return False
+    outputs = list(entry.get("frames", []))
+    for paths in entry.get("sizes", {}).values():
+        outputs.extend(paths)
+    outputs.extend(path for path in (entry.get("atlas"),) if path)
+    return all((sprites_dir / path).exists() for path in outputs)
+
+
+def load_manifest(path=MANIFEST_FILE):
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+        if isinstance(manifest, dict) and isinstance(manifest.get("animations"), dict):
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": BUILD_VERSION, "animations": {}}
+
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def render_frame(source, index, size, path):
+    """
+    Worker process: renders one frame to a PNG. Returns the frame as
+    (width, height, stride, ARGB32 bytes) at the base size, for the atlas.
+    """
+    from teatime.procedural import get_animation
+
+    surface = get_animation(source).render(index, size)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    surface.write_to_png(str(path))
+    if size != BASE_SIZE:
+        return None
+    return size, size, surface.get_stride(), bytes(surface.get_data())
+
+
+def write_gif(frame_paths, gif_path):
+    try:
+        from PIL import Image
+    except ImportError:
+        print(f"  Pillow is not installed; skipped {gif_path.name}")
+        return False
+    frames = [Image.open(path) for path in frame_paths]
+    frames[0].save(gif_path, save_all=True, append_images=frames[1:],
+                   duration=GIF_FRAME_MS, loop=0, disposal=2)
+    return True
+
+
+def build(names, sizes, jobs=None, force=False, sprites_dir=SPRITES_DIR):
+    """Builds the stale animations in names; returns the names that were built."""
+    from teatime.atlas import source_signature, write_atlas
+    from teatime.procedural import PROCEDURAL_ANIMATIONS, get_animation
+
+    manifest = load_manifest(sprites_dir / MANIFEST_FILE.name)
+    animations = manifest["animations"]
+    plans = {}
+    for name in names:
+        target = TARGETS[name]
+        frame_count = get_animation(target["source"]).frame_count
+        digest = input_hash(name, target, sizes, frame_count)
+        if not force and is_up_to_date(animations.get(name), digest, sprites_dir):
+            print(f"{name}: up to date")
+            continue
+        plans[name] = (target, frame_count, digest, output_paths(name, target, sizes, frame_count))
+
+    if plans:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {}
+            for name, (target, frame_count, _digest, outputs) in plans.items():
+                for size in sorted(set(sizes) | {BASE_SIZE}):
+                    paths = outputs["frames"] if size == BASE_SIZE else outputs["sizes"][str(size)]
+                    for index, path in enumerate(paths):
+                        futures[(name, size, index)] = pool.submit(
+                            render_frame, target["source"], index, size, str(sprites_dir / path)
+                        )
+            results = {key: future.result() for key, future in futures.items()}
+
+        for name, (target, frame_count, digest, outputs) in plans.items():
+            frame_paths = [sprites_dir / path for path in outputs["frames"]]
+            base_frames = [results[(name, BASE_SIZE, index)] for index in range(frame_count)]
+            write_atlas(sprites_dir / outputs["atlas"], base_frames, source_signature(frame_paths))
+            if not write_gif(frame_paths, sprites_dir / outputs["gif"]):
+                outputs["gif"] = None
+            animations[name] = dict(outputs, kind="frames", source=target["source"], input_hash=digest)
+            print(f"{name}: rendered {frame_count} frames at {sorted(set(sizes) | {BASE_SIZE})} px")
+
+    # Drawn animations need no files but are valid choices too
+    for source, animation in PROCEDURAL_ANIMATIONS.items():
+        animations[source] = {"kind": "drawn", "title": animation.title}
+    manifest["version"] = BUILD_VERSION
+    save_manifest(manifest, sprites_dir / MANIFEST_FILE.name)
+    return list(plans)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build sprite assets from their procedural sources.")
+    parser.add_argument("animations", nargs="*", help=f"Animations to build (default: {', '.join(TARGETS)})")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Frame sizes in pixels (the base size is always built)")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the inputs are unchanged")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.animations if name not in TARGETS]
+    if unknown:
+        parser.error(f"unknown animation(s): {', '.join(unknown)}")
+    build(args.animations or list(TARGETS), args.sizes, args.jobs, args.force)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Pack sprite animations into memory-mapped atlases (see bin/teatime/atlas.py).
+
+    # Pack every animation under assets/sprites from its frame PNGs
+    python3 scripts/build_sprite_atlas.py
+
+    # Cut a master sheet into a new animation: 4 columns x 3 rows of frames,
+    # each scaled to fit 200x200
+    python3 scripts/build_sprite_atlas.py \\
+        --sheet assets/sprites_master_sheets/sheet.png --grid 4x3 --name puppy_sheet
+
+Needs PyGObject (GdkPixbuf) and pycairo.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "bin"))
+
+import gi  # noqa: E402
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf  # noqa: E402
+
+from teatime.atlas import ATLAS_SUFFIX, source_signature, write_atlas  # noqa: E402
+from teatime.sprites import fit_size, pixbuf_argb32  # noqa: E402
+
+SPRITES_DIR = ROOT / "assets" / "sprites"
+
+
+def _frame_number(path):
+    digits = ''.join(filter(str.isdigit, path.name))
+    return int(digits) if digits else 0
+
+
+def pack_animation(sprites_dir):
+    """Writes <name>.atlas next to an animation's sprite_frame PNGs."""
+    frame_files = sorted(sprites_dir.glob("*sprite_frame_*.png"), key=_frame_number)
+    if not frame_files:
+        print(f"{sprites_dir.name}: no sprite_frame PNGs, skipped")
+        return None
+    frames = [pixbuf_argb32(GdkPixbuf.Pixbuf.new_from_file(str(f))) for f in frame_files]
+    path = write_atlas(sprites_dir / f"{sprites_dir.name}{ATLAS_SUFFIX}", frames, source_signature(frame_files))
+    print(f"{sprites_dir.name}: packed {len(frames)} frames into {path.relative_to(ROOT)}")
+    return path
+
+
+def pack_sheet(sheet, columns, rows, name, frame_size):
+    """Cuts a master sheet into a grid of frames and writes them as a new animation's atlas."""
+    pixbuf = GdkPixbuf.Pixbuf.new_from_file(str(sheet))
+    cell_width = pixbuf.get_width() // columns
+    cell_height = pixbuf.get_height() // rows
+    width, height, _x, _y = fit_size(cell_width, cell_height, frame_size, frame_size)
+    frames = []
+    for row in range(rows):
+        for column in range(columns):
+            cell = pixbuf.new_subpixbuf(column * cell_width, row * cell_height, cell_width, cell_height)
+            if (width, height) != (cell_width, cell_height):
+                cell = cell.scale_simple(width, height, GdkPixbuf.InterpType.HYPER)
+            frames.append(pixbuf_argb32(cell))
+    out_dir = SPRITES_DIR / name
+    # Recorded for reference; the loader uses sheet atlases as they are
+    path = write_atlas(out_dir / f"{name}{ATLAS_SUFFIX}", frames, source_signature([sheet]))
+    print(f"{name}: cut {len(frames)} frames from {sheet.name} into {path.relative_to(ROOT)}")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack sprite animations into mmap-able atlases.")
+    parser.add_argument("animations", nargs="*", help="Animation names (default: all)")
+    parser.add_argument("--sheet", type=Path, help="Master sprite sheet to cut")
+    parser.add_argument("--grid", default="4x3", help="Sheet layout as COLUMNSxROWS")
+    parser.add_argument("--name", help="Animation name for a sheet (default: the sheet's name)")
+    parser.add_argument("--frame-size", type=int, default=200, help="Largest frame edge in pixels")
+    args = parser.parse_args()
+
+    if args.sheet:
+        try:
+            columns, rows = (int(n) for n in args.grid.lower().split("x"))
+        except ValueError:
+            parser.error("--grid must look like 4x3")
+        name = args.name or args.sheet.stem.strip("_").lower()
+        pack_sheet(args.sheet, columns, rows, name, args.frame_size)
+        return 0
+
+    names = args.animations or sorted(d.name for d in SPRITES_DIR.iterdir() if d.is_dir())
+    for name in names:
+        pack_animation(SPRITES_DIR / name)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
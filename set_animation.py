@@ -12,43 +12,77 @@ import json
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "bin"))
+from teatime.core import ConfigManager  # noqa: E402  (GTK-free)
+
 # Configuration file path
 CONFIG_FILE = Path.home() / ".config" / "teatime_config.json"
+SPRITES_DIR = Path(__file__).parent / "assets" / "sprites"
+# Written by scripts/build_assets.py
+ASSET_MANIFEST = SPRITES_DIR / "manifest.json"
 
 def set_preferred_animation(animation_name):
     """Set the preferred animation in the config file."""
-    config = {}
-    
+    manager = ConfigManager(CONFIG_FILE)
     # Load existing config if it exists
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-        except Exception as e:
-            print(f"Warning: Could not read existing config file: {e}")
+    config = manager.load()
     
     # Update the preferred animation
     config["preferred_animation"] = animation_name
     
-    # Save the config
-    try:
-        CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
-        print(f"Successfully set preferred animation to: {animation_name}")
-    except Exception as e:
-        print(f"Error saving config file: {e}")
+    # Save the config (atomically, like the app)
+    if not manager.save(config):
         return False
-    
+    print(f"Successfully set preferred animation to: {animation_name}")
     return True
 
+def load_asset_manifest(path=ASSET_MANIFEST):
+    """Animations recorded by the asset build, or {} if it has not been run."""
+    try:
+        with open(path, 'r') as f:
+            animations = json.load(f).get("animations", {})
+        return animations if isinstance(animations, dict) else {}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _has_frames(directory):
+    return any(directory.glob("*sprite_frame_*.png")) or any(directory.glob("*.atlas")) \
+        or any(directory.glob("*.gif"))
+
+
+def available_animations(sprites_dir=SPRITES_DIR, manifest=None):
+    """Names of built and drawn animations, plus custom frame directories."""
+    manifest = load_asset_manifest(sprites_dir / "manifest.json") if manifest is None else manifest
+    names = set(manifest)
+    if sprites_dir.exists():
+        names.update(d.name for d in sprites_dir.iterdir() if d.is_dir() and _has_frames(d))
+    return sorted(names)
+
+
+def validate_animation(animation_name, sprites_dir=SPRITES_DIR, manifest=None):
+    """Returns None if the animation can be played, otherwise why not."""
+    manifest = load_asset_manifest(sprites_dir / "manifest.json") if manifest is None else manifest
+    entry = manifest.get(animation_name)
+    if entry is not None:
+        if entry.get("kind") == "drawn":
+            return None
+        missing = [path for path in entry.get("frames", []) if not (sprites_dir / path).exists()]
+        if missing:
+            return (f"{len(missing)} built frame(s) of '{animation_name}' are missing; "
+                    "run scripts/build_assets.py")
+        return None
+    # Custom animations added by hand are not in the manifest
+    directory = sprites_dir / animation_name
+    if directory.is_dir() and _has_frames(directory):
+        return None
+    return f"Unknown animation: {animation_name}"
+
+
 def list_available_animations():
     """List available animations in the assets/sprites directory."""
-    import os
-    sprites_dir = Path(__file__).parent / "assets" / "sprites"
-    
-    if sprites_dir.exists():
-        animations = [d.name for d in sprites_dir.iterdir() if d.is_dir()]
+    animations = available_animations()
+    if animations:
         print("Available animations:")
         for animation in animations:
             print(f"  - {animation}")
@@ -62,4 +96,9 @@ if __name__ == "__main__":
         sys.exit(1)
     
     animation_name = sys.argv[1]
+    error = validate_animation(animation_name)
+    if error:
+        print(f"Error: {error}")
+        list_available_animations()
+        sys.exit(1)
     set_preferred_animation(animation_name)
\ No newline at end of file
@@ -5,5 +5,5 @@ setup(
     version="1.3.6",
     packages=find_packages(where="bin"),
     package_dir={"": "bin"},
-    scripts=["bin/teatime.py"],
+    scripts=["bin/teatime.py", "bin/teatime-ctl"],
 )
\ No newline at end of file
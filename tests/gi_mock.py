@@ -0,0 +1,34 @@
+"""Installs a MagicMock in place of gi so teatime imports without GTK.
+
+Mirrors the setup at the top of test_compatibility.py; import it before
+importing teatime in test modules that do not need a real display.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Add bin to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'bin')))
+
+
+class DummyApplication:
+    def __init__(self, *args, **kwargs):
+        pass
+    def __getattr__(self, name):
+        return MagicMock()
+
+
+class DummyWindow:
+    def __init__(self, *args, **kwargs):
+        pass
+    def __getattr__(self, name):
+        return MagicMock()
+
+
+if not isinstance(sys.modules.get('gi'), MagicMock):
+    gi_repository = MagicMock()
+    gi_repository.Gtk.Application = DummyApplication
+    gi_repository.Gtk.Window = DummyWindow
+    sys.modules['gi'] = MagicMock()
+    sys.modules['gi.repository'] = gi_repository
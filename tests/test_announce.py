@@ -0,0 +1,122 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+import teatime.app
+from teatime.announce import (
+    AnnouncementScheduler,
+    PRIORITY_PERIODIC,
+    PRIORITY_STATE,
+    PRIORITY_COMPLETION,
+)
+
+
+class FakeLoop:
+    """Stands in for GLib timeouts with a manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.timeouts = {}
+        self._next_id = 1
+
+    def clock(self):
+        return self.now
+
+    def timeout_add(self, ms, callback):
+        source_id = self._next_id
+        self._next_id += 1
+        self.timeouts[source_id] = (self.now + ms / 1000.0, callback)
+        return source_id
+
+    def source_remove(self, source_id):
+        self.timeouts.pop(source_id, None)
+
+    def advance(self, seconds):
+        end = self.now + seconds
+        while True:
+            due = [(t, sid) for sid, (t, _cb) in self.timeouts.items() if t <= end]
+            if not due:
+                break
+            t, sid = min(due)
+            self.now = t
+            _t, callback = self.timeouts.pop(sid)
+            callback()
+        self.now = end
+
+
+class TestAnnouncementScheduler(unittest.TestCase):
+    def setUp(self):
+        self.loop = FakeLoop()
+        self.spoken = []
+        self.scheduler = AnnouncementScheduler(
+            self.spoken.append, min_interval=1.0, periodic_interval=10.0, coalesce_window=0.1,
+            clock=self.loop.clock, timeout_add=self.loop.timeout_add,
+            source_remove=self.loop.source_remove,
+        )
+
+    def test_higher_priority_supersedes_within_window(self):
+        self.scheduler.announce("Time remaining: 0 minutes and 5 seconds.", PRIORITY_PERIODIC)
+        self.scheduler.announce("Tea is ready!", PRIORITY_COMPLETION)
+        self.scheduler.announce("Time remaining: 0 minutes and 0 seconds.", PRIORITY_PERIODIC)
+        self.loop.advance(1)
+        self.assertEqual(self.spoken, ["Tea is ready!"])
+        self.assertEqual(self.scheduler.dropped, 2)
+
+    def test_rate_limit_delays_but_completion_bypasses(self):
+        self.scheduler.announce("Tea timer started for 5 minutes.", PRIORITY_STATE)
+        self.loop.advance(0.2)
+        self.scheduler.announce("Tea timer stopped and reset.", PRIORITY_STATE)
+        self.loop.advance(0.5)
+        self.assertEqual(len(self.spoken), 1)   # held back by the 1 s limit
+        self.loop.advance(0.5)
+        self.assertEqual(self.spoken[-1], "Tea timer stopped and reset.")
+
+        self.scheduler.announce("Tea is ready!", PRIORITY_COMPLETION)
+        self.loop.advance(0.15)
+        self.assertEqual(self.spoken[-1], "Tea is ready!")
+
+    def test_only_immediate_repeats_are_dropped(self):
+        self.scheduler.announce("Tea is ready!", PRIORITY_COMPLETION)
+        self.loop.advance(0.1)
+        self.scheduler.announce("Tea is ready!", PRIORITY_COMPLETION)
+        self.loop.advance(0.1)
+        self.assertEqual(self.spoken, ["Tea is ready!"])
+
+        # The same start, minutes later, is announced again
+        self.scheduler.announce("Tea timer started for 5 minutes.", PRIORITY_STATE)
+        self.loop.advance(1)
+        self.loop.advance(300)
+        self.scheduler.announce("Tea timer started for 5 minutes.", PRIORITY_STATE)
+        self.loop.advance(1)
+        self.assertEqual(self.spoken[1:], ["Tea timer started for 5 minutes."] * 2)
+
+    def test_periodic_announcements_are_spaced(self):
+        for _ in range(6):   # one tick every 5 seconds
+            self.scheduler.announce(f"Time remaining {self.loop.now}", PRIORITY_PERIODIC)
+            self.loop.advance(5)
+        self.assertEqual(len(self.spoken), 3)
+
+
+
+class TestStartAnnouncement(unittest.TestCase):
+    def setUp(self):
+        with patch.object(teatime.app, "CONFIG_FILE", MagicMock(exists=lambda: False)):
+            self.app = teatime.app.TeaTimerApp()
+        self.app.announcer = MagicMock()
+
+    def announced_start(self):
+        state = {"phase": teatime.app.RUNNING, "session": 1, "duration": 30,
+                 "unit": self.app._duration_unit(), "time_left": 30}
+        self.app._announce_timer_state(state, {"phase", "session"})
+        return self.app.announcer.announce.call_args[0][0]
+
+    def test_start_announcement_uses_the_duration_unit(self):
+        self.app.use_seconds = False
+        self.assertEqual(self.announced_start(), "Tea timer started for 30 minutes.")
+        self.app.use_seconds = True
+        self.assertEqual(self.announced_start(), "Tea timer started for 30 seconds.")
+
+
+if __name__ == "__main__":
+    unittest.main()
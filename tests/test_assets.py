@@ -0,0 +1,119 @@
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+import teatime.app
+from teatime import assets
+from teatime.assets import build_index, load_index, png_size
+
+
+def write_png(path, width, height):
+    """Just enough of a PNG for png_size(): signature and IHDR."""
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    chunk = struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+    path.write_bytes(assets.PNG_SIGNATURE + chunk)
+
+
+class TestAssetIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.assets_dir = self.root / "assets"
+        puppy = self.assets_dir / "sprites" / "puppy_animation"
+        puppy.mkdir(parents=True)
+        for index in (10, 2, 0, 1):
+            write_png(puppy / f"puppy_sprite_frame_{index:02d}.png", 200, 150)
+        gif_only = self.assets_dir / "sprites" / "gif_only"
+        gif_only.mkdir()
+        (gif_only / "dance.gif").write_bytes(b"GIF89a")
+        (self.assets_dir / "sound-effects").mkdir()
+        (self.assets_dir / "sound-effects" / "done.wav").write_bytes(b"RIFF")
+        write_png(self.assets_dir / "icon.png", 64, 64)
+        self.cache_file = self.root / "cache" / "asset_index.json"
+
+    def test_frames_are_ordered_and_sized(self):
+        index = load_index(self.assets_dir, self.cache_file)
+        self.assertEqual(index.animation_names(), ["gif_only", "puppy_animation"])
+        self.assertEqual([f.name[-6:-4] for f in index.frames("puppy_animation")], ["00", "01", "02", "10"])
+        self.assertEqual(index.frame_size("puppy_animation"), (200, 150))
+        self.assertEqual([f.name for f in index.animated_files("gif_only")], ["dance.gif"])
+        self.assertEqual([f.name for f in index.sounds()], ["done.wav"])
+        self.assertEqual([f.name for f in index.images()], ["icon.png"])
+        self.assertTrue(index.sounds()[0].is_absolute())
+
+    def test_cached_index_is_reused(self):
+        load_index(self.assets_dir, self.cache_file)
+        with patch.object(assets, "build_index", wraps=build_index) as build:
+            load_index(self.assets_dir, self.cache_file)
+        build.assert_not_called()
+
+    def test_added_file_invalidates_the_cache(self):
+        index = load_index(self.assets_dir, self.cache_file)
+        puppy = self.assets_dir / "sprites" / "puppy_animation"
+        write_png(puppy / "puppy_sprite_frame_11.png", 200, 150)
+        # Make sure the directory mtime moves even on coarse-grained filesystems
+        stat = os.stat(puppy)
+        os.utime(puppy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertTrue(index.is_stale())
+        self.assertEqual(len(load_index(self.assets_dir, self.cache_file).frames("puppy_animation")), 5)
+
+    def test_png_size_rejects_other_files(self):
+        self.assertIsNone(png_size(self.assets_dir / "sound-effects" / "done.wav"))
+        self.assertIsNone(png_size(self.assets_dir / "missing.png"))
+
+
+class TestAssetsDir(unittest.TestCase):
+    def test_bundled_tree_is_the_default(self):
+        self.assertEqual(assets.find_assets_dir({}), assets.BUNDLED_ASSETS_DIR)
+        self.assertTrue((assets.BUNDLED_ASSETS_DIR / "sprites").is_dir())
+
+    def test_environment_points_at_an_installed_tree(self):
+        installed = Path(tempfile.mkdtemp()) / "share" / "teatime" / "assets"
+        self.assertEqual(assets.find_assets_dir({assets.ASSETS_ENV: str(installed)}), installed)
+
+        # The module-level default follows it too, e.g. for a pip install
+        bin_dir = Path(assets.__file__).resolve().parents[1]
+        env = dict(os.environ, **{assets.ASSETS_ENV: str(installed), "XDG_CACHE_HOME": str(installed.parent)})
+        result = subprocess.run(
+            [sys.executable, "-c", "from teatime.assets import ASSETS_DIR; print(ASSETS_DIR)"],
+            cwd=bin_dir, env=env, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(result.stdout.strip(), str(installed))
+
+
+class TestAppUsesIndex(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(teatime.app, "CONFIG_FILE", MagicMock(exists=lambda: False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = teatime.app.TeaTimerApp()
+
+    def test_index_loaded_once(self):
+        fake = MagicMock()
+        fake.is_stale.return_value = False
+        with patch.object(teatime.app, "load_asset_index", return_value=fake) as load:
+            self.app._asset_index()
+            self.app._asset_index()
+            self.app._asset_index(revalidate=True)
+        load.assert_called_once()
+
+    def test_revalidate_reloads_a_stale_index(self):
+        stale = MagicMock()
+        stale.is_stale.return_value = True
+        self.app.asset_index = stale
+        with patch.object(teatime.app, "load_asset_index") as load:
+            self.app._asset_index()
+            load.assert_not_called()
+            self.app._asset_index(revalidate=True)
+        load.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+from teatime import atlas, sprites
+from teatime.atlas import SpriteAtlas, find_atlas, pack_frames, source_signature, write_atlas
+from teatime.sprites import SpriteSurfaceCache
+
+
+def raw_frame(width, height, value, stride=None):
+    """A frame as (width, height, stride, ARGB32 bytes) filled with one byte value."""
+    stride = stride or width * 4
+    return width, height, stride, bytes([value]) * (stride * height)
+
+
+class TestAtlasFormat(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        # Strides are computed without pycairo here: width * 4
+        patcher = patch.object(atlas, "cairo", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sources = []
+        for index in range(3):
+            path = self.tmp / f"sprite_frame_{index:02d}.png"
+            path.write_bytes(b"png %d" % index)
+            self.sources.append(path)
+
+    def write(self, frames=None):
+        frames = frames or [raw_frame(4, 2, index + 1) for index in range(3)]
+        return write_atlas(self.tmp / "anim.atlas", frames, source_signature(self.sources))
+
+    def test_frames_are_stacked_rows(self):
+        self.assertEqual(pack_frames([(4, 2), (3, 5)]), (4, 7, [[0, 0, 4, 2], [0, 2, 3, 5]]))
+
+    def test_round_trip_maps_each_frame_in_place(self):
+        path = self.write()
+        opened = SpriteAtlas.open(path, source_signature(self.sources))
+        self.assertEqual(len(opened), 3)
+        for index, frame in enumerate(opened.frames):
+            self.assertEqual((frame.get_width(), frame.get_height()), (4, 2))
+            self.assertEqual(bytes(frame.data), bytes([index + 1]) * 32)
+            # Writable, as cairo.ImageSurface.create_for_data needs, without touching the file
+            self.assertFalse(frame.data.readonly)
+        opened.frames[0].data[0] = 0
+        self.assertEqual(path.read_bytes()[0], 1)
+
+    def test_narrow_frames_are_padded_to_the_atlas_stride(self):
+        path = self.write([raw_frame(4, 1, 1), raw_frame(2, 1, 2, stride=12)])
+        frames = SpriteAtlas.open(path).frames
+        self.assertEqual(bytes(frames[1].data), bytes([2]) * 8 + bytes(8))
+
+    def test_changed_sources_make_the_atlas_stale(self):
+        path = self.write()
+        self.sources[1].write_bytes(b"edited frame")
+        self.assertIsNone(SpriteAtlas.open(path, source_signature(self.sources)))
+        self.assertIsNone(find_atlas("anim", self.tmp, self.sources, cache_dir=self.tmp / "cache"))
+
+    def test_truncated_or_foreign_atlas_is_ignored(self):
+        path = self.write()
+        path.write_bytes(path.read_bytes()[:10])
+        self.assertIsNone(SpriteAtlas.open(path))
+        (self.tmp / "anim.atlas.json").write_text("{not json")
+        self.assertIsNone(SpriteAtlas.open(path))
+
+    def test_find_prefers_shipped_atlas_then_cache(self):
+        cache_dir = self.tmp / "cache"
+        write_atlas(cache_dir / "anim.atlas", [raw_frame(4, 2, 9)] * 3, source_signature(self.sources))
+        found = find_atlas("anim", self.tmp, self.sources, cache_dir=cache_dir)
+        self.assertEqual(found.path, cache_dir / "anim.atlas")
+        self.write()
+        found = find_atlas("anim", self.tmp, self.sources, cache_dir=cache_dir)
+        self.assertEqual(found.path, self.tmp / "anim.atlas")
+
+    def test_sheet_atlas_is_used_without_frame_files(self):
+        self.write()
+        self.assertEqual(len(find_atlas("anim", self.tmp)), 3)
+        self.assertIsNone(find_atlas("other", self.tmp))
+
+
+class TestAtlasFramesInSurfaceCache(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(sprites, "cairo", MagicMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unscaled_frame_is_drawn_from_the_mapping(self):
+        frame = atlas.AtlasFrame(200, 200, 800, memoryview(bytearray(800 * 200)))
+        mapped = MagicMock()
+        with patch.object(atlas.AtlasFrame, "surface", return_value=mapped):
+            cache = SpriteSurfaceCache()
+            surface, x, y = cache.get("puppy", 0, frame, 300, 300)
+        self.assertIs(surface, mapped)
+        self.assertEqual((x, y, cache.conversions), (50, 50, 0))
+
+    def test_mapped_frames_do_not_count_against_the_budget(self):
+        frame = atlas.AtlasFrame(200, 200, 800, memoryview(bytearray(800 * 200)))
+        cache = sprites.AnimationCache(budget_bytes=1)
+        cache.put("puppy", [frame] * 12)
+        self.assertEqual(cache.bytes_used, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
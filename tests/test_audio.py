@@ -0,0 +1,116 @@
+import tempfile
+import threading
+import unittest
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+import teatime.app
+from teatime import audio
+from teatime.audio import AudioPlayer, FileSink, NullSink, PcmSound, chunks, load_wav
+
+
+def write_wav(path, frames=4800, rate=48000, channels=2):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(bytes(range(256)) * (frames * channels * 2 // 256))
+
+
+class FailingSink(NullSink):
+    name = "failing"
+
+    def write(self, data):
+        raise BrokenPipeError("player exited")
+
+
+class TestPcm(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.path = self.tmp / "done.wav"
+        write_wav(self.path)
+
+    def test_wav_is_decoded_once_into_pcm(self):
+        sound = load_wav(self.path)
+        self.assertEqual((sound.channels, sound.sample_width, sound.rate), (2, 2, 48000))
+        self.assertEqual(len(sound.pcm), 4800 * 4)
+        self.assertAlmostEqual(audio.duration(sound), 0.1)
+
+    def test_chunks_hold_whole_frames(self):
+        sound = PcmSound(2, 2, 48000, bytes(4 * 1000))
+        parts = chunks(sound, seconds=0.001)
+        self.assertTrue(all(len(part) % 4 == 0 for part in parts))
+        self.assertEqual(b"".join(parts), sound.pcm)
+
+    def test_file_sink_writes_the_sound(self):
+        sound = load_wav(self.path)
+        out = self.tmp / "played.wav"
+        player = AudioPlayer(sound, sinks=[FileSink(out)])
+        player.play()
+        player.close()
+        self.assertEqual(load_wav(out), sound)
+
+
+class TestAudioPlayer(unittest.TestCase):
+    def setUp(self):
+        self.sound = PcmSound(2, 2, 48000, bytes(4 * 4800))
+
+    def test_one_thread_serves_every_play(self):
+        sink = NullSink()
+        player = AudioPlayer(self.sound, sinks=[sink])
+        self.addCleanup(player.close)
+        player.start()
+        before = threading.active_count()
+        for _ in range(3):
+            player.play()
+        self.assertTrue(player.wait_idle())
+        self.assertEqual(threading.active_count(), before)
+        self.assertEqual((player.plays, sink.bytes_written), (3, 3 * len(self.sound.pcm)))
+
+    def test_latency_measured_from_the_given_start(self):
+        now = [10.0]
+        player = AudioPlayer(self.sound, sinks=[NullSink()], clock=lambda: now[0])
+        self.addCleanup(player.close)
+        latencies = []
+        now[0] = 10.25
+        player.play(started=10.0, on_first_sample=latencies.append)
+        player.wait_idle()
+        self.assertEqual(latencies, [250.0])
+        self.assertEqual(player.last_latency_ms, 250.0)
+
+    def test_failing_sink_falls_back_to_the_next(self):
+        fallback = NullSink()
+        player = AudioPlayer(self.sound, sinks=[FailingSink(), fallback])
+        self.addCleanup(player.close)
+        player.play()
+        player.wait_idle()
+        self.assertEqual(player.sink_name, "null")
+        self.assertEqual(fallback.bytes_written, len(self.sound.pcm))
+
+
+class TestAppSound(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(teatime.app, "CONFIG_FILE", MagicMock(exists=lambda: False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = teatime.app.TeaTimerApp()
+
+    def test_preloaded_player_is_used(self):
+        self.app.audio_player = MagicMock()
+        pipeline = MagicMock(deadline=5.0)
+        with patch.object(self.app, "_spawn_notification_sound") as spawn:
+            self.app._play_notification_sound(pipeline)
+        spawn.assert_not_called()
+        self.assertEqual(self.app.audio_player.play.call_args.kwargs["started"], 5.0)
+
+    def test_latency_lands_in_completion_metrics(self):
+        pipeline = MagicMock(metrics={})
+        self.app._record_sound_latency(pipeline, 12.5)
+        self.assertEqual(pipeline.metrics, {"sound_first_sample_ms": 12.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
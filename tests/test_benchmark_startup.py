@@ -0,0 +1,40 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+spec = importlib.util.spec_from_file_location("benchmark_startup", ROOT / "scripts" / "benchmark_startup.py")
+benchmark_startup = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(benchmark_startup)
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       412 |        412 |   teatime.core
+import time:      1875 |      48213 | teatime.app
+import time:       120 |        120 | teatime.application
+"""
+
+
+class TestStartupReport(unittest.TestCase):
+    def test_importtime_reads_cumulative_module_time(self):
+        self.assertEqual(benchmark_startup.parse_importtime(IMPORTTIME), 48.213)
+        self.assertEqual(benchmark_startup.parse_importtime(IMPORTTIME, "teatime.core"), 0.412)
+        self.assertIsNone(benchmark_startup.parse_importtime(IMPORTTIME, "teatime.stats"))
+
+    def test_medians_per_phase(self):
+        runs = [{"config_ms": 1.0, "total_ms": 300.0},
+                {"config_ms": 3.0, "total_ms": 200.0},
+                {"config_ms": 2.0, "total_ms": 250.0, "import_ms": None}]
+        self.assertEqual(benchmark_startup.medians(runs), {"config_ms": 2.0, "total_ms": 250.0})
+
+    def test_regressions_allow_tolerance_and_slack(self):
+        baseline = {"config_ms": 2.0, "total_ms": 250.0, "css_ms": 10.0}
+        current = {"config_ms": 7.0, "total_ms": 310.0}
+        # config: 2 * 1.2 + 5 = 7.4 allowed; total: 250 * 1.2 + 5 = 305 allowed
+        self.assertEqual(benchmark_startup.regressions(current, baseline, 0.2, 5.0),
+                         [("total_ms", 310.0, 305.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_script(path, name):
+    spec = importlib.util.spec_from_file_location(name, ROOT / path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+build_assets = load_script("scripts/build_assets.py", "build_assets")
+set_animation = load_script("set_animation.py", "set_animation")
+
+
+class TestBuildAssets(unittest.TestCase):
+    def setUp(self):
+        self.sprites_dir = Path(tempfile.mkdtemp())
+        self.target = build_assets.TARGETS["puppy_animation"]
+
+    def built_entry(self, sizes=(100, 200)):
+        digest = build_assets.input_hash("puppy_animation", self.target, sizes, 12)
+        outputs = build_assets.output_paths("puppy_animation", self.target, sizes, 12)
+        paths = outputs["frames"] + [outputs["atlas"]] + [p for ps in outputs["sizes"].values() for p in ps]
+        for path in paths:
+            (self.sprites_dir / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.sprites_dir / path).write_bytes(b"x")
+        return dict(outputs, kind="frames", input_hash=digest)
+
+    def test_outputs_cover_every_size(self):
+        outputs = build_assets.output_paths("puppy_animation", self.target, (100, 200, 400), 12)
+        self.assertEqual(outputs["frames"][0], "puppy_animation/puppy_sprite_frame_00.png")
+        self.assertEqual(sorted(outputs["sizes"]), ["100", "400"])
+        self.assertEqual(outputs["sizes"]["400"][11], "puppy_animation/sizes/400/puppy_sprite_frame_11.png")
+
+    def test_hash_follows_settings_and_inputs(self):
+        base = build_assets.input_hash("puppy_animation", self.target, (200,), 12)
+        self.assertEqual(base, build_assets.input_hash("puppy_animation", self.target, (200,), 12))
+        self.assertNotEqual(base, build_assets.input_hash("puppy_animation", self.target, (200, 400), 12))
+        extra = self.sprites_dir / "drawing.py"
+        extra.write_text("changed")
+        inputs = build_assets.INPUT_FILES + (extra,)
+        self.assertNotEqual(base, build_assets.input_hash("puppy_animation", self.target, (200,), 12, inputs))
+
+    def test_up_to_date_needs_same_hash_and_all_outputs(self):
+        entry = self.built_entry()
+        digest = entry["input_hash"]
+        self.assertTrue(build_assets.is_up_to_date(entry, digest, self.sprites_dir))
+        self.assertFalse(build_assets.is_up_to_date(entry, "other", self.sprites_dir))
+        (self.sprites_dir / entry["sizes"]["100"][3]).unlink()
+        self.assertFalse(build_assets.is_up_to_date(entry, digest, self.sprites_dir))
+
+    def test_unchanged_animation_is_skipped(self):
+        entry = self.built_entry(sizes=(200,))
+        build_assets.save_manifest(
+            {"version": 1, "animations": {"puppy_animation": entry}}, self.sprites_dir / "manifest.json"
+        )
+        with patch.object(build_assets, "ProcessPoolExecutor") as pool:
+            built = build_assets.build(["puppy_animation"], (200,), sprites_dir=self.sprites_dir)
+        self.assertEqual(built, [])
+        pool.assert_not_called()
+        manifest = build_assets.load_manifest(self.sprites_dir / "manifest.json")
+        self.assertEqual(manifest["animations"]["drawn_puppy"]["kind"], "drawn")
+
+
+class TestSetAnimationValidation(unittest.TestCase):
+    def setUp(self):
+        self.sprites_dir = Path(tempfile.mkdtemp())
+        (self.sprites_dir / "puppy_animation").mkdir()
+        (self.sprites_dir / "puppy_animation" / "puppy_sprite_frame_00.png").write_bytes(b"x")
+        self.manifest = {
+            "puppy_animation": {"kind": "frames", "frames": [
+                "puppy_animation/puppy_sprite_frame_00.png",
+                "puppy_animation/puppy_sprite_frame_01.png",
+            ]},
+            "drawn_puppy": {"kind": "drawn"},
+        }
+
+    def validate(self, name):
+        return set_animation.validate_animation(name, self.sprites_dir, self.manifest)
+
+    def test_built_animation_with_missing_frames_is_rejected(self):
+        self.assertIn("build_assets.py", self.validate("puppy_animation"))
+        (self.sprites_dir / "puppy_animation" / "puppy_sprite_frame_01.png").write_bytes(b"x")
+        self.assertIsNone(self.validate("puppy_animation"))
+
+    def test_drawn_and_custom_animations_are_accepted(self):
+        self.assertIsNone(self.validate("drawn_puppy"))
+        (self.sprites_dir / "kitten").mkdir()
+        self.assertIsNotNone(self.validate("kitten"))
+        (self.sprites_dir / "kitten" / "sprite_frame_00.png").write_bytes(b"x")
+        self.assertIsNone(self.validate("kitten"))
+        self.assertIn("Unknown", self.validate("nonexistent"))
+
+    def test_manifest_is_read_from_disk(self):
+        (self.sprites_dir / "manifest.json").write_text(json.dumps({"animations": self.manifest}))
+        self.assertEqual(set_animation.load_asset_manifest(self.sprites_dir / "manifest.json"), self.manifest)
+        self.assertIn("drawn_puppy", set_animation.available_animations(self.sprites_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
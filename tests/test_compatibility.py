@@ -2,6 +2,7 @@ import unittest
 import json
 import os
 import sys
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -92,6 +93,38 @@ class TestCompatibility(unittest.TestCase):
         config = cm.load()
         self.assertEqual(config, {}) # Returns empty dict on error
 
+    def test_config_manager_skips_unchanged_writes(self):
+        """save() replaces the file atomically and only when the content changed."""
+        cm = teatime.ConfigManager(config_path=self.tmp_config)
+        self.assertTrue(cm.save({"font_scale_factor": 1.5}))
+        self.assertTrue(cm.save({"font_scale_factor": 1.5}))
+        self.assertEqual(cm.writes, 1)
+        self.assertEqual(list(self.test_dir.glob(".tmp_config.json.*")), [])
+        # A fresh manager that has read the file does not rewrite it either
+        reader = teatime.ConfigManager(config_path=self.tmp_config)
+        reader.save(reader.load())
+        self.assertEqual(reader.writes, 0)
+
+    def test_config_manager_debounces_scheduled_saves(self):
+        """A burst of scheduled saves costs one write; flush() writes what is pending."""
+        cm = teatime.ConfigManager(config_path=self.tmp_config, delay=60)
+        for step in range(20):
+            cm.schedule_save({"font_scale_factor": 1.5 + step / 10})
+        self.assertTrue(cm.pending)
+        self.assertFalse(self.tmp_config.exists())
+        self.assertTrue(cm.flush())
+        self.assertEqual(cm.writes, 1)
+        self.assertAlmostEqual(cm.load()["font_scale_factor"], 3.4)
+
+        quick = teatime.ConfigManager(config_path=self.tmp_config, delay=0.01)
+        quick.schedule_save({"font_scale_factor": 2.0})
+        for _ in range(200):
+            if quick.writes:
+                break
+            time.sleep(0.01)
+        self.assertFalse(quick.pending)
+        self.assertEqual(quick.load()["font_scale_factor"], 2.0)
+
     def test_stats_manager_logic(self):
         legacy_stats = [
             {"timestamp": "2025-01-01T10:00:00", "duration": 10},
@@ -107,6 +140,13 @@ class TestCompatibility(unittest.TestCase):
         self.assertEqual(logs[0]["duration"], 10)
         self.assertNotIn("category", logs[0])
 
+    def test_stats_manager_append(self):
+        """append() creates the log and keeps existing entries."""
+        sm = teatime.StatsManager(stats_path=self.tmp_stats)
+        self.assertTrue(sm.append({"timestamp": "2025-01-01T10:00:00", "duration": 10}))
+        self.assertTrue(sm.append({"timestamp": "2025-01-01T11:00:00", "duration": 20}))
+        self.assertEqual([e["duration"] for e in sm.load()], [10, 20])
+
     def test_app_load_config_missing_and_null_fields(self):
         """Verify app._load_config handles null/missing fields gracefully."""
         bad_config = {
@@ -132,6 +172,26 @@ class TestCompatibility(unittest.TestCase):
             self.assertEqual(app.mini_mode, False)
             self.assertEqual(app.nano_mode, False)
 
+    def test_app_loads_config_through_config_manager(self):
+        """Saving the config the app just loaded does not rewrite the file."""
+        config = {"font_scale_factor": 2.0, "last_duration": 15}
+        self.tmp_config.write_text(json.dumps(config, indent=2))
+
+        with patch.dict(os.environ, {}, clear=True):
+            app = teatime.app.TeaTimerApp()
+        self.assertEqual(app.font_scale_factor, 2.0)
+        self.assertTrue(app.config_manager.save(config))
+        self.assertEqual(app.config_manager.writes, 0)
+
+    def test_app_explicit_duration_overrides_config(self):
+        """An explicit duration wins over last_duration without any env variable."""
+        with open(self.tmp_config, 'w') as f:
+            json.dump({"last_duration": 15}, f)
+
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(teatime.app.TeaTimerApp().last_duration, 15)
+            self.assertEqual(teatime.app.TeaTimerApp(duration=25).last_duration, 25)
+
     def test_stats_window_load_stats_malformed_and_nulls(self):
         """Verify StatisticsWindow._load_stats handles malformed/null fields and missing categories gracefully."""
         bad_stats = [
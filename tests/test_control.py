@@ -0,0 +1,206 @@
+import json
+import select
+import socket
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+from teatime import control
+from teatime.control import ControlServer, MAX_REQUEST_BYTES, METHOD_NOT_FOUND, INVALID_PARAMS, PARSE_ERROR
+from teatime.ctl import ControlClient
+
+
+class SelectLoop:
+    """Stands in for GLib's io watches with select(), so the real server runs."""
+
+    PRIORITY_DEFAULT = 0
+    IO_IN, IO_OUT, IO_ERR, IO_HUP = 1, 4, 8, 16
+    SOURCE_CONTINUE, SOURCE_REMOVE = True, False
+
+    def __init__(self):
+        self.watches = {}
+        self._next_id = 0
+
+    def io_add_watch(self, fd, priority, condition, callback, *args):
+        self._next_id += 1
+        self.watches[self._next_id] = (fd, condition, callback, args)
+        return self._next_id
+
+    def source_remove(self, watch_id):
+        del self.watches[watch_id]
+
+    def iterate(self, timeout=1.0):
+        readers = {w[0] for w in self.watches.values() if w[1] & self.IO_IN}
+        writers = {w[0] for w in self.watches.values() if w[1] & self.IO_OUT}
+        readable, writable, _ = select.select(readers, writers, [], timeout)
+        for watch_id, (fd, condition, callback, args) in list(self.watches.items()):
+            if watch_id in self.watches and (fd in readable and condition & self.IO_IN
+                                             or fd in writable and condition & self.IO_OUT):
+                if not callback(fd, condition, *args):
+                    self.watches.pop(watch_id, None)
+
+    def run_until(self, predicate, limit=50):
+        for _ in range(limit):
+            if predicate():
+                return True
+            self.iterate(0.1)
+        return predicate()
+
+
+def _fake_app():
+    app = MagicMock()
+    app.get_timer_status.return_value = {
+        "id": "main", "running": True, "duration": 5, "unit": "minutes", "time_left": 240,
+    }
+    app.start_session.return_value = True
+    app.stop_session.return_value = True
+    return app
+
+
+class TestControlServer(unittest.TestCase):
+    def test_status_and_list(self):
+        server = ControlServer(_fake_app(), socket_path="/nonexistent")
+        response = server.handle_request({"jsonrpc": "2.0", "id": 1, "method": "status"})
+        self.assertEqual(response["id"], 1)
+        self.assertEqual(response["result"]["time_left"], 240)
+
+        response = server.handle_request({"jsonrpc": "2.0", "id": 2, "method": "list"})
+        self.assertEqual(len(response["result"]["timers"]), 1)
+
+    def test_start_validates_duration(self):
+        app = _fake_app()
+        server = ControlServer(app, socket_path="/nonexistent")
+        response = server.handle_request({"id": 1, "method": "start", "params": {"duration": 0}})
+        self.assertEqual(response["error"]["code"], INVALID_PARAMS)
+        response = server.handle_request({"id": 3, "method": "start", "params": {"duration": True}})
+        self.assertEqual(response["error"]["code"], INVALID_PARAMS)
+        app.start_session.assert_not_called()
+
+        server.handle_request({"id": 2, "method": "start", "params": {"duration": 25}})
+        app.start_session.assert_called_once_with(25)
+
+    def test_unknown_method_and_notifications(self):
+        server = ControlServer(_fake_app(), socket_path="/nonexistent")
+        response = server.handle_request({"id": 1, "method": "explode"})
+        self.assertEqual(response["error"]["code"], METHOD_NOT_FOUND)
+        # Requests without an id are notifications and get no response
+        self.assertIsNone(server.handle_request({"method": "status"}))
+
+    def test_socket_is_private(self):
+        path = Path(tempfile.mkdtemp()) / "run" / "control.sock"
+        server = ControlServer(_fake_app(), socket_path=path)
+        self.assertTrue(server.start())
+        self.addCleanup(server.stop)
+        self.assertEqual(stat.S_IMODE(path.parent.stat().st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o600)
+
+    def test_refuses_unsafe_socket_paths(self):
+        shared = Path(tempfile.mkdtemp())
+        shared.chmod(0o777)
+        self.assertFalse(ControlServer(_fake_app(), socket_path=shared / "control.sock").start())
+
+        # A regular file in the socket's place is left alone, not unlinked
+        planted = Path(tempfile.mkdtemp()) / "control.sock"
+        planted.write_text("not a socket")
+        self.assertFalse(ControlServer(_fake_app(), socket_path=planted).start())
+        self.assertTrue(planted.exists())
+
+
+class TestControlSocket(unittest.TestCase):
+    """Runs the real server, with SelectLoop in place of the GLib main loop."""
+
+    def setUp(self):
+        self.loop = SelectLoop()
+        patcher = patch.object(control, "GLib", self.loop)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.path = Path(tempfile.mkdtemp()) / "control.sock"
+        self.server = ControlServer(_fake_app(), socket_path=self.path)
+        self.assertTrue(self.server.start())
+        self.addCleanup(self.server.stop)
+
+    def _connect(self):
+        peer = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(peer.close)
+        peer.settimeout(2)
+        peer.connect(str(self.path))
+        return peer
+
+    def _in_thread(self, target):
+        """Runs a blocking client in a thread while the loop serves it."""
+        errors = []
+
+        def run():
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self.assertTrue(self.loop.run_until(lambda: not thread.is_alive()))
+        if errors:
+            raise errors[0]
+
+    def test_client_round_trip(self):
+        """ControlClient speaks the protocol the server accepts, splits and answers."""
+        results = {}
+
+        def client_calls():
+            with ControlClient(self.path) as client:
+                results["status"] = client.call("status")
+                with self.assertRaises(RuntimeError):
+                    client.call("explode")
+                results["subscribe"] = client.call("subscribe", {"events": ["tick"]})
+
+        self._in_thread(client_calls)
+        self.assertTrue(results["status"]["running"])
+        self.assertEqual(results["subscribe"], {"subscribed": ["tick"]})
+        # The client hung up; the server noticed and dropped it
+        self.assertTrue(self.loop.run_until(lambda: not self.server._clients))
+
+    def test_pipelined_requests_in_one_write(self):
+        peer = self._connect()
+        peer.sendall(b'{"id": 1, "method": "status"}\n\n{"id": 2, "method": "li')
+        self.assertTrue(self.loop.run_until(lambda: self.server._clients))
+        self.loop.iterate(0.1)
+        peer.sendall(b'st"}\n{"method": "status"}\nnot json\n')
+        self.loop.iterate(0.1)
+
+        with peer.makefile("rb") as reader:
+            responses = [json.loads(reader.readline()) for _ in range(3)]
+        self.assertEqual([r["id"] for r in responses], [1, 2, None])
+        self.assertIn("timers", responses[1]["result"])
+        self.assertEqual(responses[2]["error"]["code"], PARSE_ERROR)
+
+    def test_stop_closes_clients_and_removes_socket(self):
+        peer = self._connect()
+        self.assertTrue(self.loop.run_until(lambda: self.server._clients))
+
+        self.server.stop()
+        self.assertFalse(self.path.exists())
+        self.assertEqual(self.loop.watches, {})
+        self.assertEqual(peer.recv(1), b"")   # Connection closed
+
+    def test_oversized_request_is_rejected(self):
+        peer = self._connect()
+        # No newline, ever; sent from a thread as it overflows the socket buffer
+        sender = threading.Thread(target=peer.send, args=(b"x" * (MAX_REQUEST_BYTES + 1),), daemon=True)
+        sender.start()
+        self.assertTrue(self.loop.run_until(lambda: self.server._clients))
+        self.assertTrue(self.loop.run_until(lambda: not self.server._clients))
+        self.assertEqual(len(self.loop.watches), 1)   # Only the listener is left
+
+        with peer.makefile("rb") as reader:
+            response = json.loads(reader.readline())
+            self.assertEqual(response["error"]["code"], PARSE_ERROR)
+            self.assertEqual(reader.readline(), b"")   # Connection closed
+
+
+if __name__ == "__main__":
+    unittest.main()
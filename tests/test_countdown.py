@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+import teatime.app
+from teatime.countdown import GLYPHS, can_draw, layout_cells, text_width
+
+
+class TestGlyphLayout(unittest.TestCase):
+    def setUp(self):
+        # Proportional advances, as a real font would report them
+        advances = {digit: 10 + int(digit) % 3 for digit in "0123456789"}
+        advances[":"] = 5
+        self.cells, self.width = layout_cells(advances)
+
+    def test_digits_are_tabular(self):
+        widths = {self.cells[digit][1] for digit in "0123456789"}
+        self.assertEqual(widths, {12})
+        self.assertEqual(self.width, 10 * 12 + 5)
+
+    def test_cells_do_not_overlap(self):
+        x = 0
+        for glyph in GLYPHS:
+            self.assertEqual(self.cells[glyph][0], x)
+            x += self.cells[glyph][1]
+
+    def test_width_depends_only_on_glyph_count(self):
+        self.assertEqual(text_width(self.cells, "00:00"), text_width(self.cells, "59:59"))
+        self.assertEqual(text_width(self.cells, "100:00"), 5 * 12 + 5)
+        self.assertEqual(text_width(self.cells, "1?"), 12)
+
+
+
+class FakeCountdown:
+    def __init__(self):
+        self.visible = True
+        self.text = None
+
+    def get_visible(self):
+        return self.visible
+
+    def set_visible(self, visible):
+        self.visible = visible
+
+    def set_text(self, text):
+        self.text = text
+
+
+class TestNanoCompletion(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(teatime.app, "CONFIG_FILE", MagicMock(exists=lambda: False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = teatime.app.TeaTimerApp()
+        # Nano mode: the countdown is shown and the label hidden
+        self.app.countdown_display = FakeCountdown()
+        self.app.time_label = MagicMock()
+        self.app.start_button = MagicMock()
+        self.app.stop_button = MagicMock()
+        self.app._subscribe_views()
+
+    def test_only_clock_text_is_drawn_from_the_atlas(self):
+        self.assertTrue(can_draw("04:59"))
+        self.assertFalse(can_draw("Session Complete"))
+        self.assertFalse(can_draw(""))
+
+    def test_ticks_go_to_the_countdown(self):
+        self.app.timer_state.update(display="04:59")
+        self.app.timer_state.flush()
+        self.assertEqual(self.app.countdown_display.text, "04:59")
+        self.app.time_label.set_markup.assert_not_called()
+
+    def test_completion_text_is_shown_in_stage_one(self):
+        self.app._complete_show_state(MagicMock())
+        self.assertFalse(self.app.countdown_display.visible)
+        self.app.time_label.set_visible.assert_called_with(True)
+        self.app.time_label.set_markup.assert_called_with("<span>Session Complete</span>")
+        self.assertNotEqual(self.app.countdown_display.text, "Session Complete")
+
+
+if __name__ == "__main__":
+    unittest.main()
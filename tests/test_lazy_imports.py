@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+import unittest
+
+BIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'bin'))
+
+# Runs in a fresh interpreter without the gi mock, so gi must not be needed
+CHECK = """
+import sys
+import teatime
+from teatime import ConfigManager, StatsManager
+import teatime.assets, teatime.atlas, teatime.audio, teatime.core, teatime.procedural
+loaded = sorted(m for m in sys.modules if m == "gi" or m.startswith(("gi.", "teatime.app", "teatime.stats")))
+print(",".join(loaded))
+"""
+
+
+class TestLazyImports(unittest.TestCase):
+    def run_check(self, code):
+        env = dict(os.environ, PYTHONPATH=BIN_DIR)
+        return subprocess.run([sys.executable, "-c", code], env=env,
+                              capture_output=True, text=True, timeout=30)
+
+    def test_core_modules_do_not_load_gtk(self):
+        result = self.run_check(CHECK)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_unknown_export_raises_attribute_error(self):
+        result = self.run_check("import teatime; teatime.NoSuchName")
+        self.assertIn("AttributeError", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
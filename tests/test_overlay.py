@@ -0,0 +1,148 @@
+import gc
+import os
+import unittest
+import weakref
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+import teatime.app
+from teatime import overlay
+
+# Every fake widget alive right now, standing in for the GObject count
+LIVE_WIDGETS = weakref.WeakSet()
+
+
+class FakeStyleContext:
+    def add_class(self, name):
+        pass
+
+
+class FakeWidget:
+    """A widget that remembers nothing but its signal handlers."""
+
+    def __init__(self, *args, **kwargs):
+        LIVE_WIDGETS.add(self)
+        self._handlers = {}
+        self._next_id = 1
+
+    def connect(self, signal, callback, *data):
+        handler_id = self._next_id
+        self._next_id += 1
+        self._handlers[handler_id] = (signal, callback, data)
+        return handler_id
+
+    def disconnect(self, handler_id):
+        del self._handlers[handler_id]
+
+    def add_tick_callback(self, callback):
+        return self.connect("tick", callback)
+
+    def remove_tick_callback(self, tick_id):
+        self._handlers.pop(tick_id, None)
+
+    def get_style_context(self):
+        return FakeStyleContext()
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+FAKE_GTK = SimpleNamespace(
+    Window=FakeWidget,
+    Box=FakeWidget,
+    Label=FakeWidget,
+    DrawingArea=FakeWidget,
+    WindowType=SimpleNamespace(POPUP=1),
+    Orientation=SimpleNamespace(VERTICAL=1),
+    Align=SimpleNamespace(CENTER=1),
+)
+
+
+class FakeGLib:
+    SOURCE_REMOVE = False
+    SOURCE_CONTINUE = True
+
+    def __init__(self):
+        self._next_id = 1
+
+    def timeout_add_seconds(self, seconds, callback, *data):
+        self._next_id += 1
+        return self._next_id
+
+    timeout_add = timeout_add_seconds
+
+    def source_remove(self, source_id):
+        pass
+
+
+def resident_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class TestOverlayPool(unittest.TestCase):
+    def setUp(self):
+        with patch.object(teatime.app, "CONFIG_FILE", MagicMock(exists=lambda: False)):
+            self.app = teatime.app.TeaTimerApp()
+        self.app.sprite_frames = [object()] * 12
+        # Recording mocks would grow with every call; use plain fakes instead
+        glib = FakeGLib()
+        for target, name, value in (
+            (overlay, "Gtk", FAKE_GTK),
+            (overlay, "GLib", glib),
+            (teatime.app, "GLib", glib),
+        ):
+            patcher = patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def complete(self):
+        self.app._show_fullscreen_notification()
+        overlay_shown = self.app.overlays.get(None)
+        self.assertTrue(overlay_shown.visible)
+        self.app._close_fullscreen_notification(overlay_shown)
+
+    def test_pool_keeps_one_overlay_per_monitor(self):
+        pool = overlay.OverlayPool(lambda: overlay.NotificationOverlay(print, print))
+        first = pool.get((0, 0, 1920, 1080))
+        self.assertIs(pool.get((0, 0, 1920, 1080)), first)
+        pool.get((1920, 0, 1280, 1024))
+        self.assertEqual((len(pool), pool.created), (2, 2))
+
+    def test_geometry_after_fullscreen_fallback_unfullscreens(self):
+        notification = overlay.NotificationOverlay(print, print)
+        notification.window = MagicMock()
+        notification.configure("<b>Done</b>", False)
+        notification.window.fullscreen.assert_called_once()
+        notification.configure("<b>Done</b>", False, (1920, 0, 1280, 1024))
+        notification.window.unfullscreen.assert_called_once()
+        notification.window.move.assert_called_once_with(1920, 0)
+        notification.window.set_size_request.assert_called_once_with(1280, 1024)
+        # Already placed: nothing to undo or move again
+        notification.configure("<b>Done</b>", False, (1920, 0, 1280, 1024))
+        notification.window.unfullscreen.assert_called_once()
+        notification.window.move.assert_called_once()
+
+    def test_thousand_completions_stay_flat(self):
+        # Warm up: the first completions build the overlay and fill any caches
+        for _ in range(20):
+            self.complete()
+        gc.collect()
+        widgets = len(LIVE_WIDGETS)
+        objects = len(gc.get_objects())
+        rss = resident_bytes()
+
+        for _ in range(1000):
+            self.complete()
+        gc.collect()
+
+        self.assertEqual(self.app.overlays.created, 1)
+        self.assertEqual(len(LIVE_WIDGETS), widgets)
+        self.assertLess(len(gc.get_objects()) - objects, 100)
+        self.assertLess(resident_bytes() - rss, 1024 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+import teatime.app
+
+from teatime.performance import (
+    FULL,
+    BALANCED,
+    MINIMAL,
+    on_battery,
+    reduced_motion,
+    select_profile,
+)
+
+
+class FakeSettings:
+    def __init__(self, animations):
+        self.animations = animations
+
+    def get_property(self, name):
+        assert name == "gtk-enable-animations"
+        return self.animations
+
+
+class TestPowerSupply(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def add_supply(self, name, **attributes):
+        supply = self.root / name
+        supply.mkdir()
+        for key, value in attributes.items():
+            (supply / key).write_text(f"{value}\n")
+
+    def test_discharging_battery(self):
+        self.add_supply("AC", type="Mains", online=0)
+        self.add_supply("BAT0", type="Battery", status="Discharging")
+        self.assertTrue(on_battery(self.root))
+
+    def test_mains_online(self):
+        self.add_supply("AC", type="Mains", online=1)
+        self.add_supply("BAT0", type="Battery", status="Discharging")
+        self.assertFalse(on_battery(self.root))
+
+    def test_peripheral_battery_ignored(self):
+        self.add_supply("hidpp_battery_0", type="Battery", scope="Device", status="Discharging")
+        self.assertFalse(on_battery(self.root))
+
+    def test_missing_directory(self):
+        self.assertFalse(on_battery(self.root / "absent"))
+
+
+class TestProfileSelection(unittest.TestCase):
+    def test_preference_used_without_triggers(self):
+        self.assertEqual(select_profile(BALANCED), BALANCED)
+        self.assertEqual(select_profile("turbo"), FULL)
+
+    def test_triggers_force_minimal_only_in_auto(self):
+        self.assertEqual(select_profile(FULL, reduced_motion=True), MINIMAL)
+        self.assertEqual(select_profile(FULL, on_battery=True), MINIMAL)
+        self.assertEqual(select_profile(FULL, auto=False, on_battery=True), FULL)
+
+    def test_reduced_motion_setting(self):
+        self.assertTrue(reduced_motion(FakeSettings(False)))
+        self.assertFalse(reduced_motion(FakeSettings(True)))
+        self.assertFalse(reduced_motion(None))
+
+
+class TestPowerPoll(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(teatime.app, "CONFIG_FILE", MagicMock(exists=lambda: False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.glib = MagicMock()
+        for name, mock in (("GLib", self.glib), ("Gdk", MagicMock(WindowState=MagicMock(ICONIFIED=2)))):
+            patcher = patch.object(teatime.app, name, mock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.app = teatime.app.TeaTimerApp()
+        self.app.rainbow_animation = None
+        self.app._watch_performance_triggers()
+        self.assertEqual(self.glib.timeout_add_seconds.call_count, 1)
+
+    def _iconify(self, iconified):
+        event = MagicMock(changed_mask=2, new_window_state=2 if iconified else 0)
+        self.app._on_window_state_event(self.app.window, event)
+
+    def test_poll_pauses_while_iconified(self):
+        self._iconify(True)
+        self.glib.source_remove.assert_called_once()
+        self.assertIsNone(self.app._power_poll_id)
+
+        with patch.object(self.app, "_update_performance_profile") as update:
+            self._iconify(False)
+        update.assert_called_once()   # Catches up on what it missed
+        self.assertEqual(self.glib.timeout_add_seconds.call_count, 2)
+
+    def test_poll_pauses_while_unmapped(self):
+        self.app._on_window_mapped(self.app.window, False)
+        self.assertIsNone(self.app._power_poll_id)
+        # Restoring a hidden window that is still iconified does not resume it
+        self._iconify(True)
+        self.app._on_window_mapped(self.app.window, True)
+        self.assertIsNone(self.app._power_poll_id)
+        self.assertEqual(self.glib.timeout_add_seconds.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+import teatime.app
+from teatime import procedural
+from teatime.procedural import (
+    PROCEDURAL_ANIMATIONS,
+    ProceduralFrame,
+    frame_transform,
+    get_animation,
+    register_animation,
+)
+
+
+class TestProceduralAnimation(unittest.TestCase):
+    def test_builtin_animations_are_registered(self):
+        self.assertIn("drawn_puppy", PROCEDURAL_ANIMATIONS)
+        self.assertIn("drawn_bouncing_balls", PROCEDURAL_ANIMATIONS)
+
+    def test_transform_fills_and_centres_the_box(self):
+        self.assertEqual(frame_transform(300, 300), (1.5, 0.0, 0.0))
+        self.assertEqual(frame_transform(400, 200), (1.0, 100.0, 0.0))
+
+    def test_frames_draw_at_the_target_size(self):
+        calls = []
+        animation = register_animation("test_drawn", "Test", lambda cr, progress: calls.append(progress), 5)
+        self.addCleanup(PROCEDURAL_ANIMATIONS.pop, "test_drawn")
+        frames = animation.frames()
+        self.assertEqual(len(frames), 5)
+        cr = MagicMock()
+        frames[4].draw(cr, 300, 300)
+        cr.scale.assert_called_once_with(1.5, 1.5)
+        self.assertEqual(calls, [1.0])
+        cr.save.assert_called_once()
+        cr.restore.assert_called_once()
+
+    def test_builtin_drawing_runs_on_any_context(self):
+        for animation in PROCEDURAL_ANIMATIONS.values():
+            for frame in animation.frames():
+                frame.draw(MagicMock(), 300, 300)
+
+
+class TestProceduralInOverlay(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(teatime.app, "CONFIG_FILE", MagicMock(exists=lambda: False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = teatime.app.TeaTimerApp()
+
+    def test_loads_without_files(self):
+        with patch.object(teatime.app.GdkPixbuf.Pixbuf, "new_from_file") as new_from_file:
+            frames = self.app._load_sprite_frames("drawn_puppy")
+        new_from_file.assert_not_called()
+        self.assertEqual(len(frames), procedural.FRAME_COUNT)
+        self.assertTrue(all(isinstance(frame, ProceduralFrame) for frame in frames))
+
+    def test_draws_into_the_area_without_caching(self):
+        self.app.sprite_frames = get_animation("drawn_puppy").frames()
+        self.app.current_sprite_frame = 3
+        widget = MagicMock()
+        widget.get_allocated_width.return_value = 300
+        widget.get_allocated_height.return_value = 300
+        with patch.object(ProceduralFrame, "draw") as draw:
+            self.app._on_sprite_draw(widget, MagicMock())
+        draw.assert_called_once()
+        self.assertEqual(len(self.app.sprite_surfaces), 0)
+        self.assertEqual(self.app.sprite_draw_stats.count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+import teatime.app
+from teatime import pipeline, sprites
+from teatime.sprites import AnimationCache, AnimationStream, DrawStats, SpriteSurfaceCache, fit_size
+
+
+def fake_pixbuf(width=600, height=300):
+    pixbuf = MagicMock()
+    pixbuf.get_width.return_value = width
+    pixbuf.get_height.return_value = height
+    return pixbuf
+
+
+def decoded_frames(count, size=1024):
+    frames = []
+    for _ in range(count):
+        frame = MagicMock()
+        frame.get_byte_length.return_value = size
+        frames.append(frame)
+    return frames
+
+
+class TestAnimationCache(unittest.TestCase):
+    def test_lru_eviction_keeps_budget(self):
+        cache = AnimationCache(budget_bytes=20 * 1024)
+        cache.put("puppy", decoded_frames(10))
+        cache.put("balls", decoded_frames(10))
+        cache.get("puppy")   # puppy is now the most recently used
+        cache.put("kitten", decoded_frames(10))
+        self.assertIn("puppy", cache)
+        self.assertNotIn("balls", cache)
+        self.assertEqual(cache.bytes_used, 20 * 1024)
+
+    def test_newest_set_kept_when_over_budget(self):
+        cache = AnimationCache(budget_bytes=1024)
+        cache.put("puppy", decoded_frames(2))
+        frames = cache.put("big", decoded_frames(8))
+        self.assertIs(cache.get("big"), frames)
+        self.assertEqual(len(cache), 1)
+
+    def test_release_returns_to_empty(self):
+        cache = AnimationCache()
+        for name in ("puppy", "balls"):
+            cache.put(name, decoded_frames(4))
+        cache.release("puppy")
+        self.assertEqual(cache.bytes_used, 4 * 1024)
+        cache.release()
+        self.assertEqual((len(cache), cache.bytes_used), (0, 0))
+        self.assertIsNone(cache.get("balls"))
+
+
+class TestFitSize(unittest.TestCase):
+    def test_downscales_keeping_aspect_ratio(self):
+        self.assertEqual(fit_size(600, 300, 300, 300), (300, 150, 0, 75))
+
+    def test_never_upscales(self):
+        self.assertEqual(fit_size(100, 50, 300, 300), (100, 50, 100, 125))
+
+
+class TestSpriteSurfaceCache(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(sprites, "cairo", MagicMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = SpriteSurfaceCache()
+        self.frames = [fake_pixbuf() for _ in range(8)]
+
+    def play(self, loops, size=(300, 300)):
+        for _ in range(loops):
+            for index, pixbuf in enumerate(self.frames):
+                self.assertIsNotNone(self.cache.get("puppy", index, pixbuf, *size))
+
+    def test_each_frame_is_converted_once(self):
+        self.play(50)
+        self.assertEqual(self.cache.conversions, len(self.frames))
+        for pixbuf in self.frames:
+            pixbuf.scale_simple.assert_called_once()
+
+    def test_resize_rebuilds(self):
+        self.play(2)
+        self.play(2, size=(150, 150))
+        self.assertEqual(self.cache.conversions, 2 * len(self.frames))
+        self.assertEqual(len(self.cache), len(self.frames))
+
+    def test_without_cairo(self):
+        with patch.object(sprites, "cairo", None):
+            self.assertIsNone(SpriteSurfaceCache().get("puppy", 0, fake_pixbuf(), 300, 300))
+
+
+class FakeAnimationIter:
+    """Follows PixbufAnimationIter: the frame for a point in time, -1 delay at the end."""
+
+    def __init__(self, delays_ms, loop):
+        self.delays_ms = delays_ms
+        self.loop = loop
+        self.index = 0
+
+    def advance(self, timeval):
+        elapsed = timeval.tv_sec * 1000 + timeval.tv_usec // 1000
+        total = sum(self.delays_ms)
+        if self.loop:
+            elapsed %= total
+        index = 0
+        while index < len(self.delays_ms) - 1 and elapsed >= self.delays_ms[index]:
+            elapsed -= self.delays_ms[index]
+            index += 1
+        self.index = index
+
+    def get_pixbuf(self):
+        pixbuf = fake_pixbuf(200, 200)
+        pixbuf.copy.return_value = f"frame {self.index}"
+        return pixbuf
+
+    def get_delay_time(self):
+        if not self.loop and self.index == len(self.delays_ms) - 1:
+            return -1
+        return self.delays_ms[self.index]
+
+
+class FakeAnimation:
+    def __init__(self, delays_ms, loop=True):
+        self.delays_ms = delays_ms
+        self.loop = loop
+
+    def get_iter(self, start_time):
+        return FakeAnimationIter(self.delays_ms, self.loop)
+
+    def get_width(self):
+        return 200
+
+    def get_height(self):
+        return 200
+
+
+class TestAnimationStream(unittest.TestCase):
+    def test_plays_at_native_delays(self):
+        stream = AnimationStream(FakeAnimation([100, 50, 250]))
+        self.assertEqual(stream.frame, "frame 0")
+        self.assertFalse(stream.advance(0.09))
+        self.assertTrue(stream.advance(0.02))
+        self.assertEqual(stream.frame, "frame 1")
+        self.assertTrue(stream.advance(0.05))
+        self.assertEqual(stream.frame, "frame 2")
+        self.assertTrue(stream.advance(0.25))
+        self.assertEqual(stream.frame, "frame 0")   # Loops
+
+    def test_ring_stays_bounded(self):
+        stream = AnimationStream(FakeAnimation([40] * 500), ring_size=3)
+        stream.fill()
+        self.assertEqual(len(stream), 3)
+        for _ in range(400):
+            stream.advance(0.04)
+            self.assertLessEqual(len(stream), 3)
+        self.assertEqual(stream.position, 400)
+        # Decoded on demand: never more than the ring ahead of playback
+        self.assertLessEqual(stream.decoded, stream.position + 1 + 3)
+
+    def test_finite_animation_holds_last_frame(self):
+        stream = AnimationStream(FakeAnimation([100, 100], loop=False))
+        self.assertTrue(stream.advance(5.0))
+        self.assertEqual(stream.frame, "frame 1")
+        self.assertFalse(stream.advance(1.0))
+
+    def test_restart_returns_to_first_frame(self):
+        stream = AnimationStream(FakeAnimation([100, 100, 100]))
+        stream.advance(0.25)
+        stream.restart()
+        self.assertEqual((stream.frame, stream.position), ("frame 0", 0))
+
+    def test_prerender_skips_streams(self):
+        with patch.object(sprites, "cairo", MagicMock()):
+            stream = AnimationStream(FakeAnimation([100]))
+            self.assertEqual(SpriteSurfaceCache().prerender("gif", [stream], 300, 300), [])
+
+
+class TestDrawStats(unittest.TestCase):
+    def test_summary(self):
+        stats = DrawStats()
+        for elapsed in (1.0, 2.0, 3.0):
+            stats.record(elapsed)
+        self.assertEqual(stats.summary(), {
+            "sprite_frames_drawn": 3,
+            "sprite_draw_avg_ms": 2.0,
+            "sprite_draw_max_ms": 3.0,
+        })
+
+
+class TestOverlayWarmUp(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(teatime.app, "CONFIG_FILE", MagicMock(exists=lambda: False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = teatime.app.TeaTimerApp()
+        self.app.timer_id = 1
+        self.app.timer_state.update(session=1)
+        self.jobs = []
+        worker = patch.object(teatime.app, "run_in_worker",
+                              lambda func, *args, on_done=None: self.jobs.append((args, on_done)))
+        worker.start()
+        self.addCleanup(worker.stop)
+
+    def test_starts_once_within_lead_time(self):
+        self.app.time_left = self.app.warmup_seconds + 5
+        self.app._maybe_warm_up()
+        self.assertEqual(self.jobs, [])
+        self.app.time_left = self.app.warmup_seconds
+        self.app._maybe_warm_up()
+        self.app._maybe_warm_up()
+        self.assertEqual(len(self.jobs), 1)
+
+    def test_stop_cancels_warm_up(self):
+        self.app.time_left = 1
+        self.app._maybe_warm_up()
+        (_animation, _frames, cancel), on_ready = self.jobs[0]
+        self.app._cancel_warmup()
+        self.assertTrue(cancel.is_set())
+        on_ready(([fake_pixbuf()], []))
+        self.assertIsNone(self.app._prepared_notification)
+        self.assertEqual(self.app.sprite_frames, [])
+
+
+
+class ImmediateGLib:
+    SOURCE_REMOVE = False
+
+    @staticmethod
+    def idle_add(func, *args):
+        func(*args)
+
+
+class TestOverlayLoadFailure(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(teatime.app, "CONFIG_FILE", MagicMock(exists=lambda: False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        glib = patch.object(pipeline, "GLib", ImmediateGLib)
+        glib.start()
+        self.addCleanup(glib.stop)
+        self.app = teatime.app.TeaTimerApp()
+        self.app.preferred_animation = "broken_animation"
+
+    def test_failed_load_still_shows_the_overlay(self):
+        shown = threading.Event()
+        self.app._load_sprite_frames = MagicMock(side_effect=OSError("corrupt PNG"))
+        self.app._show_fullscreen_notification = MagicMock(side_effect=lambda pipeline: shown.set())
+        self.app._complete_show_overlay(MagicMock())
+        self.assertTrue(shown.wait(2))
+        fallback = teatime.app.get_procedural_animation(teatime.app.FALLBACK_ANIMATION)
+        self.assertEqual(len(self.app.sprite_frames), fallback.frame_count)
+        self.assertIsNone(self.app.animation_cache.get("broken_animation"))
+
+    def test_worker_failure_reaches_on_error(self):
+        errors, results = [], []
+
+        def fail():
+            raise ValueError("boom")
+
+        pipeline.run_in_worker(fail, on_done=results.append, on_error=errors.append).join(2)
+        self.assertEqual((len(errors), results), (1, []))
+        pipeline.run_in_worker(fail, on_done=results.append).join(2)
+        self.assertEqual(results, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
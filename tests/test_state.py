@@ -0,0 +1,57 @@
+import unittest
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+from teatime.state import TimerStateBus, RUNNING
+
+
+class TestTimerStateBus(unittest.TestCase):
+    def setUp(self):
+        self.pending = []
+        self.bus = TimerStateBus(scheduler=self.pending.append)
+
+    def run_main_loop_iteration(self):
+        callbacks, self.pending[:] = list(self.pending), []
+        for callback in callbacks:
+            callback()
+
+    def test_updates_in_one_iteration_are_coalesced(self):
+        calls = []
+        self.bus.subscribe(lambda state, changed: calls.append((state["display"], changed)), ("display",))
+        self.run_main_loop_iteration()
+        calls.clear()
+
+        self.bus.update(time_left=0, display="00:00")
+        self.bus.update(display="Session Complete")
+        self.assertEqual(len(self.pending), 1)
+        self.run_main_loop_iteration()
+        self.assertEqual(calls, [("Session Complete", {"display"})])
+
+    def test_unchanged_values_are_skipped(self):
+        calls = []
+        self.bus.subscribe(lambda state, changed: calls.append(changed), ("phase",))
+        self.run_main_loop_iteration()
+        calls.clear()
+
+        # time_left is not watched and a phase flip-flop nets out to no change
+        self.bus.update(time_left=295)
+        self.bus.update(phase=RUNNING)
+        self.bus.update(phase="idle")
+        self.run_main_loop_iteration()
+        self.assertEqual(calls, [])
+
+        self.bus.update(phase=RUNNING)
+        self.run_main_loop_iteration()
+        self.assertEqual(calls, [{"phase"}])
+
+    def test_unsubscribe(self):
+        calls = []
+        unsubscribe = self.bus.subscribe(lambda state, changed: calls.append(changed))
+        unsubscribe()
+        self.bus.update(display="01:00")
+        self.run_main_loop_iteration()
+        self.assertEqual(calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+from teatime import thumbnails
+from teatime.thumbnails import ThumbnailGenerator, is_thumbnail_of, sample_indices, thumbnail_key
+
+
+class FakeIndex:
+    def __init__(self, frames):
+        self._frames = frames
+
+    def frames(self, name):
+        return self._frames.get(name, [])
+
+    def animated_files(self, name=None):
+        return []
+
+
+class ImmediateGLib:
+    SOURCE_REMOVE = False
+
+    @staticmethod
+    def idle_add(func, *args):
+        func(*args)
+
+
+class TestThumbnailKeys(unittest.TestCase):
+    def test_samples_spread_over_the_animation(self):
+        self.assertEqual(sample_indices(12, 6), [0, 2, 4, 6, 8, 10])
+        self.assertEqual(sample_indices(3, 6), [0, 1, 2])
+        self.assertEqual(sample_indices(0, 6), [])
+
+    def test_key_follows_sources_and_settings(self):
+        sources = [["frame_00.png", 10, "abc"]]
+        self.assertEqual(thumbnail_key(sources), thumbnail_key([list(s) for s in sources]))
+        self.assertNotEqual(thumbnail_key(sources), thumbnail_key([["frame_00.png", 10, "abd"]]))
+        self.assertNotEqual(thumbnail_key(sources), thumbnail_key(sources, size=96))
+
+
+class TestThumbnailGenerator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        frames = []
+        for index in range(12):
+            path = self.tmp / f"sprite_frame_{index:02d}.png"
+            path.write_bytes(b"frame %d" % index)
+            frames.append(path)
+        self.index = FakeIndex({"balls": frames})
+        self.cache_dir = self.tmp / "thumbnails"
+        self.pixbuf = patch.object(thumbnails, "GdkPixbuf", MagicMock())
+        self.gdk_pixbuf = self.pixbuf.start()
+        self.addCleanup(self.pixbuf.stop)
+        self.strip = self.gdk_pixbuf.Pixbuf.new.return_value
+        decoded = self.gdk_pixbuf.Pixbuf.new_from_file_at_scale.return_value
+        decoded.get_width.return_value = 64
+        decoded.get_height.return_value = 48
+        # savev writes the strip; make it leave a file behind like the real one
+        self.strip.savev.side_effect = lambda path, *args: Path(path).write_bytes(b"png")
+
+    def generator(self):
+        return ThumbnailGenerator(self.index, {}, cache_dir=self.cache_dir)
+
+    def test_strip_is_made_once_then_read_from_cache(self):
+        generator = self.generator()
+        strip, cells = generator.strip("balls")
+        self.assertIs(strip, self.strip)
+        self.assertEqual((cells, generator.generated), (6, 1))
+        # Only the sampled frames are decoded, at thumbnail size
+        self.assertEqual(self.gdk_pixbuf.Pixbuf.new_from_file_at_scale.call_count, 6)
+
+        cached = self.gdk_pixbuf.Pixbuf.new_from_file.return_value
+        cached.get_width.return_value = 6 * thumbnails.THUMBNAIL_SIZE
+        second = self.generator()
+        self.assertEqual(second.strip("balls"), (cached, 6))
+        self.assertEqual(second.generated, 0)
+        self.assertEqual(len(list(self.cache_dir.glob("balls-*.png"))), 1)
+
+    def test_changed_frames_replace_the_cached_strip(self):
+        self.generator().strip("balls")
+        old = list(self.cache_dir.glob("balls-*.png"))
+        self.index.frames("balls")[0].write_bytes(b"new frame")
+        generator = self.generator()
+        generator.strip("balls")
+        self.assertEqual(generator.generated, 1)
+        self.assertNotEqual(list(self.cache_dir.glob("balls-*.png")), old)
+        self.assertEqual(len(list(self.cache_dir.glob("balls-*.png"))), 1)
+
+    def test_saving_keeps_animations_with_a_longer_name(self):
+        self.cache_dir.mkdir()
+        other = self.cache_dir / "balls-walk-0123456789abcdef.png"
+        other.write_bytes(b"png")
+        self.generator().strip("balls")
+        self.assertTrue(other.exists())
+        self.assertTrue(is_thumbnail_of("balls", next(self.cache_dir.glob("balls-????????????????.png"))))
+        self.assertFalse(is_thumbnail_of("balls", other))
+
+    def test_generate_delivers_until_cancelled(self):
+        ready = []
+        cancel = threading.Event()
+        with patch.object(thumbnails, "GLib", ImmediateGLib):
+            self.generator().generate(["balls", "missing"], lambda *args: ready.append(args), cancel)
+            self.assertEqual([name for name, _strip, _cells in ready], ["balls"])
+            cancel.set()
+            self.generator().generate(["balls"], lambda *args: ready.append(args), cancel)
+        self.assertEqual(len(ready), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests import gi_mock  # noqa: F401  (must precede teatime imports)
+
+from teatime import ui_utils
+from teatime.ui_utils import (
+    StyleManager,
+    FrameAnimation,
+    LavaBackground,
+    rainbow_css,
+    skin_css,
+    quantize_hue,
+)
+
+
+class TestStyleManager(unittest.TestCase):
+    def setUp(self):
+        self.style_context = ui_utils.Gtk.StyleContext
+        self.style_context.reset_mock()
+        self.styles = StyleManager(screen=MagicMock())
+
+    def test_repeated_updates_reuse_one_provider(self):
+        for hue in range(500):
+            self.styles.set_css("skin", f"window {{ color: hsl({hue}, 50%, 50%); }}")
+            self.styles.set_css("font", ".time-display { font-size: 250%; }")
+        self.assertEqual(self.style_context.add_provider_for_screen.call_count, 2)
+        self.assertEqual(self.styles.live_count(), 2)
+
+    def test_clear_removes_and_reattaches(self):
+        for _ in range(10):
+            self.styles.set_css("nano", ".time-display { margin: 0; }")
+            self.styles.clear("nano")
+        self.assertEqual(self.styles.live_count(), 0)
+        self.assertEqual(self.style_context.remove_provider_for_screen.call_count, 10)
+
+    def test_identical_css_is_not_reparsed(self):
+        for _ in range(3):   # three full rainbow cycles, one degree per tick
+            for hue in range(360):
+                self.styles.set_css("rainbow", rainbow_css(quantize_hue(hue)))
+        # Only a change of quantized hue reaches load_from_data (120 buckets per cycle)
+        self.assertLessEqual(self.styles.parse_count, 3 * 120 + 1)
+        self.assertGreater(rainbow_css.cache_info().hits, 0)
+
+    def test_unknown_layer(self):
+        with self.assertRaises(ValueError):
+            self.styles.set_css("sparkles", "")
+
+
+class TestLavaBackground(unittest.TestCase):
+    def test_hue_cycle_renders_each_bucket_once(self):
+        background = LavaBackground()
+        with patch.object(ui_utils, "cairo", MagicMock()):
+            for _ in range(3):
+                for tick in range(720):   # half-degree ticks
+                    self.assertIsNotNone(background.surface(tick / 2))
+        self.assertEqual(background.renders, 360 // ui_utils.HUE_STEP)
+
+    def test_strips_do_not_grow_with_the_window(self):
+        background = LavaBackground()
+        fake_cairo = MagicMock()
+        with patch.object(ui_utils, "cairo", fake_cairo):
+            for size in ((300, 200), (1000, 700), (3840, 2160)):
+                for hue in range(0, 360, ui_utils.HUE_STEP):
+                    background.paint(MagicMock(), hue, 0, 0, *size)
+        fake_cairo.ImageSurface.assert_called_with(fake_cairo.FORMAT_RGB24, LavaBackground.STRIP_LENGTH, 1)
+        self.assertEqual(background.renders, 360 // ui_utils.HUE_STEP)
+        self.assertLessEqual(background.cache_bytes(), 128 * 1024)
+
+    def test_strip_matrix_covers_the_gradient(self):
+        def t(matrix, x, y):
+            xx, _yx, xy, _yy, x0, _y0 = matrix
+            return (xx * x + xy * y + x0) / LavaBackground.STRIP_LENGTH
+
+        width, height = 300, 200
+        still = LavaBackground.strip_matrix(width, height, 0.0)
+        moved = LavaBackground.strip_matrix(width, height, 1.0)
+        # At rest the bottom-left corner shows the middle row of the 3x box...
+        self.assertAlmostEqual(t(still, 0, height), height / (3 * (width + height)))
+        # ...and the right edge of the box's middle row once it has flowed across
+        self.assertAlmostEqual(t(moved, width, 0), (3 * width + 2 * height) / (3 * (width + height)))
+
+    def test_cache_is_bounded(self):
+        background = LavaBackground(max_entries=4)
+        with patch.object(ui_utils, "cairo", MagicMock()):
+            for hue in range(0, 30, ui_utils.HUE_STEP):
+                background.surface(hue)
+        self.assertEqual(len(background._surfaces), 4)
+
+    def test_without_cairo_nothing_is_painted(self):
+        with patch.object(ui_utils, "cairo", None):
+            self.assertFalse(LavaBackground().paint(MagicMock(), 0, 0, 0, 300, 200))
+
+    def test_skin_css_does_not_depend_on_hue(self):
+        self.assertIn(b"background-image: none", skin_css("lava"))
+        self.assertNotIn(b"gradient", skin_css("lava"))
+
+
+class FakeFrameClock:
+    def __init__(self):
+        self.frame_time = 0   # microseconds
+
+    def get_frame_time(self):
+        return self.frame_time
+
+
+class FakeWidget:
+    """Records tick callbacks and replays them like a frame clock would."""
+
+    def __init__(self):
+        self.clock = FakeFrameClock()
+        self.callbacks = {}
+        self._next_id = 1
+
+    def add_tick_callback(self, callback):
+        tick_id = self._next_id
+        self._next_id += 1
+        self.callbacks[tick_id] = callback
+        return tick_id
+
+    def remove_tick_callback(self, tick_id):
+        del self.callbacks[tick_id]
+
+    def advance(self, seconds, fps=60):
+        for _ in range(int(seconds * fps)):
+            self.clock.frame_time += 1_000_000 // fps
+            for tick_id, callback in list(self.callbacks.items()):
+                if not callback(self, self.clock):
+                    self.callbacks.pop(tick_id, None)
+
+
+class TestFrameAnimation(unittest.TestCase):
+    def test_steps_by_interval_with_elapsed_time(self):
+        widget = FakeWidget()
+        steps = []
+        animation = FrameAnimation(widget, lambda elapsed: steps.append(elapsed), 0.5)
+        animation.start()
+        widget.advance(5)
+        self.assertIn(len(steps), (9, 10))
+        self.assertAlmostEqual(sum(steps), 5, delta=0.6)
+
+    def test_paused_animation_has_no_tick_callback(self):
+        widget = FakeWidget()
+        steps = []
+        animation = FrameAnimation(widget, lambda elapsed: steps.append(elapsed), 0.1)
+        animation.start()
+        animation.set_paused(True)
+        self.assertEqual(widget.callbacks, {})
+        widget.advance(1)
+        self.assertEqual(steps, [])
+        # A long pause is not replayed on resume
+        animation.set_paused(False)
+        widget.clock.frame_time += 60_000_000
+        widget.advance(0.2)
+        self.assertLess(sum(steps), 0.5)
+
+    def test_step_returning_false_stops(self):
+        widget = FakeWidget()
+        animation = FrameAnimation(widget, lambda elapsed: False, 0.1)
+        animation.start()
+        widget.advance(1)
+        self.assertFalse(animation.running)
+        self.assertEqual(widget.callbacks, {})
+
+
+if __name__ == "__main__":
+    unittest.main()